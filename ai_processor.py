@@ -19,14 +19,21 @@ import os
 import re
 import sys
 import logging
+import threading
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 import yaml
 
+try:
+    import orjson  # 選用：C 實作的 JSON，讀寫 metadata.json 較快
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # ============================================================
@@ -62,12 +69,16 @@ for cat, subs in VET_CATEGORIES.items():
 DEFAULT_MODEL = "claude-sonnet-4-20250514"
 DEFAULT_MAX_TOKENS = 2000
 DEFAULT_API_DELAY = 1.0  # 每次 API 呼叫之間的間隔（秒）
+DEFAULT_AI_CONCURRENCY = 4  # 批次同時進行的 API 呼叫數
+DEFAULT_AI_GROUP_SIZE = 1  # 每次 API 呼叫最多合併幾篇短文章（1 表示不合併）
 MAX_ARTICLE_CHARS = 8000  # 超過此長度的文章會被截斷
+GROUP_CHAR_BUDGET = int(MAX_ARTICLE_CHARS * 0.8)  # 合併呼叫時一組文章的總字數上限
 
 # API 重試設定
 MAX_API_RETRIES = 3
 API_RETRY_BASE_DELAY = 2.0  # 基礎重試延遲（秒），指數退避
 API_RATE_LIMIT_DELAY = 30.0  # 429 rate limit 時的等待時間（秒）
+API_MAX_RETRY_WAIT = 120.0  # 單篇文章從第一次呼叫起，重試最多持續多久（秒）
 
 # ============================================================
 # Anthropic SDK（選用）
@@ -76,19 +87,75 @@ API_RATE_LIMIT_DELAY = 30.0  # 429 rate limit 時的等待時間（秒）
 try:
     import anthropic
     HAS_ANTHROPIC = True
+    # 錯誤類別在載入時綁定一次，重試判斷不必每次查找模組屬性
+    _RETRYABLE_ERRORS = (
+        anthropic.APIConnectionError, anthropic.APITimeoutError,  # 網路連線和超時
+        anthropic.RateLimitError,  # 429（延遲更長）
+        anthropic.InternalServerError,  # 5xx
+    )
+    _NON_RETRYABLE_ERRORS = (anthropic.AuthenticationError, anthropic.BadRequestError)
 except ImportError:
     HAS_ANTHROPIC = False
+    _RETRYABLE_ERRORS = _NON_RETRYABLE_ERRORS = ()
+
+
+# ============================================================
+# JSON 讀寫
+# ============================================================
+
+def _loads_json(data: bytes):
+    """解析 UTF-8 JSON（有 orjson 時使用）；格式錯誤時拋出 ValueError"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_json(obj) -> bytes:
+    """序列化為縮排 2 格的 UTF-8 JSON（有 orjson 時使用，輸出格式與 json.dumps 相同）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
 
 
 # ============================================================
 # Frontmatter 解析和更新
 # ============================================================
 
-_FRONTMATTER_RE = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+# 分隔線後的空白段由 re 引擎在 C 層掃描，避免逐字元的 Python 迴圈
+_WS_RUN = re.compile(r"\s*")
+
+
+def _split_frontmatter(content: str) -> Optional[tuple[str, str]]:
+    """切出 (frontmatter 區塊, 正文)，沒有 frontmatter 時回傳 None。
+
+    以 str.find 找分隔線，不走正規表示式：開頭 --- 與結尾 --- 之後到換行前只能是空白，
+    結尾分隔線後連續的空白行一併略過。
+    """
+    if not content.startswith("---"):
+        return None
+    nl = content.find("\n", 3)
+    if nl < 0 or content[3:nl].strip():
+        return None
+
+    pos = nl + 1
+    while True:
+        idx = content.find("\n---", pos)
+        if idx < 0:
+            return None
+        ws_end = _WS_RUN.match(content, idx + 4).end()
+        body_start = content.rfind("\n", idx + 4, ws_end)
+        if body_start >= 0:
+            return content[nl + 1:idx], content[body_start + 1:]
+        pos = idx + 1  # 例如 "----" 或 "--- x"，不是分隔線，繼續往後找
+
+
+# 有 libyaml 時使用 C 實作的 Loader/Dumper（解析速度快數倍），否則退回純 Python 版
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """解析 YAML frontmatter（使用 PyYAML）。
+    """解析 YAML frontmatter（使用 PyYAML，有 libyaml 時走 C 實作）。
 
     Args:
         content: 完整的 Markdown 內容
@@ -96,15 +163,14 @@ def parse_frontmatter(content: str) -> tuple[dict, str]:
     Returns:
         (frontmatter_dict, body_content) — frontmatter 字典和正文
     """
-    match = _FRONTMATTER_RE.match(content)
-    if not match:
+    split = _split_frontmatter(content)
+    if split is None:
         return {}, content
 
-    fm_block = match.group(1)
-    body = content[match.end():]
+    fm_block, body = split
 
     try:
-        fm = yaml.safe_load(fm_block)
+        fm = yaml.load(fm_block, Loader=_YAML_LOADER)
         if not isinstance(fm, dict):
             fm = {}
     except yaml.YAMLError:
@@ -127,13 +193,20 @@ def update_frontmatter(content: str, updates: dict) -> str:
         updates: 要更新/新增的欄位
 
     Returns:
-        更新後的完整 Markdown 內容
+        更新後的完整 Markdown 內容（沒有要更新的欄位時原樣回傳）
     """
+    if not updates:
+        return content
     fm, body = parse_frontmatter(content)
     fm.update(updates)
+    return _render_frontmatter(fm, body)
 
+
+def _render_frontmatter(fm: dict, body: str) -> str:
+    """將 frontmatter 字典與正文組回完整 Markdown"""
     fm_str = yaml.dump(
         fm,
+        Dumper=_YAML_DUMPER,
         allow_unicode=True,
         default_flow_style=False,
         sort_keys=False,
@@ -146,9 +219,63 @@ def update_frontmatter(content: str, updates: dict) -> str:
 # 文章掃描
 # ============================================================
 
+AI_INDEX_FILE = ".ai_index.json"  # 掃描索引：資料夾名稱 → content.md 的 (mtime_ns, size) 與解析結果
+_SCAN_INDEX_FIELDS = {"mtime_ns", "size", "title", "platform", "has_ai_data", "char_count"}
+SCAN_READ_WORKERS = 8  # 掃描時並行讀取 content.md 的執行緒數
+
+
+def _load_scan_index(index_path: str) -> dict:
+    """讀取掃描索引（不存在或損壞時視為空）"""
+    try:
+        with open(index_path, "rb") as f:
+            index = _loads_json(f.read())
+    except (ValueError, IOError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _save_scan_index(index_path: str, index: dict):
+    """寫入掃描索引（先寫暫存檔再 os.replace；失敗不影響掃描結果）"""
+    tmp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_dumps_json(index))
+        os.replace(tmp_path, index_path)
+    except (OSError, TypeError) as e:  # TypeError：frontmatter 含無法序列化的值
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        logger.debug(f"掃描索引寫入失敗：{e}")
+
+
+def _scan_content(content_path: str) -> Optional[dict]:
+    """讀取並解析 content.md，回傳索引欄位；無法讀取時回傳 None"""
+    try:
+        with open(content_path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except (IOError, UnicodeDecodeError) as e:
+        logger.warning(f"無法讀取 {content_path}：{e}")
+        return None
+
+    fm, body = parse_frontmatter(content)
+    title = fm.get("title")
+    return {
+        # 日期等非字串標題轉成字串，索引才能存成 JSON
+        "title": title if title is None or isinstance(title, str) else str(title),
+        "platform": fm.get("platform", ""),
+        # 判斷是否已有 AI 處理資料
+        "has_ai_data": bool(fm.get("category")) and bool(fm.get("summary")),
+        "char_count": len(body),
+    }
+
+
 def scan_articles(output_dir: str) -> list[dict]:
     """掃描輸出目錄中的文章。
 
+    content.md 的 mtime 與大小沒變時沿用 .ai_index.json 記下的解析結果，
+    不必重新讀檔與解析 frontmatter。
+
     Args:
         output_dir: 文章輸出目錄路徑
 
@@ -158,50 +285,76 @@ def scan_articles(output_dir: str) -> list[dict]:
     output_dir = os.path.expanduser(output_dir)
     articles = []
 
-    if not os.path.isdir(output_dir):
+    # scandir 一次取得目錄項目與類型，不必對每個項目再 stat
+    try:
+        with os.scandir(output_dir) as it:
+            entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+    except (FileNotFoundError, NotADirectoryError):
         logger.warning(f"目錄不存在：{output_dir}")
         return articles
 
-    for entry in sorted(os.listdir(output_dir)):
-        entry_path = os.path.join(output_dir, entry)
-        if not os.path.isdir(entry_path):
-            continue
-
-        content_path = os.path.join(entry_path, "content.md")
-        if not os.path.isfile(content_path):
-            continue
+    index_path = os.path.join(output_dir, AI_INDEX_FILE)
+    old_index = _load_scan_index(index_path)
+    index = {}
 
+    # 先 stat 比對索引，找出需要重新讀取解析的文章
+    scanned = []  # (entry, content.md 的 stat, 索引中的資料或 None)
+    for entry in entries:
+        content_path = os.path.join(entry.path, "content.md")
         try:
-            with open(content_path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except (IOError, UnicodeDecodeError) as e:
+            st = os.stat(content_path)
+        except (FileNotFoundError, NotADirectoryError):
+            continue  # 不是文章資料夾
+        except OSError as e:
             logger.warning(f"無法讀取 {content_path}：{e}")
             continue
 
-        fm, body = parse_frontmatter(content)
-
-        # 判斷是否已有 AI 處理資料
-        has_ai_data = bool(fm.get("category")) and bool(fm.get("summary"))
-
-        # 讀取 metadata.json 以獲取更多資訊
-        meta_path = os.path.join(entry_path, "metadata.json")
-        platform = fm.get("platform", "")
-        if os.path.isfile(meta_path):
+        cached = old_index.get(entry.name)
+        if not (isinstance(cached, dict) and cached.keys() >= _SCAN_INDEX_FIELDS
+                and cached["mtime_ns"] == st.st_mtime_ns
+                and cached["size"] == st.st_size):
+            cached = None
+        scanned.append((entry, st, cached))
+
+    # 未命中的檔案並行讀取（讀檔時會釋放 GIL，磁碟延遲可以重疊）
+    misses = [os.path.join(entry.path, "content.md")
+              for entry, _, cached in scanned if cached is None]
+    if len(misses) > 1:
+        with ThreadPoolExecutor(max_workers=min(SCAN_READ_WORKERS, len(misses))) as executor:
+            parsed = list(executor.map(_scan_content, misses))
+    else:
+        parsed = [_scan_content(path) for path in misses]
+    parsed = iter(parsed)
+
+    for entry, st, info in scanned:
+        if info is None:
+            info = next(parsed)
+            if info is None:
+                continue
+            info["mtime_ns"] = st.st_mtime_ns
+            info["size"] = st.st_size
+        index[entry.name] = info
+
+        # frontmatter 沒有平台時才讀 metadata.json 補上
+        platform = info["platform"]
+        if not platform:
             try:
-                with open(meta_path, "r", encoding="utf-8") as f:
-                    meta = json.load(f)
-                platform = platform or meta.get("platform", "")
-            except (json.JSONDecodeError, IOError):
+                with open(os.path.join(entry.path, "metadata.json"), "rb") as f:
+                    platform = _loads_json(f.read()).get("platform", "")
+            except (ValueError, IOError, AttributeError):  # 含 json / orjson 的解碼錯誤
                 pass
 
         articles.append({
-            "path": entry_path,
-            "title": fm.get("title", entry),
+            "path": entry.path,
+            "title": entry.name if info["title"] is None else info["title"],
             "platform": platform,
-            "has_ai_data": has_ai_data,
-            "char_count": len(body),
+            "has_ai_data": info["has_ai_data"],
+            "char_count": info["char_count"],
         })
 
+    if index != old_index:
+        _save_scan_index(index_path, index)
+
     return articles
 
 
@@ -216,13 +369,18 @@ def estimate_cost(articles: list[dict], model: str = DEFAULT_MODEL) -> dict:
         包含 article_count, total_chars, estimated_input_tokens,
         estimated_output_tokens, estimated_cost_usd, model 的字典
     """
-    unprocessed = [a for a in articles if not a.get("has_ai_data")]
-    total_chars = sum(min(a["char_count"], MAX_ARTICLE_CHARS) for a in unprocessed)
+    # 單次走訪同時計數與加總，不另外建立未處理文章的中間列表
+    count = 0
+    total_chars = 0
+    for a in articles:
+        if not a.get("has_ai_data"):
+            count += 1
+            total_chars += min(a["char_count"], MAX_ARTICLE_CHARS)
 
     # 中文字元 token 密度較高（約 1.5-2 token/char），加上 system prompt
     system_prompt_tokens = 500  # 系統提示大約 500 token
-    estimated_input_tokens = int(total_chars / 2.5) + system_prompt_tokens * len(unprocessed)
-    estimated_output_tokens = 300 * len(unprocessed)  # 每篇回傳約 300 token
+    estimated_input_tokens = int(total_chars / 2.5) + system_prompt_tokens * count
+    estimated_output_tokens = 300 * count  # 每篇回傳約 300 token
 
     # 定價（以 Sonnet 為基準）
     # Input: $3/M tokens, Output: $15/M tokens
@@ -243,7 +401,7 @@ def estimate_cost(articles: list[dict], model: str = DEFAULT_MODEL) -> dict:
             estimated_output_tokens * output_cost_per_m) / 1_000_000
 
     return {
-        "article_count": len(unprocessed),
+        "article_count": count,
         "total_articles": len(articles),
         "total_chars": total_chars,
         "estimated_input_tokens": estimated_input_tokens,
@@ -297,13 +455,35 @@ SYSTEM_PROMPT = """你是一位資深獸醫師和醫學文獻分析專家。請
 - 只回傳 JSON，不要加其他說明文字"""
 
 
+_PROMPT_BODY_LABEL = "以下是文章內容：\n\n"
+_PROMPT_TRUNCATED = "\n\n[... 文章已截斷 ...]"
+
+
 def _build_user_prompt(article_text: str, title: str = "") -> str:
-    """建構使用者端的 prompt。"""
-    header = f"文章標題：{title}\n\n" if title else ""
+    """建構使用者端的 prompt（各段一次 join，過長的文章不必先另外拼出截斷版本）。"""
+    parts = [f"文章標題：{title}\n\n"] if title else []
+    parts.append(_PROMPT_BODY_LABEL)
     # 截斷過長的文章
     if len(article_text) > MAX_ARTICLE_CHARS:
-        article_text = article_text[:MAX_ARTICLE_CHARS] + "\n\n[... 文章已截斷 ...]"
-    return f"{header}以下是文章內容：\n\n{article_text}"
+        parts += (article_text[:MAX_ARTICLE_CHARS], _PROMPT_TRUNCATED)
+    else:
+        parts.append(article_text)
+    return "".join(parts)
+
+
+_GROUP_PROMPT_HEADER = (
+    "以下共有 {n} 篇文章，請依序分析每一篇，"
+    "以 JSON 陣列回傳 {n} 個物件（順序與文章相同，每個物件的格式同上）。"
+    "只回傳 JSON 陣列，不要加其他說明文字。\n\n"
+)
+
+
+def _build_group_prompt(texts: list[str], titles: list[str]) -> str:
+    """建構多篇文章合併呼叫的 prompt。"""
+    parts = [_GROUP_PROMPT_HEADER.format(n=len(texts))]
+    for i, (text, title) in enumerate(zip(texts, titles), 1):
+        parts += (f"=== 第 {i} 篇 ===\n", _build_user_prompt(text, title), "\n\n")
+    return "".join(parts)
 
 
 def _is_retryable_api_error(error) -> bool:
@@ -314,25 +494,18 @@ def _is_retryable_api_error(error) -> bool:
     不可重試：401 AuthenticationError, 400 BadRequestError,
               其他 4xx 錯誤
     """
-    if not HAS_ANTHROPIC:
-        return False
-
-    # 網路連線和超時 → 重試
-    if isinstance(error, (anthropic.APIConnectionError, anthropic.APITimeoutError)):
-        return True
-    # Rate limit → 重試（但延遲更長）
-    if isinstance(error, anthropic.RateLimitError):
+    if isinstance(error, _RETRYABLE_ERRORS):
         return True
-    # 5xx server error → 重試
-    if isinstance(error, anthropic.InternalServerError):
-        return True
-    # 401, 400, 其他 4xx → 不重試
-    if isinstance(error, (anthropic.AuthenticationError, anthropic.BadRequestError)):
+    # 401, 400 → 不重試
+    if isinstance(error, _NON_RETRYABLE_ERRORS):
         return False
-    # 其他 APIStatusError → 檢查 status code
-    if isinstance(error, anthropic.APIStatusError):
-        return error.status_code >= 500
-    return False
+    # 其他 APIStatusError → 檢查 status code（其他 4xx 不重試）
+    status_code = getattr(error, "status_code", None)
+    return isinstance(status_code, int) and status_code >= 500
+
+
+# 回應被包在 ```json ... ``` 區塊時，取出其中的 JSON（只在直接解析失敗時使用）
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*\n(.*?)\n```', re.DOTALL)
 
 
 def process_single_article(
@@ -341,6 +514,7 @@ def process_single_article(
     model: str = DEFAULT_MODEL,
     max_tokens: int = DEFAULT_MAX_TOKENS,
     title: str = "",
+    client=None,
 ) -> dict:
     """用 Claude API 處理單篇文章（含自動重試）。
 
@@ -350,6 +524,7 @@ def process_single_article(
         model: 模型名稱
         max_tokens: 最大回傳 token 數
         title: 文章標題（可選，增加上下文）
+        client: 共用的 anthropic.Anthropic（可選，未提供時建立新的）
 
     Returns:
         包含 category, subcategory, tags, summary, key_points, clinical_relevance 的字典
@@ -363,14 +538,32 @@ def process_single_article(
             "anthropic 套件未安裝，請執行 pip install anthropic"
         )
 
-    client = anthropic.Anthropic(api_key=api_key)
-    user_prompt = _build_user_prompt(article_text, title)
+    if client is None:
+        client = anthropic.Anthropic(api_key=api_key)
+    response_text = _create_message(
+        client, model, max_tokens, _build_user_prompt(article_text, title),
+    )
+    result = _parse_json_response(response_text)
+    if not isinstance(result, dict):
+        raise RuntimeError(f"Claude 回應不是 JSON 物件：{response_text[:200]}")
+    return _normalize_result(result)
+
+
+def _create_message(client, model: str, max_tokens: int, user_prompt: str) -> str:
+    """呼叫 Claude API（含指數退避重試），回傳去除前後空白的回應文字。
 
+    Raises:
+        RuntimeError: 不可重試的錯誤，或重試仍失敗
+    """
     # API 呼叫（含指數退避重試）
     message = None
     last_error = None
+    attempts = 0
+    # 以截止時間限制整體重試：等待時間不超過剩餘時間，到期即放棄
+    deadline = time.monotonic() + API_MAX_RETRY_WAIT
 
     for attempt in range(MAX_API_RETRIES):
+        attempts = attempt + 1
         try:
             message = client.messages.create(
                 model=model,
@@ -387,40 +580,47 @@ def process_single_article(
                 # 不可重試的錯誤（401, 400 等），直接失敗
                 raise RuntimeError(f"Claude API 錯誤（不可重試）：{e}") from e
 
-            if attempt < MAX_API_RETRIES - 1:
-                # 計算重試延遲
-                if isinstance(e, anthropic.RateLimitError):
-                    delay = API_RATE_LIMIT_DELAY
-                    logger.warning(
-                        f"[AI] 🚫 遭遇速率限制，等待 {delay}s 後重試 "
-                        f"({attempt + 1}/{MAX_API_RETRIES})"
-                    )
-                else:
-                    delay = API_RETRY_BASE_DELAY * (2 ** attempt)
-                    logger.warning(
-                        f"[AI] ⚠️ API 錯誤：{e}，{delay}s 後重試 "
-                        f"({attempt + 1}/{MAX_API_RETRIES})"
-                    )
-                time.sleep(delay)
-            # 如果是最後一次嘗試，迴圈結束後會處理
+            if attempt == MAX_API_RETRIES - 1:
+                break  # 最後一次嘗試，迴圈結束後會處理
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"[AI] ⏱️ 重試已超過 {API_MAX_RETRY_WAIT}s，放棄")
+                break
+
+            # 計算重試延遲（不超過截止前的剩餘時間）
+            if isinstance(e, anthropic.RateLimitError):
+                delay = min(API_RATE_LIMIT_DELAY, remaining)
+                logger.warning(
+                    f"[AI] 🚫 遭遇速率限制，等待 {delay:g}s 後重試 "
+                    f"({attempt + 1}/{MAX_API_RETRIES})"
+                )
+            else:
+                delay = min(API_RETRY_BASE_DELAY * (2 ** attempt), remaining)
+                logger.warning(
+                    f"[AI] ⚠️ API 錯誤：{e}，{delay:g}s 後重試 "
+                    f"({attempt + 1}/{MAX_API_RETRIES})"
+                )
+            time.sleep(delay)
 
     if message is None:
         raise RuntimeError(
-            f"Claude API 呼叫在重試 {MAX_API_RETRIES} 次後仍然失敗：{last_error}"
+            f"Claude API 呼叫在重試 {attempts} 次後仍然失敗：{last_error}"
         ) from last_error
 
-    # 解析回應
-    response_text = message.content[0].text.strip()
+    return message.content[0].text.strip()
+
 
+def _parse_json_response(response_text: str):
+    """解析回應中的 JSON（直接解析失敗時，改取 ```json 區塊內的內容）"""
     # 嘗試直接解析 JSON
     try:
-        result = json.loads(response_text)
+        return json.loads(response_text)
     except json.JSONDecodeError:
         # 嘗試從 markdown code block 中提取 JSON
-        json_match = re.search(r'```(?:json)?\s*\n(.*?)\n```', response_text, re.DOTALL)
+        json_match = _JSON_FENCE_RE.search(response_text)
         if json_match:
             try:
-                result = json.loads(json_match.group(1))
+                return json.loads(json_match.group(1))
             except json.JSONDecodeError:
                 raise RuntimeError(
                     f"無法解析 Claude 回應為 JSON：{response_text[:200]}"
@@ -430,6 +630,9 @@ def process_single_article(
                 f"無法解析 Claude 回應為 JSON：{response_text[:200]}"
             )
 
+
+def _normalize_result(result: dict) -> dict:
+    """驗證必要欄位並補齊預設值"""
     # 驗證必要欄位
     required_keys = {"category", "tags", "summary"}
     missing = required_keys - set(result.keys())
@@ -448,6 +651,205 @@ def process_single_article(
     return result
 
 
+def process_article_group(
+    texts: list[str],
+    api_key: str,
+    model: str = DEFAULT_MODEL,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    titles: Optional[list[str]] = None,
+    client=None,
+) -> list[dict]:
+    """用一次 Claude API 呼叫處理多篇短文章（含自動重試）。
+
+    Args:
+        texts: 各篇文章正文
+        api_key: Anthropic API Key
+        model: 模型名稱
+        max_tokens: 每篇文章的最大回傳 token 數（整次呼叫的上限為篇數倍）
+        titles: 各篇文章標題（可選）
+        client: 共用的 anthropic.Anthropic（可選，未提供時建立新的）
+
+    Returns:
+        與 texts 順序相同的結果列表，格式同 process_single_article
+
+    Raises:
+        ImportError: 未安裝 anthropic
+        RuntimeError: API 呼叫失敗，或回應不是篇數相符的 JSON 陣列
+    """
+    if not HAS_ANTHROPIC:
+        raise ImportError(
+            "anthropic 套件未安裝，請執行 pip install anthropic"
+        )
+
+    if client is None:
+        client = anthropic.Anthropic(api_key=api_key)
+    response_text = _create_message(
+        client, model, max_tokens * len(texts),
+        _build_group_prompt(texts, titles or [""] * len(texts)),
+    )
+    results = _parse_json_response(response_text)
+    if not isinstance(results, list) or len(results) != len(texts):
+        raise RuntimeError(
+            f"Claude 回應不是 {len(texts)} 個元素的 JSON 陣列：{response_text[:200]}"
+        )
+    if not all(isinstance(r, dict) for r in results):
+        raise RuntimeError(f"Claude 回應的陣列元素不是 JSON 物件：{response_text[:200]}")
+    return [_normalize_result(r) for r in results]
+
+
+def _read_article(path: str) -> tuple[dict, str]:
+    """讀取文章資料夾的 content.md，回傳 (frontmatter, 正文)"""
+    with open(os.path.join(path, "content.md"), "r", encoding="utf-8") as f:
+        return parse_frontmatter(f.read())
+
+
+def _save_ai_result(article: dict, fm: dict, body: str, ai_result: dict, model: str) -> dict:
+    """將 AI 結果寫回 content.md 與 metadata.json，回傳成功的結果紀錄"""
+    title = article.get("title", "未知")
+    path = article.get("path", "")
+
+    # 更新 frontmatter
+    fm_updates = {
+        "category": (f"{ai_result['category']}/{ai_result['subcategory']}"
+                     if ai_result.get("subcategory")
+                     else ai_result["category"]),
+        "tags": ai_result.get("tags", []),
+        "summary": ai_result.get("summary", ""),
+        "key_points": ai_result.get("key_points", []),
+        "clinical_relevance": ai_result.get("clinical_relevance", ""),
+    }
+    # 沿用已解析的 frontmatter 與正文，不必再解析一次
+    updated_content = _render_frontmatter({**fm, **fm_updates}, body)
+
+    with open(os.path.join(path, "content.md"), "w", encoding="utf-8") as f:
+        f.write(updated_content)
+
+    # 更新 metadata.json
+    meta_path = os.path.join(path, "metadata.json")
+    if os.path.isfile(meta_path):
+        try:
+            with open(meta_path, "rb") as f:
+                meta = _loads_json(f.read())
+        except (ValueError, IOError):
+            meta = {}
+    else:
+        meta = {}
+
+    meta.update({
+        "category": fm_updates["category"],
+        "tags": ai_result.get("tags", []),
+        "summary": ai_result.get("summary", ""),
+        "ai_model": model,
+        "ai_processed_at": datetime.now().isoformat(),
+    })
+
+    with open(meta_path, "wb") as f:
+        f.write(_dumps_json(meta) + b"\n")
+
+    logger.info(f"[AI] ✅ {title} → {fm_updates['category']}")
+    return {
+        "title": title,
+        "status": "success",
+        "category": fm_updates["category"],
+        "path": path,
+        "platform": article.get("platform", ""),
+    }
+
+
+def _failed_record(article: dict, error: Exception) -> dict:
+    """記錄並回傳失敗的結果紀錄"""
+    title = article.get("title", "未知")
+    logger.error(f"[AI] ❌ {title}：{error}")
+    return {
+        "title": title,
+        "status": "failed",
+        "error": str(error),
+        "path": article.get("path", ""),
+        "platform": article.get("platform", ""),
+    }
+
+
+def _cancelled_record(article: dict) -> dict:
+    """取消後尚未開始處理的文章"""
+    return {
+        "title": article.get("title", "未知"),
+        "status": "cancelled",
+        "path": article.get("path", ""),
+        "platform": article.get("platform", ""),
+    }
+
+
+def _process_one(
+    article: dict,
+    api_key: str,
+    model: str,
+    max_tokens: int,
+    client=None,
+) -> dict:
+    """處理單篇文章：讀取 → 呼叫 Claude API → 寫回 content.md 與 metadata.json。
+
+    Returns:
+        結果紀錄 {"title", "status", "path", "platform", ...}；
+        成功時含 category，失敗時含 error（例外不會往外拋）
+    """
+    try:
+        fm, body = _read_article(article.get("path", ""))
+        ai_result = process_single_article(
+            body, api_key, model, max_tokens,
+            title=article.get("title", "未知"), client=client,
+        )
+        return _save_ai_result(article, fm, body, ai_result, model)
+    except Exception as e:
+        return _failed_record(article, e)
+
+
+def _process_group(
+    group: list[dict],
+    api_key: str,
+    model: str,
+    max_tokens: int,
+    client=None,
+) -> Optional[list[dict]]:
+    """以一次 API 呼叫處理一組短文章，回傳各篇的結果紀錄；
+    讀檔或合併呼叫失敗時回傳 None，由呼叫端改為逐篇處理。"""
+    try:
+        parsed = [_read_article(a.get("path", "")) for a in group]
+        ai_results = process_article_group(
+            [body for _, body in parsed], api_key, model, max_tokens,
+            titles=[a.get("title", "") for a in group], client=client,
+        )
+    except Exception as e:
+        logger.warning(f"[AI] 合併 {len(group)} 篇的呼叫失敗，改為逐篇處理：{e}")
+        return None
+
+    records = []
+    for article, (fm, body), ai_result in zip(group, parsed, ai_results):
+        try:
+            records.append(_save_ai_result(article, fm, body, ai_result, model))
+        except Exception as e:
+            records.append(_failed_record(article, e))
+    return records
+
+
+def _pack_groups(articles: list[dict], group_size: int) -> list[list[int]]:
+    """依序把短文章貪婪地合併成組（每組最多 group_size 篇，
+    總字數不超過 GROUP_CHAR_BUDGET），回傳各組的文章索引。"""
+    groups: list[list[int]] = []
+    current: list[int] = []
+    current_chars = 0
+    for i, article in enumerate(articles):
+        chars = article.get("char_count", MAX_ARTICLE_CHARS)
+        if current and (len(current) >= group_size
+                        or current_chars + chars > GROUP_CHAR_BUDGET):
+            groups.append(current)
+            current, current_chars = [], 0
+        current.append(i)
+        current_chars += chars
+    if current:
+        groups.append(current)
+    return groups
+
+
 def process_article_batch(
     articles: list[dict],
     api_key: str,
@@ -456,118 +858,121 @@ def process_article_batch(
     api_delay: float = DEFAULT_API_DELAY,
     on_progress: Optional[callable] = None,
     cancel_event=None,
+    concurrency: int = DEFAULT_AI_CONCURRENCY,
+    on_result: Optional[callable] = None,
+    group_size: int = DEFAULT_AI_GROUP_SIZE,
 ) -> dict:
     """批次處理多篇文章。
 
+    最多 concurrency 個 API 呼叫同時進行（各自讀檔 + 一次 API 呼叫），
+    呼叫的起點之間仍至少間隔 api_delay 秒。group_size > 1 時，
+    相鄰的短文章會合併成一次呼叫，合併失敗的組再逐篇處理。
+
     Args:
         articles: 文章列表（來自 scan_articles，每篇需含 path）
         api_key: Anthropic API Key
         model: 模型名稱
         max_tokens: 最大回傳 token 數
         api_delay: API 呼叫間隔（秒）
-        on_progress: 進度回調 (current, total, message)
-        cancel_event: threading.Event，設定時取消處理
+        on_progress: 進度回調 (current, total, message)，每完成一篇呼叫一次
+        cancel_event: threading.Event，設定時不再開始新的 API 呼叫
+        concurrency: 同時進行的 API 呼叫數
+        on_result: 單篇結果回調 (result)，每完成一篇呼叫一次
+        group_size: 每次 API 呼叫最多合併幾篇短文章（1 表示不合併）
 
     Returns:
-        {"success": int, "failed": int, "results": list[dict]}
+        {"success": int, "failed": int, "cancelled": int, "results": list[dict]}，
+        results 依輸入順序排列；取消後未開始的文章以 status "cancelled" 列出（同樣觸發 on_result），
+        三項計數加總等於輸入篇數
     """
     total = len(articles)
-    success_count = 0
-    failed_count = 0
-    results = []
+    slots: list[Optional[dict]] = [None] * total
+    done = 0
 
-    for i, article in enumerate(articles, 1):
-        if cancel_event and cancel_event.is_set():
-            logger.info("AI 處理已被使用者取消")
-            break
-
-        title = article.get("title", "未知")
-        path = article.get("path", "")
+    # 各 worker 共用的起點排程：下一次 API 呼叫最早可以開始的時間
+    pace_lock = threading.Lock()
+    next_start = time.monotonic()
 
-        if on_progress:
-            on_progress(i, total, f"正在處理：{title}")
-
-        try:
-            # 讀取文章內容
-            content_path = os.path.join(path, "content.md")
-            with open(content_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            fm, body = parse_frontmatter(content)
+    def _wait_turn() -> bool:
+        """等到輪到下一次 API 呼叫；等待中被取消時回傳 False"""
+        nonlocal next_start
+        if cancel_event and cancel_event.is_set():
+            return False
+        with pace_lock:
+            now = time.monotonic()
+            start = max(now, next_start)
+            next_start = start + api_delay
+        if start > now:
+            if cancel_event:
+                return not cancel_event.wait(start - now)
+            time.sleep(start - now)
+        return True
 
-            # 呼叫 Claude API
-            ai_result = process_single_article(
-                body, api_key, model, max_tokens, title=title,
-            )
+    def _run(group: list[dict]) -> list[dict]:
+        if not _wait_turn():
+            return []
+        if len(group) == 1:
+            return [_process_one(group[0], api_key, model, max_tokens, client)]
+        records = _process_group(group, api_key, model, max_tokens, client)
+        if records is not None:
+            return records
+        # 合併呼叫失敗：逐篇重做，每篇（含第一篇）都重新排隊，
+        # 剛才的合併呼叫已用掉一次名額，不可緊接著再打 API
+        records = []
+        for article in group:
+            if not _wait_turn():
+                break
+            records.append(_process_one(article, api_key, model, max_tokens, client))
+        return records
+
+    # 整批共用一個 client，連線池與 TLS 連線可在文章之間重複使用
+    client = anthropic.Anthropic(api_key=api_key) if HAS_ANTHROPIC and total else None
 
-            # 更新 frontmatter
-            fm_updates = {
-                "category": (f"{ai_result['category']}/{ai_result['subcategory']}"
-                             if ai_result.get("subcategory")
-                             else ai_result["category"]),
-                "tags": ai_result.get("tags", []),
-                "summary": ai_result.get("summary", ""),
-                "key_points": ai_result.get("key_points", []),
-                "clinical_relevance": ai_result.get("clinical_relevance", ""),
+    try:
+        groups = _pack_groups(articles, max(1, group_size))
+        workers = max(1, min(concurrency, len(groups)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_run, [articles[i] for i in idx]): idx
+                for idx in groups
             }
-            updated_content = update_frontmatter(content, fm_updates)
-
-            with open(content_path, "w", encoding="utf-8") as f:
-                f.write(updated_content)
-
-            # 更新 metadata.json
-            meta_path = os.path.join(path, "metadata.json")
-            if os.path.isfile(meta_path):
-                try:
-                    with open(meta_path, "r", encoding="utf-8") as f:
-                        meta = json.load(f)
-                except (json.JSONDecodeError, IOError):
-                    meta = {}
-            else:
-                meta = {}
-
-            meta.update({
-                "category": fm_updates["category"],
-                "tags": ai_result.get("tags", []),
-                "summary": ai_result.get("summary", ""),
-                "ai_model": model,
-                "ai_processed_at": datetime.now().isoformat(),
-            })
-
-            with open(meta_path, "w", encoding="utf-8") as f:
-                json.dump(meta, f, ensure_ascii=False, indent=2)
-                f.write("\n")
-
-            results.append({
-                "title": title,
-                "status": "success",
-                "category": fm_updates["category"],
-                "path": path,
-            })
-            success_count += 1
-            logger.info(f"[AI] ✅ {title} → {fm_updates['category']}")
-
-        except Exception as e:
-            logger.error(f"[AI] ❌ {title}：{e}")
-            results.append({
-                "title": title,
-                "status": "failed",
-                "error": str(e),
-                "path": path,
-            })
-            failed_count += 1
-
-        # API 呼叫間隔
-        if i < total and not (cancel_event and cancel_event.is_set()):
-            time.sleep(api_delay)
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                for i, record in zip(futures[future], future.result()):
+                    slots[i] = record
+                    done += 1
+                    if on_progress:
+                        on_progress(done, total, f"已處理：{record['title']}")
+                    if on_result:
+                        on_result(record)
+                if cancel_event and cancel_event.is_set():
+                    for f in futures:
+                        f.cancel()
+    finally:
+        if client is not None:
+            client.close()
+
+    cancelled_count = 0
+    for i, record in enumerate(slots):
+        if record is None:
+            slots[i] = record = _cancelled_record(articles[i])
+            cancelled_count += 1
+            if on_result:
+                on_result(record)
+    if cancelled_count:
+        logger.info(f"AI 處理已被使用者取消，{cancelled_count} 篇未處理")
+
+    success_count = sum(1 for r in slots if r["status"] == "success")
 
     if on_progress:
         on_progress(total, total, "AI 處理完成")
 
     return {
         "success": success_count,
-        "failed": failed_count,
-        "results": results,
+        "failed": total - success_count - cancelled_count,
+        "cancelled": cancelled_count,
+        "results": slots,
     }
 
 
@@ -583,7 +988,15 @@ def main():
     parser.add_argument("--model", default=DEFAULT_MODEL, help="Claude 模型名稱")
     parser.add_argument("--delay", type=float, default=DEFAULT_API_DELAY,
                         help="API 呼叫間隔（秒）")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_AI_CONCURRENCY,
+                        metavar="N", help="同時進行的 API 呼叫數")
+    parser.add_argument("--group", type=int, default=DEFAULT_AI_GROUP_SIZE,
+                        metavar="N", help="每次 API 呼叫最多合併幾篇短文章（預設 1：不合併）")
     args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency 至少為 1")
+    if args.group < 1:
+        parser.error("--group 至少為 1")
 
     logging.basicConfig(level=logging.INFO, format="%(message)s")
 
@@ -625,8 +1038,10 @@ def main():
         result = process_article_batch(
             articles, api_key, model=args.model,
             api_delay=args.delay, on_progress=progress_cb,
+            concurrency=args.concurrency, group_size=args.group,
         )
-        print(f"\n完成！成功：{result['success']}，失敗：{result['failed']}")
+        print(f"\n完成！成功：{result['success']}，失敗：{result['failed']}"
+              + (f"，取消：{result['cancelled']}" if result["cancelled"] else ""))
 
     else:
         parser.print_help()
@@ -8,6 +8,7 @@ CLIMB GUI 啟動入口
   python -m climb        # 模組執行
 """
 
+import multiprocessing
 import os
 import sys
 from pathlib import Path
@@ -30,7 +31,8 @@ from gui.app import run
 
 
 def main_gui():
-    """GUI 啟動入口 — 供 pyproject.toml entry point 使用"""
+    """GUI 啟動入口 — 供 pyproject.toml entry point、python -m climb 與直接執行共用"""
+    multiprocessing.freeze_support()  # 打包後 Markdown 行程池的子行程需要
     run()
 
 
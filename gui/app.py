@@ -7,7 +7,6 @@ CLIMB GUI 主視窗
 
 import os
 import sys
-import queue
 import logging
 
 import customtkinter as ctk
@@ -19,12 +18,14 @@ if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
 import scraper
+import ai_processor
 
+from gui import theme
 from gui.theme import (
-    FONT_NORMAL, FONT_HEADING, WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT,
+    WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT,
     WINDOW_DEFAULT_SIZE, PAD_X, PAD_Y,
 )
-from gui.workers.log_handler import GUILogHandler
+from gui.workers.log_handler import GUILogHandler, LogBuffer
 from gui.workers.task_runner import TaskRunner
 
 
@@ -34,21 +35,25 @@ class ClimbApp(ctk.CTk):
     def __init__(self):
         super().__init__()
 
+        # Tk root 已存在，建立共用字型（須早於頁籤匯入）
+        theme.init_fonts()
+
         self.title("CLIMB — 獸醫文章擷取工具")
         self.geometry(WINDOW_DEFAULT_SIZE)
         self.minsize(WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT)
 
         # 共享狀態
-        self.log_queue: queue.Queue = queue.Queue()
+        self.log_buffer = LogBuffer(maxlen=1000)
         self.task_runner = TaskRunner(max_workers=2)
         self.config = dict(scraper._CONFIG)
 
-        # 日誌橋接：在 scraper.logger 安裝 GUI handler
-        self._gui_log_handler = GUILogHandler(self.log_queue)
-        scraper.logger.addHandler(self._gui_log_handler)
-        # 確保 logger 不會被 level 過濾掉低等級訊息
-        if scraper.logger.level > logging.DEBUG:
-            scraper.logger.setLevel(logging.DEBUG)
+        # 日誌橋接：在 scraper / ai_processor 的 logger 安裝 GUI handler
+        self._gui_log_handler = GUILogHandler(self.log_buffer)
+        for log in (scraper.logger, ai_processor.logger):
+            log.addHandler(self._gui_log_handler)
+            # 確保 logger 不會被 level 過濾掉低等級訊息（未設定時會沿用 root 的 WARNING）
+            if log.level == logging.NOTSET or log.level > logging.DEBUG:
+                log.setLevel(logging.DEBUG)
 
         # 頁籤實例容器
         self._tabs: dict[str, object] = {}
@@ -116,12 +121,8 @@ class ClimbApp(ctk.CTk):
 
     def _poll_queues(self):
         """輪詢所有 queue，將資料分派到對應的 GUI 元件"""
-        # 處理日誌 queue
-        for _ in range(50):  # 每次最多處理 50 條，避免卡住 UI
-            try:
-                level, msg = self.log_queue.get_nowait()
-            except queue.Empty:
-                break
+        # 處理日誌緩衝區（每次最多處理 50 條，避免卡住 UI）
+        for level, msg in self._gui_log_handler.drain(50):
             try:
                 log_tab = self._tabs.get("日誌")
                 if log_tab:
@@ -156,7 +157,8 @@ class ClimbApp(ctk.CTk):
             ext_tab.shutdown()
 
         self.task_runner.shutdown()
-        scraper.logger.removeHandler(self._gui_log_handler)
+        for log in (scraper.logger, ai_processor.logger):
+            log.removeHandler(self._gui_log_handler)
         self.destroy()
 
 
@@ -10,7 +10,6 @@ import uuid
 
 import customtkinter as ctk
 
-import scraper
 import ai_processor
 from gui.theme import (
     FONT_NORMAL, FONT_SMALL, FONT_HEADING,
@@ -18,6 +17,7 @@ from gui.theme import (
 )
 from gui.widgets.progress_panel import ProgressPanel
 from gui.widgets.result_table import ResultTable
+from gui.workers.task_runner import FastQueue
 
 
 class AIProcessTab:
@@ -32,7 +32,7 @@ class AIProcessTab:
         self._checkboxes: list[tuple[ctk.BooleanVar, dict]] = []
 
         # 自己的 queue
-        self._progress_queue: queue.Queue = queue.Queue()
+        self._progress_queue: FastQueue = FastQueue()
         self._result_queue: queue.Queue = queue.Queue()
 
         self._build_ui()
@@ -307,6 +307,10 @@ class AIProcessTab:
         model = self.app.config.get("ai_model", ai_processor.DEFAULT_MODEL)
         api_delay = float(self.app.config.get("ai_api_delay",
                                                ai_processor.DEFAULT_API_DELAY))
+        concurrency = int(self.app.config.get("ai_concurrency",
+                                              ai_processor.DEFAULT_AI_CONCURRENCY))
+        group_size = int(self.app.config.get("ai_group_size",
+                                             ai_processor.DEFAULT_AI_GROUP_SIZE))
 
         # 清除舊結果
         self._result_table.clear()
@@ -324,108 +328,32 @@ class AIProcessTab:
         self.app.task_runner.submit(
             self.task_id,
             self._process_worker,
-            selected, api_key, model, api_delay,
+            selected, api_key, model, api_delay, concurrency, group_size,
             progress_queue=self._progress_queue,
             result_queue=self._result_queue,
         )
 
     @staticmethod
-    def _process_worker(articles, api_key, model, api_delay,
+    def _process_worker(articles, api_key, model, api_delay, concurrency, group_size,
                         cancel_event, progress_queue, result_queue):
-        """背景 AI 處理 worker"""
-        total = len(articles)
-        success_count = 0
-        failed_count = 0
-
-        for i, article in enumerate(articles, 1):
-            if cancel_event.is_set():
-                break
-
-            title = article.get("title", "未知")
-            path = article.get("path", "")
-            progress_queue.put((i, total, f"正在處理：{title}"))
+        """背景 AI 處理 worker（多篇並行，由 ai_processor.process_article_batch 排程）"""
+        def on_result(record):
+            data = {k: v for k, v in record.items() if k not in ("title", "status")}
+            result_queue.put((record["title"], record["status"], data))
+
+        result = ai_processor.process_article_batch(
+            articles, api_key, model=model,
+            api_delay=api_delay, concurrency=concurrency, group_size=group_size,
+            on_progress=lambda current, total, msg: progress_queue.put(
+                (current, total, msg)),
+            on_result=on_result,
+            cancel_event=cancel_event,
+        )
 
-            try:
-                # 讀取文章內容
-                content_path = os.path.join(path, "content.md")
-                with open(content_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                fm, body = ai_processor.parse_frontmatter(content)
-
-                # 呼叫 Claude API
-                ai_result = ai_processor.process_single_article(
-                    body, api_key, model, title=title,
-                )
-
-                # 更新 frontmatter
-                fm_updates = {
-                    "category": (
-                        f"{ai_result['category']}/{ai_result['subcategory']}"
-                        if ai_result.get("subcategory")
-                        else ai_result["category"]
-                    ),
-                    "tags": ai_result.get("tags", []),
-                    "summary": ai_result.get("summary", ""),
-                    "key_points": ai_result.get("key_points", []),
-                    "clinical_relevance": ai_result.get("clinical_relevance", ""),
-                }
-                updated_content = ai_processor.update_frontmatter(
-                    content, fm_updates,
-                )
-
-                with open(content_path, "w", encoding="utf-8") as f:
-                    f.write(updated_content)
-
-                # 更新 metadata.json
-                import json
-                from datetime import datetime
-                meta_path = os.path.join(path, "metadata.json")
-                if os.path.isfile(meta_path):
-                    try:
-                        with open(meta_path, "r", encoding="utf-8") as f:
-                            meta = json.load(f)
-                    except (json.JSONDecodeError, IOError):
-                        meta = {}
-                else:
-                    meta = {}
-
-                meta.update({
-                    "category": fm_updates["category"],
-                    "tags": ai_result.get("tags", []),
-                    "summary": ai_result.get("summary", ""),
-                    "ai_model": model,
-                    "ai_processed_at": datetime.now().isoformat(),
-                })
-                with open(meta_path, "w", encoding="utf-8") as f:
-                    json.dump(meta, f, ensure_ascii=False, indent=2)
-                    f.write("\n")
-
-                result_queue.put((title, "success", {
-                    "category": fm_updates["category"],
-                    "path": path,
-                    "platform": article.get("platform", ""),
-                }))
-                success_count += 1
-
-            except Exception as e:
-                scraper.logger.error(f"[AI] {title}：{e}")
-                result_queue.put((title, "failed", {
-                    "error": str(e),
-                    "path": path,
-                    "platform": article.get("platform", ""),
-                }))
-                failed_count += 1
-
-            # API 呼叫間隔
-            if i < total and not cancel_event.is_set():
-                import time
-                time.sleep(api_delay)
-
-        progress_queue.put((total, total, "AI 處理完成"))
         result_queue.put(("__AI_DONE__", "done", {
-            "success": success_count,
-            "failed": failed_count,
+            "success": result["success"],
+            "failed": result["failed"],
+            "cancelled": result["cancelled"],
         }))
 
     def _cancel_task(self):
@@ -462,6 +390,8 @@ class AIProcessTab:
             if status == "success":
                 category = data.get("category", "")
                 display = f"{title} → {category}"
+            elif status == "cancelled":
+                display = f"{title} (已取消)"
             else:
                 error = data.get("error", "")
                 display = f"{title} (失敗：{error[:40]})"
@@ -474,6 +404,7 @@ class AIProcessTab:
         self._progress.set_status(
             f"完成！成功：{data.get('success', 0)}，"
             f"失敗：{data.get('failed', 0)}"
+            + (f"，取消：{data['cancelled']}" if data.get("cancelled") else "")
         )
         self._process_btn.configure(state="normal")
         self._scan_btn.configure(state="normal")
@@ -7,12 +7,12 @@
 import json
 import os
 import subprocess
-import platform as plat
 
 import customtkinter as ctk
 
 import scraper
 from gui.theme import (
+    IS_WINDOWS, IS_MAC,
     FONT_NORMAL, FONT_SMALL, FONT_HEADING, FONT_MONO_SMALL,
     PAD_X, PAD_Y, PAD_SECTION, PAD_INNER,
 )
@@ -292,9 +292,9 @@ class ArticleBrowserTab:
         article = self._filtered[self._selected_index]
         dir_path = article.get("_dir_path", "")
         if dir_path and os.path.isdir(dir_path):
-            if plat.system() == "Windows":
+            if IS_WINDOWS:
                 os.startfile(dir_path)
-            elif plat.system() == "Darwin":
+            elif IS_MAC:
                 subprocess.run(["open", dir_path])
             else:
                 subprocess.run(["xdg-open", dir_path])
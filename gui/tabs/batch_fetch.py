@@ -1,12 +1,12 @@
 """
 批次擷取頁籤
 =============
-從檔案或手動輸入多個 URL，背景逐一擷取，顯示進度和結果列表。
+從檔案或手動輸入多個 URL，背景批次擷取（不同網站並行），顯示進度和結果列表。
 """
 
 import os
 import queue
-import time
+import threading
 import uuid
 
 import customtkinter as ctk
@@ -18,6 +18,7 @@ from gui.theme import (
 )
 from gui.widgets.progress_panel import ProgressPanel
 from gui.widgets.result_table import ResultTable
+from gui.workers.task_runner import FastQueue, ProgressBatcher, iter_progress
 
 
 class BatchFetchTab:
@@ -29,7 +30,7 @@ class BatchFetchTab:
         self.task_id = None  # 動態產生
 
         # 自己的 queue
-        self._progress_queue: queue.Queue = queue.Queue()
+        self._progress_queue: FastQueue = FastQueue()
         self._result_queue: queue.Queue = queue.Queue()
 
         self._build_ui()
@@ -142,11 +143,12 @@ class BatchFetchTab:
 
     def poll_queues(self):
         """輪詢自己的 queue（由主視窗呼叫）"""
-        # 進度
+        # 進度（worker 以 ProgressBatcher 批次送出）
         for _ in range(50):
             try:
-                current, total, message = self._progress_queue.get_nowait()
-                self._progress.update_progress(current, total, message)
+                item = self._progress_queue.get_nowait()
+                for current, total, message in iter_progress(item):
+                    self._progress.update_progress(current, total, message)
             except queue.Empty:
                 break
             except Exception:
@@ -272,59 +274,28 @@ class BatchFetchTab:
 
     @staticmethod
     def _batch_worker(urls, output_dir, cancel_event, progress_queue, result_queue):
-        """背景執行緒中逐一擷取 URL"""
+        """背景執行緒中批次擷取（交給 scraper.batch_fetch_urls：不同網站並行、同網站禮貌延遲）"""
         total = len(urls)
-        for i, url in enumerate(urls, 1):
-            if cancel_event.is_set():
-                break
-
-            platform_name = scraper.identify_platform(url)
-
-            # 檢查是否為不支援的平台
-            if platform_name in ("Facebook", "Instagram"):
-                result_queue.put((url, "skipped", {
-                    "platform": platform_name,
-                    "reason": "需要 Chrome Extension",
-                }))
-                progress_queue.put((i, total, f"跳過：{url}"))
-                continue
-
-            progress_queue.put((i, total, f"擷取中：{url}"))
-
-            # 檢查去重
-            if scraper.is_already_fetched(url, output_dir):
-                result_queue.put((url, "skipped", {
-                    "platform": platform_name,
-                    "reason": "已擷取過",
-                }))
-                continue
-
-            try:
-                article = scraper.fetch_article(url)
-                if article:
-                    save_path = scraper.save_article(article, output_dir)
-                    scraper.mark_as_fetched(url, output_dir)
-                    result_queue.put((url, "success", {
-                        "platform": platform_name,
-                        "path": save_path or "",
-                    }))
-                else:
-                    result_queue.put((url, "failed", {
-                        "platform": platform_name,
-                    }))
-            except Exception as e:
-                scraper.logger.error(f"擷取失敗 {url}: {e}")
-                result_queue.put((url, "failed", {
-                    "platform": platform_name,
-                    "error": str(e),
-                }))
-
-            # 禮貌延遲
-            if i < total and not cancel_event.is_set():
-                time.sleep(scraper.POLITENESS_DELAY)
+        progress = ProgressBatcher(progress_queue)
+        progress_lock = threading.Lock()  # on_result 會從多個網站的工作執行緒呼叫
+        done = 0
+
+        def on_result(status, record):
+            nonlocal done
+            url = record["url"]
+            data = {k: v for k, v in record.items() if k != "url"}
+            data["platform"] = scraper.identify_platform(url)["name"]
+            result_queue.put((url, status, data))
+            with progress_lock:
+                done += 1
+                progress.put(done, total, f"已完成：{url}")
+
+        scraper.batch_fetch_urls(urls, output_dir,
+                                 on_result=on_result, cancel_event=cancel_event)
 
         # 完成通知
-        progress_queue.put((total, total, "批次擷取完成"))
+        progress.put(total, total, "批次擷取完成")
+        progress.flush()
         result_queue.put(("__BATCH_DONE__", "done", {}))
 
     def _on_result(self, url, status, data):
@@ -335,7 +306,7 @@ class BatchFetchTab:
             self._stats_label.configure(text=self._result_table.get_stats_text())
             return
 
-        platform_name = data.get("platform", scraper.identify_platform(url))
+        platform_name = data.get("platform") or scraper.identify_platform(url)["name"]
         path = data.get("path", "")
 
         self._result_table.add_result(url, platform_name, status, path)
@@ -8,12 +8,12 @@ Extension 伺服器頁籤
 import os
 import queue
 import subprocess
-import platform as plat
 
 import customtkinter as ctk
 
 import scraper
 from gui.theme import (
+    IS_WINDOWS, IS_MAC,
     FONT_NORMAL, FONT_SMALL, FONT_HEADING,
     PAD_X, PAD_Y, PAD_SECTION, PAD_INNER,
 )
@@ -280,9 +280,9 @@ class ExtensionTab:
         """開啟 Extension 資料夾"""
         path = self._get_extension_path()
         if os.path.exists(path):
-            if plat.system() == "Windows":
+            if IS_WINDOWS:
                 os.startfile(path)
-            elif plat.system() == "Darwin":
+            elif IS_MAC:
                 subprocess.run(["open", path])
             else:
                 subprocess.run(["xdg-open", path])
@@ -18,6 +18,7 @@ from gui.theme import (
 )
 from gui.widgets.progress_panel import ProgressPanel
 from gui.widgets.result_table import ResultTable
+from gui.workers.task_runner import FastQueue, ProgressBatcher, iter_progress
 
 
 # PTT 獸醫相關常用看板
@@ -35,7 +36,7 @@ class PttBoardTab:
         self._checkboxes: list[tuple[ctk.BooleanVar, str, str]] = []
 
         # 自己的 queue
-        self._progress_queue: queue.Queue = queue.Queue()
+        self._progress_queue: FastQueue = FastQueue()
         self._result_queue: queue.Queue = queue.Queue()
 
         self._build_ui()
@@ -130,8 +131,9 @@ class PttBoardTab:
         # 進度
         for _ in range(50):
             try:
-                current, total, message = self._progress_queue.get_nowait()
-                self._progress.update_progress(current, total, message)
+                item = self._progress_queue.get_nowait()
+                for current, total, message in iter_progress(item):
+                    self._progress.update_progress(current, total, message)
             except queue.Empty:
                 break
             except Exception:
@@ -193,24 +195,16 @@ class PttBoardTab:
             progress_queue.put((1, 2, f"正在掃描 PTT {board} 看板..."))
 
             import requests as req
-            from bs4 import BeautifulSoup
 
             base_url = "https://www.ptt.cc"
             board_url = f"{base_url}/bbs/{board}/index.html"
 
-            # 使用 Session 維持連線，避免 ConnectionResetError
-            session = req.Session()
-            session.cookies.set("over18", "1")
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                              'AppleWebKit/537.36 (KHTML, like Gecko) '
-                              'Chrome/120.0.0.0 Safari/537.36',
+            # 使用 scraper 共用的 Session（連線池 keep-alive），避免每頁重新握手
+            cookies = {"over18": "1"}
+            headers = {
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'zh-TW,zh;q=0.9,en-US;q=0.8,en;q=0.7',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
                 'Referer': 'https://www.ptt.cc/',
-            })
+            }
 
             article_urls = []
             article_titles = []
@@ -224,13 +218,14 @@ class PttBoardTab:
                                     f"掃描第 {page_num + 1}/{pages} 頁..."))
 
                 # 重試機制（最多 3 次）
-                resp = None
+                html = ""
                 for attempt in range(3):
                     try:
-                        resp = session.get(
-                            current_url, timeout=scraper.REQUEST_TIMEOUT,
+                        # 條件式請求：列表頁沒變動時伺服器回 304，沿用上次的內容
+                        html = scraper._conditional_get_text(
+                            current_url, headers=headers, cookies=cookies,
+                            timeout=scraper.REQUEST_TIMEOUT,
                         )
-                        resp.raise_for_status()
                         break
                     except (req.ConnectionError, req.Timeout) as e:
                         if attempt < 2:
@@ -241,27 +236,16 @@ class PttBoardTab:
                         else:
                             raise
 
-                soup = BeautifulSoup(resp.text, "html.parser")
+                entries, prev_href = scraper.parse_ptt_board_page(html)
 
                 # 取得文章列表
-                for div in soup.select("div.r-ent"):
-                    title_tag = div.select_one("div.title a")
-                    if title_tag:
-                        href = title_tag.get("href", "")
-                        title = title_tag.get_text(strip=True)
-                        full_url = base_url + href
-                        article_urls.append(full_url)
-                        article_titles.append(title)
+                for href, title in entries:
+                    article_urls.append(base_url + href)
+                    article_titles.append(title)
 
                 # 找上一頁連結
-                prev_link = None
-                for a in soup.select("div.btn-group-paging a"):
-                    if "上頁" in a.get_text():
-                        prev_link = a
-                        break
-
-                if prev_link:
-                    current_url = base_url + prev_link["href"]
+                if prev_href:
+                    current_url = base_url + prev_href
                 else:
                     break
 
@@ -269,13 +253,14 @@ class PttBoardTab:
                 if page_num < pages - 1:
                     time.sleep(1)
 
-            session.close()
-
-            # 過濾已擷取的
+            # 過濾已擷取的（去重記錄只載入一次）與跨頁重複出現的文章
+            fetched = scraper.DedupStore(output_dir)
+            seen = set()
             new_urls = []
             new_titles = []
             for url, title in zip(article_urls, article_titles):
-                if not scraper.is_already_fetched(url, output_dir):
+                if url not in fetched and url not in seen:
+                    seen.add(url)
                     new_urls.append(url)
                     new_titles.append(title)
 
@@ -392,28 +377,28 @@ class PttBoardTab:
     def _fetch_worker(urls, output_dir, cancel_event, progress_queue, result_queue):
         """背景逐一擷取文章"""
         total = len(urls)
-        for i, url in enumerate(urls, 1):
-            if cancel_event.is_set():
-                break
-
-            progress_queue.put((i, total, f"擷取中 ({i}/{total})：{url}"))
-
-            try:
-                article = scraper.fetch_article(url)
-                if article:
-                    save_path = scraper.save_article(article, output_dir)
-                    scraper.mark_as_fetched(url, output_dir)
-                    result_queue.put((url, "success", {"path": save_path or ""}))
-                else:
-                    result_queue.put((url, "failed", {}))
-            except Exception as e:
-                scraper.logger.error(f"擷取失敗 {url}: {e}")
-                result_queue.put((url, "failed", {"error": str(e)}))
-
-            if i < total and not cancel_event.is_set():
-                time.sleep(scraper.POLITENESS_DELAY)
+        progress = ProgressBatcher(progress_queue)
+        with scraper.DedupStore(output_dir) as store:
+            for i, url in enumerate(urls, 1):
+                if cancel_event.is_set():
+                    break
 
-        progress_queue.put((total, total, "完成"))
+                progress.put(i, total, f"擷取中 ({i}/{total})：{url}")
+
+                try:
+                    article = scraper.fetch_article(url)
+                    if article:
+                        save_path = scraper.save_article(article, output_dir)
+                        store.add(url)
+                        result_queue.put((url, "success", {"path": save_path or ""}))
+                    else:
+                        result_queue.put((url, "failed", {}))
+                except Exception as e:
+                    scraper.logger.error(f"擷取失敗 {url}: {e}")
+                    result_queue.put((url, "failed", {"error": str(e)}))
+
+        progress.put(total, total, "完成")
+        progress.flush()
         result_queue.put(("__FETCH_DONE__", "done", {}))
 
     def _cancel_task(self):
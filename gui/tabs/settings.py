@@ -41,7 +41,11 @@ class SettingsTab:
         self._add_number_field(scroll, "request_timeout", "請求逾時（秒）")
         self._add_number_field(scroll, "max_retries", "最大重試次數")
         self._add_number_field(scroll, "retry_base_delay", "重試基本延遲（秒）")
+        self._add_number_field(scroll, "retry_max_delay", "重試延遲上限（秒）")
+        self._add_number_field(scroll, "retry_max_total", "每個策略重試總時間上限（秒，0 = 不限）")
         self._add_number_field(scroll, "politeness_delay", "禮貌延遲（秒）")
+        self._add_number_field(scroll, "politeness_burst", "同網站可連續擷取次數")
+        self._add_number_field(scroll, "batch_concurrency", "批次同時擷取網站數")
 
         # --- Jina Reader ---
         self._add_section(scroll, "Jina Reader")
@@ -79,6 +83,8 @@ class SettingsTab:
         self._add_secret_field(scroll, "anthropic_api_key", "Anthropic API Key")
         self._add_text_field(scroll, "ai_model", "模型名稱", width=300)
         self._add_number_field(scroll, "ai_api_delay", "API 呼叫間隔（秒）")
+        self._add_number_field(scroll, "ai_concurrency", "同時處理文章數")
+        self._add_number_field(scroll, "ai_group_size", "每次呼叫合併短文章數")
 
         # --- 日誌 ---
         self._add_section(scroll, "日誌")
@@ -213,12 +219,18 @@ class SettingsTab:
             "request_timeout": str(config.get("request_timeout", scraper.REQUEST_TIMEOUT)),
             "max_retries": str(config.get("max_retries", scraper.MAX_RETRIES)),
             "retry_base_delay": str(config.get("retry_base_delay", scraper.RETRY_BASE_DELAY)),
+            "retry_max_delay": str(config.get("retry_max_delay", scraper.RETRY_MAX_DELAY)),
+            "retry_max_total": str(config.get("retry_max_total", scraper.RETRY_MAX_TOTAL)),
             "politeness_delay": str(config.get("politeness_delay", scraper.POLITENESS_DELAY)),
+            "politeness_burst": str(config.get("politeness_burst", scraper.POLITENESS_BURST)),
+            "batch_concurrency": str(config.get("batch_concurrency", scraper.BATCH_CONCURRENCY)),
             "jina_base_url": config.get("jina_base_url", scraper.JINA_BASE_URL),
             "jina_api_key": scraper.JINA_API_KEY,
             "anthropic_api_key": config.get("anthropic_api_key", ""),
             "ai_model": config.get("ai_model", "claude-sonnet-4-20250514"),
             "ai_api_delay": str(config.get("ai_api_delay", 1.0)),
+            "ai_concurrency": str(config.get("ai_concurrency", 4)),
+            "ai_group_size": str(config.get("ai_group_size", 1)),
         }
 
         for key, value in field_map.items():
@@ -238,17 +250,32 @@ class SettingsTab:
                 "request_timeout": int(self._entries["request_timeout"].get()),
                 "max_retries": int(self._entries["max_retries"].get()),
                 "retry_base_delay": int(self._entries["retry_base_delay"].get()),
+                "retry_max_delay": int(self._entries["retry_max_delay"].get()),
+                "retry_max_total": int(self._entries["retry_max_total"].get()),
                 "politeness_delay": int(self._entries["politeness_delay"].get()),
+                "politeness_burst": int(self._entries["politeness_burst"].get()),
+                "batch_concurrency": int(self._entries["batch_concurrency"].get()),
                 "jina_base_url": self._entries["jina_base_url"].get().strip(),
                 "log_level": self._log_level_var.get(),
                 "ai_model": self._entries["ai_model"].get().strip(),
                 "ai_api_delay": float(self._entries["ai_api_delay"].get()),
+                "ai_concurrency": int(self._entries["ai_concurrency"].get()),
+                "ai_group_size": int(self._entries["ai_group_size"].get()),
             }
 
             # 驗證數值
-            for key in ("request_timeout", "max_retries", "retry_base_delay", "politeness_delay"):
+            for key in ("request_timeout", "max_retries", "retry_base_delay",
+                        "retry_max_delay", "retry_max_total", "politeness_delay"):
                 if new_config[key] < 0:
                     raise ValueError(f"{key} 不能為負數")
+            if new_config["batch_concurrency"] < 1:
+                raise ValueError("batch_concurrency 至少為 1")
+            if new_config["politeness_burst"] < 1:
+                raise ValueError("politeness_burst 至少為 1")
+            if new_config["ai_concurrency"] < 1:
+                raise ValueError("ai_concurrency 至少為 1")
+            if new_config["ai_group_size"] < 1:
+                raise ValueError("ai_group_size 至少為 1")
 
             # 寫入 config.json
             import paths
@@ -263,7 +290,11 @@ class SettingsTab:
             scraper.REQUEST_TIMEOUT = new_config["request_timeout"]
             scraper.MAX_RETRIES = new_config["max_retries"]
             scraper.RETRY_BASE_DELAY = new_config["retry_base_delay"]
+            scraper.RETRY_MAX_DELAY = new_config["retry_max_delay"]
+            scraper.RETRY_MAX_TOTAL = new_config["retry_max_total"]
             scraper.POLITENESS_DELAY = new_config["politeness_delay"]
+            scraper.POLITENESS_BURST = new_config["politeness_burst"]
+            scraper.BATCH_CONCURRENCY = new_config["batch_concurrency"]
             scraper.JINA_BASE_URL = new_config["jina_base_url"]
 
             # 更新 Jina API Key（如果有填）
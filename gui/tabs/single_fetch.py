@@ -5,20 +5,23 @@
 """
 
 import os
-import queue
+import subprocess
 import threading
 import time
+from collections import deque
 
 import customtkinter as ctk
 
 import scraper
 from gui.theme import (
+    IS_WINDOWS, IS_MAC,
     FONT_NORMAL, FONT_SMALL, FONT_HEADING,
     STATUS_ICONS, PLATFORM_COLORS,
     PAD_X, PAD_Y, PAD_SECTION, PAD_INNER,
 )
 from gui.widgets.url_input import URLInput
 from gui.widgets.progress_panel import ProgressPanel
+from gui.workers.task_runner import ProgressEmitter
 
 
 class SingleFetchTab:
@@ -32,9 +35,9 @@ class SingleFetchTab:
         self.task_id = self.TASK_ID
         self._platform = ""
 
-        # 自己的 queue
-        self._progress_queue: queue.Queue = queue.Queue()
-        self._result_queue: queue.Queue = queue.Queue()
+        # 自己的 queue（單一生產者/消費者，deque 的 append/popleft 即為執行緒安全）
+        self._progress_queue: deque = deque()
+        self._result_queue: deque = deque()
 
         self._build_ui()
 
@@ -120,22 +123,19 @@ class SingleFetchTab:
 
     def poll_queues(self):
         """輪詢自己的 queue（由主視窗呼叫）"""
-        # 進度
-        for _ in range(50):
-            try:
-                current, total, message = self._progress_queue.get_nowait()
-                self._progress.update_progress(current, total, message)
-            except queue.Empty:
-                break
-            except Exception:
-                break
+        # 進度（只套用最後一筆，中間狀態不會被看見）
+        latest = None
+        while self._progress_queue:
+            latest = self._progress_queue.popleft()
+        if latest is not None:
+            current, total, message = latest
+            self._progress.update_progress(current, total, message)
 
         # 結果
         for _ in range(50):
-            try:
-                url, status, data = self._result_queue.get_nowait()
-            except queue.Empty:
+            if not self._result_queue:
                 break
+            url, status, data = self._result_queue.popleft()
             try:
                 self._on_result(url, status, data)
             except Exception as e:
@@ -198,46 +198,46 @@ class SingleFetchTab:
         self._result_frame.pack_forget()
         self._fetch_btn.configure(state="disabled")
 
-        # 提交背景任務
+        # 提交背景任務（進度經 ProgressEmitter 過濾重複更新）
         self.app.task_runner.submit(
             self.TASK_ID,
             self._fetch_worker,
             url, output_dir,
-            progress_queue=self._progress_queue,
+            progress_queue=ProgressEmitter(self._progress_queue),
             result_queue=self._result_queue,
         )
 
     @staticmethod
     def _fetch_worker(url, output_dir, cancel_event, progress_queue, result_queue):
-        """背景執行緒中執行擷取"""
+        """背景執行緒中執行擷取（progress_queue 為 ProgressEmitter）"""
         try:
-            progress_queue.put((1, 3, f"正在擷取：{url}"))
+            progress_queue.put(1, 3, f"正在擷取：{url}")
 
             article = scraper.fetch_article(url)
 
             if cancel_event.is_set():
-                result_queue.put((url, "cancelled", {}))
+                result_queue.append((url, "cancelled", {}))
                 return
 
             if article:
-                progress_queue.put((2, 3, "正在儲存..."))
+                progress_queue.put(2, 3, "正在儲存...")
                 save_path = scraper.save_article(article, output_dir)
                 scraper.mark_as_fetched(url, output_dir)
-                progress_queue.put((3, 3, "完成"))
+                progress_queue.put(3, 3, "完成")
 
-                result_queue.put((url, "success", {
+                result_queue.append((url, "success", {
                     "title": article.get("title", ""),
                     "strategy": article.get("fetched_by", ""),
                     "images": len(article.get("images", [])),
                     "path": save_path or "",
                 }))
             else:
-                progress_queue.put((3, 3, "擷取失敗"))
-                result_queue.put((url, "failed", {}))
+                progress_queue.put(3, 3, "擷取失敗")
+                result_queue.append((url, "failed", {}))
 
         except Exception as e:
             scraper.logger.error(f"擷取失敗：{e}")
-            result_queue.put((url, "failed", {"error": str(e)}))
+            result_queue.append((url, "failed", {"error": str(e)}))
 
     def _on_result(self, url, status, data):
         """處理結果"""
@@ -277,13 +277,11 @@ class SingleFetchTab:
     def _open_result_folder(self):
         """開啟結果資料夾"""
         if self._result_path:
-            import platform as plat
-            import subprocess
             path = os.path.expanduser(self._result_path)
             if os.path.exists(path):
-                if plat.system() == "Windows":
+                if IS_WINDOWS:
                     os.startfile(path)
-                elif plat.system() == "Darwin":
+                elif IS_MAC:
                     subprocess.run(["open", path])
                 else:
                     subprocess.run(["xdg-open", path])
@@ -7,28 +7,52 @@ CLIMB GUI 主題設定
 import platform
 
 # ============================================================
-# 字型
+# 作業系統（程序內只查詢一次）
 # ============================================================
 
-_IS_WINDOWS = platform.system() == "Windows"
+SYSTEM = platform.system()
+IS_WINDOWS = SYSTEM == "Windows"
+IS_MAC = SYSTEM == "Darwin"
+
+# ============================================================
+# 字型
+# ============================================================
 
 # Windows 優先使用微軟正黑體，macOS 用蘋方，Linux 用 Noto
-if _IS_WINDOWS:
+if IS_WINDOWS:
     FONT_FAMILY = "Microsoft JhengHei UI"
     FONT_MONO = "Consolas"
-elif platform.system() == "Darwin":
+elif IS_MAC:
     FONT_FAMILY = "PingFang TC"
     FONT_MONO = "Menlo"
 else:
     FONT_FAMILY = "Noto Sans CJK TC"
     FONT_MONO = "Monospace"
 
+# 建立 Tk root 前先以 tuple 表示；init_fonts() 後換成共用的 CTkFont
 FONT_NORMAL = (FONT_FAMILY, 13)
 FONT_SMALL = (FONT_FAMILY, 11)
 FONT_HEADING = (FONT_FAMILY, 15, "bold")
 FONT_MONO_NORMAL = (FONT_MONO, 12)
 FONT_MONO_SMALL = (FONT_MONO, 11)
 
+
+def init_fonts():
+    """建立共用的 CTkFont 物件，取代 tuple 字型。
+
+    必須在 ctk.CTk() 建立之後、匯入頁籤模組之前呼叫 —
+    頁籤以 ``from gui.theme import FONT_*`` 取得字型，
+    之後所有元件共用同一個字型物件，不必各自查詢字型度量。
+    """
+    global FONT_NORMAL, FONT_SMALL, FONT_HEADING, FONT_MONO_NORMAL, FONT_MONO_SMALL
+    import customtkinter as ctk
+
+    FONT_NORMAL = ctk.CTkFont(family=FONT_FAMILY, size=13)
+    FONT_SMALL = ctk.CTkFont(family=FONT_FAMILY, size=11)
+    FONT_HEADING = ctk.CTkFont(family=FONT_FAMILY, size=15, weight="bold")
+    FONT_MONO_NORMAL = ctk.CTkFont(family=FONT_MONO, size=12)
+    FONT_MONO_SMALL = ctk.CTkFont(family=FONT_MONO, size=11)
+
 # ============================================================
 # 間距
 # ============================================================
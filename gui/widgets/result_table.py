@@ -6,11 +6,11 @@
 
 import os
 import subprocess
-import platform
 
 import customtkinter as ctk
 
 from gui.theme import (
+    IS_WINDOWS, IS_MAC,
     FONT_NORMAL, FONT_SMALL, FONT_MONO_SMALL,
     STATUS_ICONS, PAD_INNER, PAD_X, PAD_Y,
 )
@@ -112,9 +112,9 @@ class ResultTable(ctk.CTkScrollableFrame):
             # 嘗試開啟父目錄
             path = os.path.dirname(path)
         if os.path.exists(path):
-            if platform.system() == "Windows":
+            if IS_WINDOWS:
                 os.startfile(path)
-            elif platform.system() == "Darwin":
+            elif IS_MAC:
                 subprocess.run(["open", path])
             else:
                 subprocess.run(["xdg-open", path])
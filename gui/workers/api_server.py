@@ -24,6 +24,9 @@ from typing import Optional
 
 import scraper
 
+# POST /save 請求本文上限（含 base64 圖片也綽綽有餘）
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
 
 class _DualStackHTTPServer(HTTPServer):
     """支援 IPv4 + IPv6 dual-stack 的 HTTPServer。
@@ -50,6 +53,14 @@ class _CORSRequestHandler(BaseHTTPRequestHandler):
     _log_queue: Optional[queue.Queue] = None
     _port: int = 3456
 
+    def setup(self):
+        """關閉 Nagle 演算法 — 本機小封包不必等 delayed-ACK"""
+        super().setup()
+        try:
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+
     def _set_cors_headers(self):
         """設定 CORS headers（Chrome Extension 跨域存取必需）"""
         self.send_header("Access-Control-Allow-Origin", "*")
@@ -64,6 +75,9 @@ class _CORSRequestHandler(BaseHTTPRequestHandler):
         self.send_response(status_code)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
+        # Extension 的請求都是短連線，回應後直接關閉，省去 keep-alive 等待
+        self.send_header("Connection", "close")
+        self.close_connection = True
         self._set_cors_headers()
         self.end_headers()
         self.wfile.write(body)
@@ -111,14 +125,30 @@ class _CORSRequestHandler(BaseHTTPRequestHandler):
     def _handle_save(self):
         """POST /save — 接收並儲存文章"""
         try:
-            content_length = int(self.headers.get("Content-Length", 0))
-            if content_length == 0:
-                self._send_json(400, {
-                    "status": "error",
-                    "message": "Empty request body",
-                })
-                return
+            content_length = int(self.headers.get("Content-Length") or 0)
+            if content_length < 0:
+                raise ValueError(content_length)
+        except ValueError:
+            self._send_json(400, {
+                "status": "error",
+                "message": "Invalid Content-Length",
+            })
+            return
 
+        if content_length <= 0:
+            self._send_json(400, {
+                "status": "error",
+                "message": "Empty request body",
+            })
+            return
+        if content_length > MAX_BODY_BYTES:
+            self._send_json(413, {
+                "status": "error",
+                "message": "Payload too large",
+            })
+            return
+
+        try:
             raw = self.rfile.read(content_length)
             data = json.loads(raw.decode("utf-8"))
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
@@ -1,19 +1,61 @@
 """
 GUI 日誌處理器
 ===============
-將 logging 日誌導向 queue.Queue，供 GUI 主執行緒消費顯示。
+將 logging 日誌放入有上限的 LogBuffer，供 GUI 主執行緒消費顯示。
+緩衝區滿時優先丟棄低等級（DEBUG/INFO）訊息，WARNING 以上盡量保留。
 """
 
 import logging
-import queue
+import threading
+from collections import deque
+
+
+class LogBuffer:
+    """有上限的日誌環形緩衝區（多執行緒寫入、GUI 執行緒讀取）"""
+
+    def __init__(self, maxlen: int = 1000):
+        self.maxlen = maxlen
+        self._records: deque[logging.LogRecord] = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, record: logging.LogRecord) -> bool:
+        """加入一筆紀錄，回傳是否保留（緩衝區滿且等級低時丟棄）"""
+        with self._lock:
+            if len(self._records) >= self.maxlen:
+                if record.levelno < logging.WARNING:
+                    return False
+                self._evict_one()
+            self._records.append(record)
+            return True
+
+    def _evict_one(self):
+        """移除最舊的低等級紀錄；全是 WARNING 以上時移除最舊的一筆"""
+        for i, old in enumerate(self._records):
+            if old.levelno < logging.WARNING:
+                del self._records[i]
+                return
+        self._records.popleft()
+
+    def drain(self, limit: int = 50) -> list[logging.LogRecord]:
+        """取出最多 limit 筆紀錄（由舊到新）"""
+        with self._lock:
+            n = min(limit, len(self._records))
+            return [self._records.popleft() for _ in range(n)]
 
 
 class GUILogHandler(logging.Handler):
-    """自訂 logging.Handler，將格式化日誌訊息放入 Queue"""
+    """自訂 logging.Handler，將日誌紀錄放入 LogBuffer。
 
-    def __init__(self, log_queue: queue.Queue):
+    emit 時只存 LogRecord，格式化延後到 GUI 實際取出顯示時才做，
+    被丟棄的訊息不必付出 Formatter.format 的成本。
+    """
+
+    def __init__(self, log_buffer: LogBuffer):
         super().__init__()
-        self.log_queue = log_queue
+        self.log_buffer = log_buffer
         self.setFormatter(logging.Formatter(
             "%(asctime)s [%(levelname)s] %(message)s",
             datefmt="%H:%M:%S"
@@ -21,7 +63,11 @@ class GUILogHandler(logging.Handler):
 
     def emit(self, record: logging.LogRecord):
         try:
-            msg = self.format(record)
-            self.log_queue.put_nowait((record.levelname, msg))
+            self.log_buffer.append(record)
         except Exception:
             self.handleError(record)
+
+    def drain(self, limit: int = 50) -> list[tuple[str, str]]:
+        """取出並格式化最多 limit 筆日誌，回傳 [(levelname, message), ...]"""
+        return [(record.levelname, self.format(record))
+                for record in self.log_buffer.drain(limit)]
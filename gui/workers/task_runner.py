@@ -13,6 +13,8 @@
 import logging
 import queue
 import threading
+import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Callable, Any, Optional
 
@@ -21,15 +23,148 @@ logger = logging.getLogger("climb.task_runner")
 # 錯誤 sentinel — 頁籤的 poll_queues 可檢查此值
 TASK_ERROR_SENTINEL = "__TASK_ERROR__"
 
+# 批次進度的標記 — ProgressBatcher 送出 (PROGRESS_BATCH_KEY, [更新, ...])
+PROGRESS_BATCH_KEY = "batch"
+
+
+def _queue_put_fn(q) -> Optional[Callable]:
+    """取得 queue 的寫入方法：queue.Queue 用 put，collections.deque 用 append"""
+    if q is None:
+        return None
+    return getattr(q, "put", None) or q.append
+
+
+class FastQueue:
+    """輕量的單一生產者/單一消費者 queue，介面與 queue.Queue 的 put / get_nowait 相同。
+
+    deque 的 append / popleft 本身就是原子操作，不需要 queue.Queue
+    每次 put/get 都要取得的 Lock + Condition；Event 只在需要等待時使用。
+    """
+
+    __slots__ = ("_d", "_ev")
+
+    def __init__(self):
+        self._d: deque = deque()
+        self._ev = threading.Event()
+
+    def put(self, item):
+        self._d.append(item)
+        if not self._ev.is_set():
+            self._ev.set()
+
+    def get_nowait(self):
+        """取出最舊的一筆；沒有資料時拋出 queue.Empty"""
+        try:
+            item = self._d.popleft()
+        except IndexError:
+            raise queue.Empty from None
+        if not self._d:
+            self._ev.clear()
+        return item
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等到有資料或逾時，回傳是否有資料"""
+        return bool(self._d) or self._ev.wait(timeout)
+
+    def qsize(self) -> int:
+        return len(self._d)
+
+    def empty(self) -> bool:
+        return not self._d
+
+
+class ProgressEmitter:
+    """包裝 progress_queue，過濾不會改變畫面的進度更新。
+
+    只有百分比（取整數）變化或訊息文字改變時才真正 put，
+    減少跨執行緒 queue 流量與 GUI 重繪。
+    """
+
+    def __init__(self, progress_queue):
+        self._put = _queue_put_fn(progress_queue)
+        self.last_pct: Optional[int] = None
+        self.last_msg: Optional[str] = None
+
+    def put(self, current: int, total: int, message: str = ""):
+        """送出進度 (current, total, message)，無可見變化時略過"""
+        if self._put is None:
+            return
+        pct = int(current / total * 100) if total > 0 else 0
+        if pct == self.last_pct and message == self.last_msg:
+            return
+        self.last_pct = pct
+        self.last_msg = message
+        self._put((current, total, message))
+
+
+class ProgressBatcher:
+    """累積進度更新，每 max_items 筆或每 max_delay 秒才送出一次。
+
+    送出格式為 (PROGRESS_BATCH_KEY, [(current, total, message), ...])，
+    大批次時可大幅減少跨執行緒 queue 的 put/get 次數。
+    結束前須呼叫 flush() 送出剩餘的更新。
+    """
+
+    def __init__(self, progress_queue, max_items: int = 5, max_delay: float = 0.2):
+        self._put = _queue_put_fn(progress_queue)
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self._pending: list[tuple[int, int, str]] = []
+        self._last_flush = time.monotonic()
+
+    def put(self, current: int, total: int, message: str = ""):
+        """加入一筆進度，累積量或間隔達門檻時送出"""
+        if self._put is None:
+            return
+        self._pending.append((current, total, message))
+        if (len(self._pending) >= self.max_items
+                or time.monotonic() - self._last_flush > self.max_delay):
+            self.flush()
+
+    def flush(self):
+        """送出所有尚未送出的進度"""
+        if self._put is None or not self._pending:
+            return
+        self._put((PROGRESS_BATCH_KEY, self._pending))
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+
+def iter_progress(item) -> list:
+    """將 progress queue 取出的項目展開為 [(current, total, message), ...]"""
+    if item[0] == PROGRESS_BATCH_KEY:
+        return item[1]
+    return [item]
+
+
+_SHARD_COUNT = 8  # 任務狀態分片數（依 task_id 雜湊分配）
+
+
+class _Shard:
+    """一組任務狀態與保護它的鎖（done 在任務清理後通知等待者）"""
+
+    __slots__ = ("futures", "events", "lock", "done")
+
+    def __init__(self):
+        self.futures: dict[str, Future] = {}
+        self.events: dict[str, threading.Event] = {}
+        self.lock = threading.Lock()
+        self.done = threading.Condition(self.lock)
+
 
 class TaskRunner:
-    """執行緒池管理器 — 管理背景任務的生命週期"""
+    """執行緒池管理器 — 管理背景任務的生命週期
+
+    任務狀態依 task_id 分散到多個 _Shard，各自加鎖，
+    不同任務的 submit / cancel / 清理不會互相等待。
+    """
 
     def __init__(self, max_workers: int = 2):
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
-        self._active_futures: dict[str, Future] = {}
-        self._cancel_events: dict[str, threading.Event] = {}
-        self._lock = threading.Lock()
+        self._shards = [_Shard() for _ in range(_SHARD_COUNT)]
+
+    def _shard(self, task_id: str) -> _Shard:
+        return self._shards[hash(task_id) % _SHARD_COUNT]
 
     @staticmethod
     def _make_safe_worker(
@@ -55,9 +190,9 @@ class TaskRunner:
                     f"任務 {task_id} 發生未捕獲的異常：{e}",
                     exc_info=True,
                 )
-                if result_queue:
+                if result_queue is not None:
                     try:
-                        result_queue.put((TASK_ERROR_SENTINEL, str(e)))
+                        _queue_put_fn(result_queue)((TASK_ERROR_SENTINEL, str(e)))
                     except Exception:
                         pass  # queue 本身出問題也不能讓 wrapper 崩潰
                 raise  # 重新拋出，讓 Future 記錄異常
@@ -86,12 +221,13 @@ class TaskRunner:
             Future 物件
         """
         cancel_event = threading.Event()
+        shard = self._shard(task_id)
 
-        with self._lock:
+        with shard.lock:
             # 如果同 task_id 還在執行，先取消
-            if task_id in self._cancel_events:
-                self._cancel_events[task_id].set()
-            self._cancel_events[task_id] = cancel_event
+            if task_id in shard.events:
+                shard.events[task_id].set()
+            shard.events[task_id] = cancel_event
 
         # 用安全包裝器包住 worker，確保異常被記錄
         safe_fn = self._make_safe_worker(fn, task_id, result_queue)
@@ -104,26 +240,30 @@ class TaskRunner:
             **kwargs
         )
 
-        with self._lock:
-            self._active_futures[task_id] = future
+        with shard.lock:
+            shard.futures[task_id] = future
 
-        # 任務結束時清理 + 記錄異常
+        # 任務結束時記錄異常 + 清理（同 task_id 已被新任務取代時不動它的狀態）
         def _cleanup(f):
-            with self._lock:
-                self._active_futures.pop(task_id, None)
-                self._cancel_events.pop(task_id, None)
-            # 記錄 Future 層級的異常（補充保險）
+            # 記錄 Future 層級的異常（補充保險）；在清理前記錄，wait() 返回時 log 已寫入
             exc = f.exception()
             if exc:
                 logger.error(f"任務 {task_id} 異常結束：{exc}")
+            with shard.lock:
+                if shard.futures.get(task_id) is f:
+                    del shard.futures[task_id]
+                if shard.events.get(task_id) is cancel_event:
+                    del shard.events[task_id]
+                shard.done.notify_all()
 
         future.add_done_callback(_cleanup)
         return future
 
     def cancel(self, task_id: str) -> bool:
         """取消指定任務（設定 cancel_event，等待任務自行停止）"""
-        with self._lock:
-            event = self._cancel_events.get(task_id)
+        shard = self._shard(task_id)
+        with shard.lock:
+            event = shard.events.get(task_id)
             if event:
                 event.set()
                 return True
@@ -131,13 +271,21 @@ class TaskRunner:
 
     def is_running(self, task_id: str) -> bool:
         """查詢指定任務是否正在執行"""
-        with self._lock:
-            future = self._active_futures.get(task_id)
+        shard = self._shard(task_id)
+        with shard.lock:
+            future = shard.futures.get(task_id)
             return future is not None and not future.done()
 
+    def wait(self, task_id: str, timeout: Optional[float] = None) -> bool:
+        """等待指定任務結束並完成清理，回傳是否在 timeout 內結束"""
+        shard = self._shard(task_id)
+        with shard.done:
+            return shard.done.wait_for(lambda: task_id not in shard.futures, timeout)
+
     def shutdown(self):
         """關閉執行緒池（取消所有任務）"""
-        with self._lock:
-            for event in self._cancel_events.values():
-                event.set()
+        for shard in self._shards:
+            with shard.lock:
+                for event in shard.events.values():
+                    event.set()
         self._executor.shutdown(wait=False)
@@ -41,17 +41,26 @@ def get_app_dir() -> Path:
     return Path(__file__).parent
 
 
+_CONFIG_PATH: Path | None = None  # get_config_path 首次解析後快取
+
+
 def get_config_path() -> Path:
     """取得 config.json 路徑（可寫）。
 
     首次啟動打包版時，從 bundle 複製預設 config.json 到 exe 旁。
+    路徑解析後即快取，之後呼叫不再檢查檔案是否存在。
     """
+    global _CONFIG_PATH
+    if _CONFIG_PATH is not None:
+        return _CONFIG_PATH
+
     user_config = get_app_dir() / "config.json"
     if not user_config.exists():
         default_config = get_bundle_dir() / "config.json"
         if default_config.exists():
             import shutil
             shutil.copy2(default_config, user_config)
+    _CONFIG_PATH = user_config
     return user_config
 
 
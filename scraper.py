@@ -21,23 +21,57 @@ import re
 import sys
 import json
 import time
+import random
+import socket
 import hashlib
+import queue
+import threading
+import atexit
 import argparse
 import logging
+import logging.handlers
+import multiprocessing
 import subprocess
 import importlib.util
 import urllib.robotparser
-import urllib.request
-import urllib.error
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlsplit, urlunsplit, urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 from markdownify import markdownify as md
 
+try:
+    import orjson  # 選用：C 實作的 JSON，去重記錄大時讀寫快很多
+except ImportError:
+    orjson = None
+
+try:
+    import lxml.html as lxml_html  # 選用：PTT 看板列表頁直接用 XPath 取連結
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_html = lxml_etree = None
+
+
+def _dumps_json(obj) -> bytes:
+    """序列化為縮排 2 格的 UTF-8 JSON（有 orjson 時使用，輸出格式與 json.dumps 相同）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _loads_json(data: bytes):
+    """解析 UTF-8 JSON bytes（有 orjson 時使用）；格式錯誤時拋出 ValueError"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
 # ============================================================
 # 設定
 # ============================================================
@@ -48,14 +82,22 @@ _DEFAULTS = {
     "request_timeout": 30,
     "max_retries": 3,
     "retry_base_delay": 2,
+    "retry_max_delay": 60,
+    "retry_max_total": 120,
     "politeness_delay": 2,
+    "politeness_burst": 1,
+    "batch_concurrency": 4,
     "jina_base_url": "https://r.jina.ai/",
     "log_level": "INFO",
 }
 
 
+# 設定檔解析結果快取：路徑 → ((st_mtime_ns, st_size), 使用者設定)；檔案沒變就不重新解析
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
 def load_config(config_path: str = None) -> dict:
-    """載入設定檔，未找到則用預設值"""
+    """載入設定檔，未找到則用預設值（每次回傳新的 dict，可自由修改）"""
     config = dict(_DEFAULTS)
     if config_path is None:
         import paths
@@ -63,17 +105,28 @@ def load_config(config_path: str = None) -> dict:
     else:
         config_path = Path(config_path)
 
-    if config_path.exists():
+    try:
+        st = config_path.stat()
+    except OSError:
+        return config
+    key = str(config_path)
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(key)
+    if cached and cached[0] == sig:
+        user_config = cached[1]
+    else:
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                user_config = json.load(f)
-            config.update(user_config)
-            # 展開 ~ 路徑
-            if "output_dir" in user_config:
-                config["output_dir"] = os.path.expanduser(config["output_dir"])
-        except (json.JSONDecodeError, TypeError):
-            pass  # 設定檔損壞時使用預設值
-
+            user_config = _loads_json(config_path.read_bytes())
+        except ValueError:  # 含 json / orjson 的解碼錯誤
+            return config  # 設定檔損壞時使用預設值（不快取）
+        if not isinstance(user_config, dict):
+            return config
+        _CONFIG_CACHE[key] = (sig, user_config)
+
+    config.update(user_config)
+    # 展開 ~ 路徑
+    if "output_dir" in user_config:
+        config["output_dir"] = os.path.expanduser(config["output_dir"])
     return config
 
 
@@ -84,11 +137,25 @@ DEFAULT_OUTPUT_DIR = _CONFIG["output_dir"]
 REQUEST_TIMEOUT = _CONFIG["request_timeout"]
 JINA_BASE_URL = _CONFIG["jina_base_url"]
 JINA_API_KEY = os.environ.get("JINA_API_KEY", "")  # 設定後可提升至 200 次/分鐘
+JINA_RATE_PER_MIN = 20  # 未設定 JINA_API_KEY 時，所有網站共用的 Jina 請求上限（次/分鐘）
+JINA_RATE_PER_MIN_WITH_KEY = 200
+JINA_BURST = 3  # Jina 可連續送出的請求數（權杖桶容量）
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp'}
 MAX_RETRIES = _CONFIG["max_retries"]
 RETRY_BASE_DELAY = _CONFIG["retry_base_delay"]
+RETRY_MAX_DELAY = _CONFIG["retry_max_delay"]  # 單次重試等待的上限（秒）
+RETRY_MAX_TOTAL = _CONFIG["retry_max_total"]  # 每個策略重試的總時間預算（秒，0 表示不限）
 POLITENESS_DELAY = _CONFIG["politeness_delay"]
+POLITENESS_BURST = _CONFIG["politeness_burst"]  # 同一網站可連續擷取的次數（權杖桶容量）
+BATCH_CONCURRENCY = _CONFIG["batch_concurrency"]  # 批次同時處理的網站數
 DEDUP_FILE = ".fetched_urls.json"  # 已下載 URL 記錄檔
+DEDUP_JOURNAL = ".fetched_urls.log"  # mark_as_fetched 的追加記錄（每行一個 URL）
+DEDUP_JOURNAL_MAX_BYTES = 256 * 1024  # journal 超過此大小就併回 JSON 快照
+DEDUP_CHECKPOINT_EVERY = 20  # DedupStore 每新增幾筆寫回一次
+IMAGE_DOWNLOAD_WORKERS = 8  # 單篇文章同時下載的圖片數
+IMAGE_HOST_CONCURRENCY = 4  # 同一圖床同時下載數上限
+MAX_IMAGE_BYTES = 20 * 1024 * 1024  # 超過此大小的圖片不下載（先看 Content-Length，下載中也會檢查）
+IMAGE_CHUNK_SIZE = 64 * 1024  # 圖片串流寫檔的每次讀取量
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
@@ -97,16 +164,56 @@ HEADERS = {
     'Accept-Language': 'zh-TW,zh;q=0.9,en-US;q=0.8,en;q=0.7',
 }
 
+# 共用 HTTP Session：重用 TCP/TLS 連線（keep-alive），批次時省去重複握手
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+atexit.register(_SESSION.close)
+
+# HTML 解析器：有安裝 lxml（C 實作）就用，否則退回純 Python 的 html.parser
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# 每篇文章都會用到的正規表示式，模組載入時編譯一次
+_RE_IMG_INLINE = re.compile(r'https?://\S+\.(jpg|jpeg|png|gif|webp)', re.I)
+# Markdown 圖片語法與純圖片 URL 合併成一個 pattern，內容只需掃描一次
+_RE_ALL_IMGS = re.compile(
+    r'!\[[^\]]*\]\((?P<md>[^)]+)\)'
+    r'|(?P<url>https?://[^\s<>"\']+\.(?:jpg|jpeg|png|gif|webp)(?:\?[^\s<>"\']*)?)'
+)
+# 檔名不允許的字元一律換成底線（translate 表，一次走訪完成）
+_TITLE_UNSAFE = str.maketrans(dict.fromkeys('\\/:*?"<>|', '_'))
+_RE_META_CHARSET = re.compile(rb'charset=["\']?([\w-]+)', re.I)
+
 logger = logging.getLogger(__name__)
+_log_listener: logging.handlers.QueueListener | None = None  # 背景寫入日誌檔的執行緒
+
+
+def _stop_log_listener():
+    """停止背景日誌執行緒（會先寫完 queue 中剩餘的紀錄）並關閉日誌檔"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        atexit.unregister(_stop_log_listener)
+        _log_listener = None
 
 
 def _setup_logging(log_dir: str = None, level: str = "INFO"):
-    """設定 console + file 雙輸出日誌"""
+    """設定 console + file 雙輸出日誌
+
+    檔案 handler 由背景 QueueListener 負責，logger 上只掛 QueueHandler，
+    記錄日誌時只需放入 queue，不會在擷取流程中等待磁碟寫入。
+    """
+    global _log_listener
     logger.setLevel(logging.DEBUG)
 
     # 避免重複添加 handler
     if logger.handlers:
         return logger
+    _stop_log_listener()  # handler 被清掉後重新設定時，先收掉舊的背景執行緒
 
     # Console handler（保持原有行為）
     console = logging.StreamHandler()
@@ -125,7 +232,12 @@ def _setup_logging(log_dir: str = None, level: str = "INFO"):
         file_handler.setFormatter(logging.Formatter(
             '%(asctime)s [%(levelname)s] %(name)s - %(message)s'
         ))
-        logger.addHandler(file_handler)
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, respect_handler_level=True)
+        _log_listener.start()
+        atexit.register(_stop_log_listener)  # 結束前寫完剩餘的日誌
 
     return logger
 
@@ -134,26 +246,104 @@ def _setup_logging(log_dir: str = None, level: str = "INFO"):
 # robots.txt 檢查
 # ============================================================
 
-@lru_cache(maxsize=128)
+ROBOTS_CACHE_DIR = ".robots_cache"  # 位於應用程式目錄下（與 config.json 同處）
+ROBOTS_CACHE_TTL = 24 * 3600  # robots.txt 磁碟快取有效期（秒）
+
+
+def _robots_cache_path(domain: str) -> Path:
+    """robots.txt 磁碟快取檔路徑（以 domain 雜湊命名）
+
+    快取與輸出目錄無關：CLI --output、GUI 自訂輸出目錄都共用同一份，
+    也不會在使用者的文章目錄裡留下隱藏資料夾。
+    """
+    import paths
+    name = hashlib.sha1(domain.encode()).hexdigest()[:16]
+    return paths.get_app_dir() / ROBOTS_CACHE_DIR / f"{name}.txt"
+
+
+def _read_robots_cache(domain: str) -> str | None:
+    """讀取未過期的磁碟快取，沒有或過期時回傳 None"""
+    path = _robots_cache_path(domain)
+    try:
+        if time.time() - path.stat().st_mtime < ROBOTS_CACHE_TTL:
+            return path.read_text(encoding="utf-8", errors="surrogateescape")
+    except OSError:
+        pass
+    return None
+
+
+def _write_robots_cache(domain: str, content: str):
+    """寫入磁碟快取（先寫暫存檔再 os.replace，其他執行緒不會讀到半個檔；失敗不影響擷取）"""
+    path = _robots_cache_path(domain)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(content, encoding="utf-8", errors="surrogateescape")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        logger.debug(f"robots.txt 快取寫入失敗：{e}")
+
+
+ROBOTS_RETRY_AFTER = 300  # robots.txt 取得失敗後，多久內不再重試（秒）
+ROBOTS_MEMO_MAX = 256  # 行程內最多記住幾個 domain 的解析器
+# 行程內快取：domain → (到期時間 monotonic, 解析器或 None)
+_ROBOTS_MEMO: OrderedDict[str, tuple[float, urllib.robotparser.RobotFileParser | None]] = OrderedDict()
+_ROBOTS_MEMO_LOCK = threading.Lock()
+
+
 def _get_robots_parser(domain: str):
-    """取得並快取指定 domain 的 robots.txt 解析器"""
+    """取得並快取指定 domain 的 robots.txt 解析器
+
+    兩層快取：行程內快取，加上應用程式目錄下 24 小時有效的磁碟快取，
+    重複執行批次時不必每次重新下載。行程內快取同樣 ROBOTS_CACHE_TTL 後到期，
+    長時間執行的排程模式也會定期更新；取得失敗只記住 ROBOTS_RETRY_AFTER 秒。
+    """
+    now = time.monotonic()
+    with _ROBOTS_MEMO_LOCK:
+        cached = _ROBOTS_MEMO.get(domain)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    parser = _load_robots_parser(domain)
+    ttl = ROBOTS_CACHE_TTL if parser is not None else ROBOTS_RETRY_AFTER
+    with _ROBOTS_MEMO_LOCK:
+        _ROBOTS_MEMO[domain] = (now + ttl, parser)
+        _ROBOTS_MEMO.move_to_end(domain)
+        while len(_ROBOTS_MEMO) > ROBOTS_MEMO_MAX:
+            _ROBOTS_MEMO.popitem(last=False)
+    return parser
+
+
+def _load_robots_parser(domain: str):
+    """從磁碟快取或網路取得 robots.txt 並解析，無法取得時回傳 None"""
     robots_url = f"{domain}/robots.txt"
     parser = urllib.robotparser.RobotFileParser()
     parser.set_url(robots_url)
-    try:
-        resp = urllib.request.urlopen(robots_url, timeout=5)
-        content = resp.read().decode("utf-8", errors="surrogateescape")
-        parser.parse(content.splitlines())
-        return parser
-    except Exception:
-        return None
+
+    content = _read_robots_cache(domain)
+    if content is None:
+        try:
+            resp = _SESSION.get(robots_url, timeout=5)
+            if resp.status_code in (404, 410):
+                content = ""  # 沒有 robots.txt：全部允許
+            else:
+                resp.raise_for_status()
+                content = resp.content.decode("utf-8", errors="surrogateescape")
+        except Exception:
+            return None
+        _write_robots_cache(domain, content)
+
+    parser.parse(content.splitlines())
+    return parser
 
 
 def is_allowed_by_robots(url: str, user_agent: str = "*") -> bool:
     """檢查 robots.txt 是否允許擷取此 URL（fail-open：無法取得時允許）"""
     try:
-        parsed = urlparse(url)
-        domain = f"{parsed.scheme}://{parsed.netloc}"
+        parsed = urlsplit(url)
+        # 主機名稱不分大小寫，統一轉小寫，同一網站只佔一個快取項目
+        domain = f"{parsed.scheme}://{parsed.netloc.lower()}"
         parser = _get_robots_parser(domain)
         if parser is None:
             return True
@@ -166,15 +356,28 @@ def is_allowed_by_robots(url: str, user_agent: str = "*") -> bool:
 # 重試機制（指數退避）
 # ============================================================
 
-def retry_fetch(func, url: str, max_retries: int = MAX_RETRIES) -> dict | None:
-    """帶指數退避的重試包裝器"""
+def retry_fetch(func, url: str, max_retries: int = MAX_RETRIES,
+                jitter: bool = True, max_total: float | None = None) -> dict | None:
+    """帶指數退避的重試包裝器。
+
+    等待時間為 min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2^attempt)；
+    jitter=True 時改為 0 到該值之間的隨機值（full jitter），
+    避免同時失敗的多個請求在同一時刻一起重試。
+    max_total 為整體時間預算（秒，以 monotonic 計時），下一次等待會超過預算時直接放棄。
+    """
+    deadline = time.monotonic() + max_total if max_total is not None else None
     for attempt in range(max_retries):
         result = func(url)
         if result is not None:
             return result
         if attempt < max_retries - 1:
-            delay = RETRY_BASE_DELAY * (2 ** attempt)
-            logger.info(f"  第 {attempt + 1} 次失敗，{delay} 秒後重試...")
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt))
+            if jitter:
+                delay = random.uniform(0, delay)
+            if deadline is not None and time.monotonic() + delay > deadline:
+                logger.info(f"  第 {attempt + 1} 次失敗，超過 {max_total} 秒的重試預算，放棄")
+                break
+            logger.info(f"  第 {attempt + 1} 次失敗，{delay:.1f} 秒後重試...")
             time.sleep(delay)
     return None
 
@@ -183,49 +386,240 @@ def retry_fetch(func, url: str, max_retries: int = MAX_RETRIES) -> dict | None:
 # 去重機制
 # ============================================================
 
-def _load_dedup_record(output_dir: str) -> set:
-    """載入已下載的 URL 記錄"""
-    dedup_path = Path(output_dir) / DEDUP_FILE
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+@lru_cache(maxsize=8192)
+def _normalize_url(url: str) -> str:
+    """正規化 URL：scheme / 主機名稱轉小寫、移除預設埠號與 #fragment，空路徑補 /
+
+    query 保持原順序（部分網站依參數順序解讀）；無法解析的 URL 原樣回傳。
+    """
+    parts = urlsplit(url)
+    if not parts.hostname:
+        return url
+    try:
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    netloc = f"[{parts.hostname}]" if ':' in parts.hostname else parts.hostname
+    if port is not None and _DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{netloc}:{port}"
+    userinfo, at, _ = parts.netloc.rpartition('@')
+    if at:
+        netloc = f"{userinfo}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+@lru_cache(maxsize=32)
+def _dedup_path(output_dir: str) -> Path:
+    """去重記錄檔路徑（每個輸出目錄只組一次 Path）"""
+    return Path(output_dir) / DEDUP_FILE
+
+
+@lru_cache(maxsize=32)
+def _dedup_journal_path(output_dir: str) -> Path:
+    """去重追加記錄檔路徑"""
+    return Path(output_dir) / DEDUP_JOURNAL
+
+
+# 去重記錄的記憶體快取：output_dir → (檔案簽章, URL 集合)
+# 簽章為 JSON 與 journal 兩個檔案的 (st_mtime_ns, st_size)，都沒變就不必重新讀檔
+_DEDUP_CACHE: dict[str, tuple[tuple, set]] = {}
+_DEDUP_LOCK = threading.Lock()  # 保護去重檔案與快取的 read-modify-write（含就地修改快取中的 set）
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _dedup_signature(output_dir: str) -> tuple:
+    return (_file_signature(_dedup_path(output_dir)),
+            _file_signature(_dedup_journal_path(output_dir)))
+
+
+def _read_dedup_files(output_dir: str) -> set:
+    """讀取 JSON 快照與 journal（損壞的快照視為空）
+
+    記錄一律以 _normalize_url 後的形式比對，舊版存下的原始 URL 也在讀取時正規化。
+    """
+    fetched = set()
+    dedup_path = _dedup_path(output_dir)
     if dedup_path.exists():
         try:
-            data = json.loads(dedup_path.read_text(encoding='utf-8'))
-            return set(data)
-        except (json.JSONDecodeError, TypeError):
-            return set()
-    return set()
+            fetched.update(map(_normalize_url, _loads_json(dedup_path.read_bytes())))
+        except (ValueError, TypeError):  # 含 json / orjson 的解碼錯誤
+            pass
+    journal = _dedup_journal_path(output_dir)
+    if journal.exists():
+        fetched.update(_normalize_url(line) for line in
+                       journal.read_text(encoding='utf-8', errors='replace').splitlines()
+                       if line)
+    return fetched
+
+
+def _cached_dedup_set(output_dir: str) -> set:
+    """取得快取中的 URL 集合（檔案有變動才重新讀取）
+
+    回傳的是 _DEDUP_CACHE 內共用的 set 本身，不是副本：唯讀使用（如 is_already_fetched）
+    可不加鎖；只有 mark_as_fetched_bulk 會在持有 _DEDUP_LOCK 時就地追加並更新快取簽章。
+    其他呼叫端要修改請用 _load_dedup_record 取得副本。
+    """
+    sig = _dedup_signature(output_dir)
+    if sig == (None, None):
+        return set()
+    cached = _DEDUP_CACHE.get(output_dir)
+    if cached and cached[0] == sig:
+        return cached[1]
+    fetched = _read_dedup_files(output_dir)
+    _DEDUP_CACHE[output_dir] = (sig, fetched)
+    return fetched
+
+
+def _load_dedup_record(output_dir: str) -> set:
+    """載入已下載的 URL 記錄（回傳可自由修改的副本）"""
+    return set(_cached_dedup_set(output_dir))
 
 
 def _save_dedup_record(output_dir: str, fetched_urls: set):
-    """儲存已下載的 URL 記錄"""
-    dedup_path = Path(output_dir) / DEDUP_FILE
+    """將完整記錄寫成 JSON 快照（排序後）並清空 journal"""
+    dedup_path = _dedup_path(output_dir)
     dedup_path.parent.mkdir(parents=True, exist_ok=True)
-    dedup_path.write_text(
-        json.dumps(sorted(fetched_urls), ensure_ascii=False, indent=2),
-        encoding='utf-8'
-    )
+    data = _dumps_json(sorted(fetched_urls))
+    # 先寫暫存檔再 os.replace（同一檔案系統內為原子操作），中途當掉也不會留下半個檔案
+    tmp_path = dedup_path.with_name(f"{dedup_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, dedup_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    # 快照已包含 journal 的內容
+    _dedup_journal_path(output_dir).unlink(missing_ok=True)
+    _DEDUP_CACHE[output_dir] = (_dedup_signature(output_dir), set(fetched_urls))
 
 
 def is_already_fetched(url: str, output_dir: str) -> bool:
-    """檢查 URL 是否已經下載過"""
-    fetched = _load_dedup_record(output_dir)
-    return url in fetched
+    """檢查 URL 是否已經下載過（檔案未變動時只需 stat，不讀檔）"""
+    return _normalize_url(url) in _cached_dedup_set(output_dir)
+
+
+def mark_as_fetched_bulk(urls, output_dir: str) -> int:
+    """將多個 URL 一次追加到 journal（只開檔一次），回傳實際新增的筆數
+
+    journal 超過 DEDUP_JOURNAL_MAX_BYTES 時併回 JSON 快照。
+    """
+    with _DEDUP_LOCK:
+        fetched = _cached_dedup_set(output_dir)
+        new_urls = [u for u in dict.fromkeys(map(_normalize_url, urls)) if u not in fetched]
+        if not new_urls:
+            return 0
+        journal = _dedup_journal_path(output_dir)
+        journal.parent.mkdir(parents=True, exist_ok=True)
+        with open(journal, 'a', encoding='utf-8') as f:
+            f.write(''.join(u + '\n' for u in new_urls))
+
+        fetched.update(new_urls)
+        sig = _dedup_signature(output_dir)
+        if sig[1] is not None and sig[1][1] > DEDUP_JOURNAL_MAX_BYTES:
+            _save_dedup_record(output_dir, fetched)
+        else:
+            _DEDUP_CACHE[output_dir] = (sig, fetched)
+        return len(new_urls)
 
 
 def mark_as_fetched(url: str, output_dir: str):
-    """將 URL 標記為已下載"""
-    fetched = _load_dedup_record(output_dir)
-    fetched.add(url)
-    _save_dedup_record(output_dir, fetched)
+    """將 URL 標記為已下載
+
+    只在 journal 追加一行（O(1)），不重寫整個 JSON。
+    """
+    mark_as_fetched_bulk((url,), output_dir)
+
+
+class DedupStore:
+    """批次用的去重記錄：開始時載入一次，之後只改記憶體，定期與結束時寫回。
+
+    checkpoint 只把新增的 URL 追加到 journal，結束時（flush）才整併成一次 JSON 寫入，
+    N 個 URL 的批次只需 O(N / DEDUP_CHECKPOINT_EVERY) 次追加與 1 次完整寫入。
+    可當 context manager 使用，離開時自動 flush。
+    """
+
+    def __init__(self, output_dir: str, checkpoint_every: int = DEDUP_CHECKPOINT_EVERY):
+        self.output_dir = output_dir
+        self.path = _dedup_path(output_dir)
+        self.checkpoint_every = checkpoint_every
+        self.fetched: set[str] = set()
+        self.dirty = False
+        self._new: list[str] = []  # 上次寫回後新增、尚未追加到 journal 的 URL
+        self._lock = threading.Lock()
+        self.load()
+
+    def __contains__(self, url: str) -> bool:
+        return _normalize_url(url) in self.fetched
+
+    def __enter__(self):
+        atexit.register(self.flush)  # 程式中途結束也不遺失進度
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def load(self):
+        """從檔案載入記錄"""
+        with self._lock:
+            self.fetched = _load_dedup_record(self.output_dir)
+            self.dirty = False
+            self._new = []
+
+    def add(self, url: str):
+        """標記 URL 為已下載（每 checkpoint_every 筆追加到 journal 一次）"""
+        url = _normalize_url(url)
+        with self._lock:
+            if url in self.fetched:
+                return
+            self.fetched.add(url)
+            self.dirty = True
+            self._new.append(url)
+            if len(self._new) >= self.checkpoint_every:
+                self._checkpoint_locked()
+
+    def flush(self):
+        """寫回所有記錄，並將 journal 整併進 JSON 快照"""
+        with self._lock:
+            if not self.dirty:
+                return
+            # 與檔案現有內容合併，避免覆蓋其他地方（如 API server）同時寫入的記錄
+            with _DEDUP_LOCK:
+                merged = _load_dedup_record(self.output_dir) | self.fetched
+                _save_dedup_record(self.output_dir, merged)
+            self.fetched = merged
+            self.dirty = False
+            self._new = []
+
+    def _checkpoint_locked(self):
+        mark_as_fetched_bulk(self._new, self.output_dir)
+        self._new = []
 
 
 # ============================================================
 # YAML 安全轉義
 # ============================================================
 
+_YAML_ESCAPE = str.maketrans({'\\': '\\\\', '"': '\\"'})
+
+
 def _yaml_safe_title(title: str) -> str:
-    """確保標題可安全放入 YAML frontmatter"""
-    title = title.replace('\\', '\\\\').replace('"', '\\"')
-    return title
+    """確保標題可安全放入 YAML frontmatter（單次 translate 完成兩種跳脫）"""
+    # 多數標題沒有需要跳脫的字元：兩次 in 檢查遠比 translate 逐字查表快
+    if '"' not in title and '\\' not in title:
+        return title
+    return title.translate(_YAML_ESCAPE)
 
 
 # ============================================================
@@ -256,27 +650,59 @@ PLATFORM_RULES = [
 ]
 
 
-def identify_platform(url: str) -> dict:
-    """識別 URL 所屬平台，回傳平台資訊"""
-    parsed = urlparse(url)
-    domain = parsed.netloc.lower()
-
-    for name, keywords, needs_login, strategy in PLATFORM_RULES:
+# 由 PLATFORM_RULES 預先建立的查詢表（值為規則索引，多條規則符合時取排前面的）
+#   網域關鍵字（如 "ptt.cc"）：以主機名稱的各段後綴直接查 dict
+#   以 "." 結尾的關鍵字（如 "blog."）：比對主機名稱中的某一段開頭
+def _build_platform_index() -> tuple[dict[str, int], list[tuple[str, int]]]:
+    domain_keywords: dict[str, int] = {}
+    label_prefixes: list[tuple[str, int]] = []
+    for idx, (_, keywords, _, _) in enumerate(PLATFORM_RULES):
         for kw in keywords:
-            if kw in domain:
-                return {
-                    "name": name,
-                    "domain": domain,
-                    "needs_login": needs_login,
-                    "strategy": strategy,
-                }
-
+            if kw.endswith("."):
+                label_prefixes.append((kw, idx))
+            else:
+                domain_keywords.setdefault(kw, idx)
+    return domain_keywords, label_prefixes
+
+
+_DOMAIN_KEYWORDS, _LABEL_PREFIX_KEYWORDS = _build_platform_index()
+
+
+def _match_platform_rule(host: str) -> int | None:
+    """回傳符合的 PLATFORM_RULES 索引，沒有則 None"""
+    best = None
+    labels = host.split(".")
+    for i in range(len(labels) - 1):
+        idx = _DOMAIN_KEYWORDS.get(".".join(labels[i:]))
+        if idx is not None and (best is None or idx < best):
+            best = idx
+    for kw, idx in _LABEL_PREFIX_KEYWORDS:
+        if (best is None or idx < best) and (host.startswith(kw) or f".{kw}" in host):
+            best = idx
+    return best
+
+
+@lru_cache(maxsize=4096)
+def _identify_by_domain(host: str) -> tuple[str, bool, str]:
+    """依主機名稱識別平台，回傳 (name, needs_login, strategy)；同一網站只比對一次"""
+    idx = _match_platform_rule(host)
+    if idx is not None:
+        name, _, needs_login, strategy = PLATFORM_RULES[idx]
+        return name, needs_login, strategy
     # 未知平台，預設用 Jina
+    return "其他", False, "jina"
+
+
+def identify_platform(url: str) -> dict:
+    """識別 URL 所屬平台，回傳平台資訊（只需主機名稱，用 urlsplit 省去 params 解析）"""
+    parsed = urlsplit(url)
+    domain = parsed.netloc.lower()
+    name, needs_login, strategy = _identify_by_domain(parsed.hostname or domain)
     return {
-        "name": "其他",
+        "name": name,
         "domain": domain,
-        "needs_login": False,
-        "strategy": "jina",
+        "needs_login": needs_login,
+        "strategy": strategy,
     }
 
 
@@ -287,16 +713,15 @@ def identify_platform(url: str) -> dict:
 def fetch_with_jina(url: str) -> dict | None:
     """用 Jina Reader 擷取網頁，回傳 Markdown 內容"""
     jina_url = f"{JINA_BASE_URL}{url}"
-    headers = {
-        **HEADERS,
-        'Accept': 'text/markdown',
-    }
+    headers = {'Accept': 'text/markdown'}  # 其餘預設標頭由 _SESSION 帶入
     if JINA_API_KEY:
         headers['Authorization'] = f'Bearer {JINA_API_KEY}'
 
     try:
+        # 不同網站的請求都打到同一個 Jina 主機：另外依 Jina 的額度限速
+        _wait_for_jina()
         logger.info(f"[Jina] 正在擷取：{url}")
-        resp = requests.get(jina_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        resp = _SESSION.get(jina_url, headers=headers, timeout=REQUEST_TIMEOUT)
         resp.raise_for_status()
 
         content = resp.text.strip()
@@ -322,9 +747,15 @@ def fetch_with_jina(url: str) -> dict | None:
 
 
 def _extract_title_from_jina(content: str) -> str:
-    """從 Jina 回傳的內容提取標題"""
-    lines = content.split('\n')
-    for line in lines[:5]:
+    """從 Jina 回傳的內容提取標題（只看前 5 行）"""
+    # 先找到第 5 行的結尾再切開：split(maxsplit) 仍會把其餘整篇內容複製成最後一段
+    end = -1
+    for _ in range(5):
+        end = content.find('\n', end + 1)
+        if end < 0:
+            break
+    head = content if end < 0 else content[:end]
+    for line in head.split('\n'):
         line = line.strip()
         # Jina 格式：Title: xxxxx
         if line.startswith('Title:'):
@@ -339,8 +770,17 @@ def _extract_title_from_jina(content: str) -> str:
 # 第三步：HTML 解析（BS4 和 Playwright 共用）
 # ============================================================
 
-def _parse_ptt_article(soup, url: str, source: str = "bs4") -> dict | None:
-    """PTT 專用解析器 — 處理 #main-content 結構"""
+_PTT_MAIN_STRAINER = SoupStrainer('div', id='main-content')
+# 看板列表頁只需要文章列與翻頁按鈕（未安裝 lxml 時的 BS4 路徑使用）
+_PTT_BOARD_STRAINER = SoupStrainer('div', class_=['r-ent', 'btn-group-paging'])
+
+
+def _parse_ptt_article(html: str, url: str, source: str = "bs4") -> dict | None:
+    """PTT 專用解析器 — 處理 #main-content 結構
+
+    以 SoupStrainer 只建出 #main-content 子樹，略過頁面其餘部分。
+    """
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_PTT_MAIN_STRAINER)
     main = soup.find('div', id='main-content')
     if not main:
         return None
@@ -385,7 +825,7 @@ def _parse_ptt_article(soup, url: str, source: str = "bs4") -> dict | None:
     # 也從文字中找圖片連結（PTT 常用 imgur 等直連）
     for line in content.splitlines():
         line = line.strip()
-        if re.match(r'https?://\S+\.(jpg|jpeg|png|gif|webp)', line, re.I):
+        if _RE_IMG_INLINE.match(line):
             if line not in images:
                 images.append(line)
 
@@ -402,17 +842,61 @@ def _parse_ptt_article(soup, url: str, source: str = "bs4") -> dict | None:
     }
 
 
+# 主要內容區塊的 CSS 選擇器（class / id 含關鍵字，不分大小寫）
+_CONTENT_KEYWORDS = ("article", "content", "post", "entry")
+_CONTENT_CLASS_SELECTOR = ", ".join(f'div[class*="{k}" i]' for k in _CONTENT_KEYWORDS)
+_CONTENT_ID_SELECTOR = ", ".join(f'div[id*="{k}" i]' for k in _CONTENT_KEYWORDS)
+
+
+MARKDOWN_PROCESS_THRESHOLD = 200_000  # HTML 超過此長度（字元）才交給子行程轉 Markdown
+MARKDOWN_PROCESS_WORKERS = 4  # 行程池上限（大型頁面不多，每個子行程都要各自載入一份模組）
+_MARKDOWN_EXECUTOR: ProcessPoolExecutor | None = None
+_MARKDOWN_LOCK = threading.Lock()
+
+
+def _html_to_markdown(html: str) -> str:
+    """HTML 轉 Markdown（純 CPU，可在子行程執行）"""
+    return md(html, heading_style="ATX", strip=['img'])
+
+
+def _markdown_executor() -> ProcessPoolExecutor:
+    """取得（必要時建立）Markdown 轉換用的行程池"""
+    global _MARKDOWN_EXECUTOR
+    with _MARKDOWN_LOCK:
+        if _MARKDOWN_EXECUTOR is None:
+            _MARKDOWN_EXECUTOR = ProcessPoolExecutor(
+                max_workers=min(MARKDOWN_PROCESS_WORKERS, os.cpu_count() or 1))
+            atexit.register(_MARKDOWN_EXECUTOR.shutdown, wait=False, cancel_futures=True)
+        return _MARKDOWN_EXECUTOR
+
+
+def _convert_markdown(html: str) -> str:
+    """轉換 HTML 為 Markdown
+
+    markdownify 是純 Python，大型頁面轉換時會佔住 GIL；
+    超過 MARKDOWN_PROCESS_THRESHOLD 的頁面交給行程池，批次中其他網站的執行緒可同時轉換。
+    行程池無法使用時（如受限環境）直接在本執行緒轉換。
+    """
+    if len(html) < MARKDOWN_PROCESS_THRESHOLD:
+        return _html_to_markdown(html)
+    try:
+        return _markdown_executor().submit(_html_to_markdown, html).result()
+    except (OSError, RuntimeError) as e:  # BrokenProcessPool 是 RuntimeError 的子類別
+        logger.debug(f"Markdown 行程池無法使用，改在本執行緒轉換：{e}")
+        return _html_to_markdown(html)
+
+
 def _parse_html_to_article(html: str, url: str, source: str = "bs4") -> dict | None:
     """將 HTML 解析為 article dict（BS4 和 Playwright 共用）"""
-    soup = BeautifulSoup(html, 'html.parser')
-
-    # PTT 專用解析
-    parsed = urlparse(url)
+    # PTT 專用解析（自行解析 HTML，不與通用邏輯共用 soup）
+    parsed = urlsplit(url)
     if 'ptt.cc' in parsed.netloc:
-        result = _parse_ptt_article(soup, url, source)
+        result = _parse_ptt_article(html, url, source)
         if result:
             return result
-        # 如果 PTT 專用解析失敗，繼續用通用邏輯
+        # 如果 PTT 專用解析失敗，用未被修改過的完整 DOM 走通用邏輯
+
+    soup = BeautifulSoup(html, HTML_PARSER)
 
     # 移除不需要的元素
     for tag in soup.find_all(['script', 'style', 'nav', 'footer',
@@ -422,8 +906,8 @@ def _parse_html_to_article(html: str, url: str, source: str = "bs4") -> dict | N
     # 嘗試找到主要內容區域
     article = (
         soup.find('article') or
-        soup.find('div', class_=re.compile(r'article|content|post|entry', re.I)) or
-        soup.find('div', id=re.compile(r'article|content|post|entry', re.I)) or
+        soup.select_one(_CONTENT_CLASS_SELECTOR) or
+        soup.select_one(_CONTENT_ID_SELECTOR) or
         soup.find('main') or
         soup.body
     )
@@ -433,7 +917,7 @@ def _parse_html_to_article(html: str, url: str, source: str = "bs4") -> dict | N
         return None
 
     # 轉換成 Markdown
-    content = md(str(article), heading_style="ATX", strip=['img'])
+    content = _convert_markdown(str(article))
 
     # 提取圖片
     images = []
@@ -447,14 +931,13 @@ def _parse_html_to_article(html: str, url: str, source: str = "bs4") -> dict | N
     for i, img_url in enumerate(images):
         content += f"\n\n![圖片{i+1}]({img_url})"
 
-    # 提取標題
-    title = ""
-    title_tag = soup.find('title')
-    if title_tag:
-        title = title_tag.get_text(strip=True)
+    # 提取標題：h1 優先，沒有（或為空）才找 <title>，有 h1 時省掉一次樹走訪
     h1 = soup.find('h1')
-    if h1:
-        title = h1.get_text(strip=True)
+    title = h1.get_text(strip=True) if h1 else ""
+    if not title:
+        title_tag = soup.find('title')
+        if title_tag:
+            title = title_tag.get_text(strip=True)
 
     if len(content.strip()) < 50:
         logger.warning(f"[{source}] 內容太短")
@@ -468,19 +951,35 @@ def _parse_html_to_article(html: str, url: str, source: str = "bs4") -> dict | N
     }
 
 
+def _detect_encoding(resp) -> str:
+    """決定回應的編碼：HTTP header → HTML 前 1024 bytes 的 meta charset → utf-8
+
+    不使用 apparent_encoding（chardet 會掃描整份內容，純 Python 很慢）。
+    header 沒給 charset 時 requests 預設為 ISO-8859-1，視同未指定；
+    Content-Type 明確寫了 charset=ISO-8859-1 則照用。
+    """
+    enc = resp.encoding
+    if enc and (enc.lower() != 'iso-8859-1'
+                or 'charset' in resp.headers.get('Content-Type', '').lower()):
+        return enc
+    match = _RE_META_CHARSET.search(resp.content[:1024])
+    if match:
+        return match.group(1).decode('ascii')
+    return 'utf-8'
+
+
 def fetch_with_bs4(url: str) -> dict | None:
     """用 requests + BeautifulSoup 擷取網頁"""
     try:
         logger.info(f"[BS4] 正在擷取：{url}")
         # PTT 需要 over18 cookie 才能存取內容
         cookies = {}
-        parsed = urlparse(url)
+        parsed = urlsplit(url)
         if 'ptt.cc' in parsed.netloc:
             cookies['over18'] = '1'
-        resp = requests.get(url, headers=HEADERS, cookies=cookies,
-                            timeout=REQUEST_TIMEOUT)
+        resp = _SESSION.get(url, cookies=cookies, timeout=REQUEST_TIMEOUT)
         resp.raise_for_status()
-        resp.encoding = resp.apparent_encoding or 'utf-8'
+        resp.encoding = _detect_encoding(resp)
         return _parse_html_to_article(resp.text, url, source="bs4")
 
     except requests.exceptions.RequestException as e:
@@ -492,8 +991,97 @@ def fetch_with_bs4(url: str) -> dict | None:
 # 第三步之二：Playwright 策略（兜底，處理 JS 渲染頁面）
 # ============================================================
 
+# Playwright sync API 的物件綁定在建立它的執行緒上，
+# 因此由一條專屬執行緒持有瀏覽器，各執行緒把擷取工作排入佇列。
+_PW_JOBS: queue.Queue | None = None
+_PW_THREAD: threading.Thread | None = None
+_PW_LOCK = threading.Lock()
+
+
+def _render_page(browser, url: str) -> str:
+    """開新 context 載入頁面並回傳 HTML（瀏覽器本身重複使用）"""
+    context = browser.new_context(
+        user_agent=HEADERS['User-Agent'],
+        locale='zh-TW'
+    )
+    try:
+        # PTT 需要 over18 cookie
+        parsed = urlsplit(url)
+        if 'ptt.cc' in parsed.netloc:
+            context.add_cookies([{
+                'name': 'over18',
+                'value': '1',
+                'domain': '.ptt.cc',
+                'path': '/',
+            }])
+
+        page = context.new_page()
+        page.goto(url, timeout=30000, wait_until='networkidle')
+        return page.content()
+    finally:
+        context.close()
+
+
+def _playwright_loop(jobs: queue.Queue, sync_playwright):
+    """Playwright 專屬執行緒：首次需要時才啟動瀏覽器，之後重複使用"""
+    pw = browser = None
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        url, future = job
+        try:
+            if browser is None or not browser.is_connected():
+                if pw is None:
+                    pw = sync_playwright().start()
+                browser = pw.chromium.launch(headless=True)
+            future.set_result(_render_page(browser, url))
+        except Exception as e:
+            future.set_exception(e)
+
+    try:
+        if browser is not None:
+            browser.close()
+        if pw is not None:
+            pw.stop()
+    except Exception as e:
+        logger.debug(f"[Playwright] 關閉瀏覽器失敗：{e}")
+
+
+def _playwright_render(url: str, sync_playwright) -> str:
+    """將擷取工作交給 Playwright 執行緒並等待 HTML"""
+    global _PW_JOBS, _PW_THREAD
+    with _PW_LOCK:
+        if _PW_JOBS is None:
+            _PW_JOBS = queue.Queue()
+            _PW_THREAD = threading.Thread(
+                target=_playwright_loop, args=(_PW_JOBS, sync_playwright),
+                name="climb-playwright", daemon=True,
+            )
+            _PW_THREAD.start()
+        jobs = _PW_JOBS
+    future = Future()
+    jobs.put((url, future))
+    return future.result()
+
+
+def _shutdown_playwright(timeout: float = 10):
+    """關閉共用瀏覽器與 Playwright 執行緒"""
+    global _PW_JOBS, _PW_THREAD
+    with _PW_LOCK:
+        jobs, thread = _PW_JOBS, _PW_THREAD
+        _PW_JOBS = _PW_THREAD = None
+    if jobs is None:
+        return
+    jobs.put(None)
+    thread.join(timeout)
+
+
+atexit.register(_shutdown_playwright)
+
+
 def fetch_with_playwright(url: str) -> dict | None:
-    """用 Playwright 無頭瀏覽器擷取 JS 渲染頁面"""
+    """用 Playwright 無頭瀏覽器擷取 JS 渲染頁面（瀏覽器跨 URL 共用）"""
     try:
         from playwright.sync_api import sync_playwright
     except ImportError:
@@ -502,28 +1090,7 @@ def fetch_with_playwright(url: str) -> dict | None:
 
     try:
         logger.info(f"[Playwright] 正在擷取：{url}")
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                user_agent=HEADERS['User-Agent'],
-                locale='zh-TW'
-            )
-
-            # PTT 需要 over18 cookie
-            parsed = urlparse(url)
-            if 'ptt.cc' in parsed.netloc:
-                context.add_cookies([{
-                    'name': 'over18',
-                    'value': '1',
-                    'domain': '.ptt.cc',
-                    'path': '/',
-                }])
-
-            page = context.new_page()
-            page.goto(url, timeout=30000, wait_until='networkidle')
-            html = page.content()
-            browser.close()
-
+        html = _playwright_render(url, sync_playwright)
         return _parse_html_to_article(html, url, source="playwright")
 
     except Exception as e:
@@ -623,6 +1190,89 @@ def install_playwright_browsers() -> tuple[bool, str]:
 # 第四步：自動降級擷取
 # ============================================================
 
+class TokenBucket:
+    """權杖桶限速器：容量 capacity、每秒補充 rate 個權杖
+
+    consume 會直接預約權杖（餘額可為負），回傳呼叫端需要睡眠的秒數，
+    睡眠在鎖外進行。
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: float = 1) -> float:
+        """取用 n 個權杖，回傳需要等待的秒數（0 表示不必等）"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= n
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+_HOST_BUCKETS: dict[str, TokenBucket] = {}  # netloc → 該網站的權杖桶
+_HOST_BUCKETS_LOCK = threading.Lock()
+
+
+def _bucket_for(host: str) -> TokenBucket | None:
+    """取得網站的權杖桶（設定變更後重建）；POLITENESS_DELAY 為 0 時不限速"""
+    if POLITENESS_DELAY <= 0:
+        return None
+    rate = 1 / POLITENESS_DELAY
+    capacity = max(1, POLITENESS_BURST)
+    with _HOST_BUCKETS_LOCK:
+        bucket = _HOST_BUCKETS.get(host)
+        if bucket is None or bucket.rate != rate or bucket.capacity != capacity:
+            bucket = _HOST_BUCKETS[host] = TokenBucket(rate, capacity)
+        return bucket
+
+
+_JINA_BUCKET: TokenBucket | None = None  # 所有 Jina 請求共用
+
+
+def _wait_for_jina():
+    """依 Jina Reader 的額度限速（有無 JINA_API_KEY 額度不同）；批次並行時各網站共用"""
+    global _JINA_BUCKET
+    rate = (JINA_RATE_PER_MIN_WITH_KEY if JINA_API_KEY else JINA_RATE_PER_MIN) / 60
+    with _HOST_BUCKETS_LOCK:
+        bucket = _JINA_BUCKET
+        if bucket is None or bucket.rate != rate or bucket.capacity != JINA_BURST:
+            bucket = _JINA_BUCKET = TokenBucket(rate, JINA_BURST)
+    wait = bucket.consume(1)
+    if wait > 0:
+        logger.debug(f"[Jina] 額度限速，等待 {wait:.1f} 秒")
+        time.sleep(wait)
+
+
+def _wait_for_host(url: str):
+    """依網站的權杖桶限速：平均每 POLITENESS_DELAY 秒一次，最多連續 POLITENESS_BURST 次。
+
+    不同網站各自一個桶，互不阻塞。以 hostname（已轉小寫、不含連接埠與帳密）為鍵，
+    同一主機寫法不同也共用一個桶。
+    """
+    bucket = _bucket_for(urlsplit(url).hostname or "")
+    if bucket is None:
+        return
+    wait = bucket.consume(1)
+    if wait > 0:
+        time.sleep(wait)
+
+
+# 各平台建議策略的嘗試順序（Playwright 作為所有策略的最終兜底）
+_STRATEGY_ORDER = {
+    "playwright": ("playwright", "bs4"),
+    "bs4": ("bs4", "jina", "playwright"),
+    "jina": ("jina", "bs4", "playwright"),
+}
+
+
 def fetch_article(url: str) -> dict | None:
     """
     自動識別平台並用最佳策略擷取文章。
@@ -644,20 +1294,17 @@ def fetch_article(url: str) -> dict | None:
         logger.warning(f"🚫 robots.txt 不允許擷取：{url}")
         return None
 
-    # 根據建議策略決定嘗試順序
-    if platform["strategy"] == "playwright":
-        strategies = [("playwright", fetch_with_playwright), ("bs4", fetch_with_bs4)]
-    elif platform["strategy"] == "bs4":
-        strategies = [("bs4", fetch_with_bs4), ("jina", fetch_with_jina)]
-    else:
-        strategies = [("jina", fetch_with_jina), ("bs4", fetch_with_bs4)]
-
-    # Playwright 作為所有策略的最終兜底
-    if ("playwright", fetch_with_playwright) not in strategies:
-        strategies.append(("playwright", fetch_with_playwright))
+    # 同網站禮貌延遲（不同網站互不等待）
+    _wait_for_host(url)
 
-    for name, func in strategies:
-        result = retry_fetch(func, url)
+    # 根據建議策略決定嘗試順序
+    strategies = _STRATEGY_ORDER.get(platform["strategy"], _STRATEGY_ORDER["jina"])
+    # 函式在呼叫時才查找（測試可 patch 個別策略）
+    fetchers = {"jina": fetch_with_jina, "bs4": fetch_with_bs4,
+                "playwright": fetch_with_playwright}
+    max_total = RETRY_MAX_TOTAL or None
+    for name in strategies:
+        result = retry_fetch(fetchers[name], url, max_total=max_total)
         if result:
             logger.info(f"✅ 成功擷取（策略：{name}）")
             result["platform"] = platform["name"]
@@ -672,26 +1319,72 @@ def fetch_article(url: str) -> dict | None:
 # 第五步：圖片下載與內容保存
 # ============================================================
 
+# 圖床回傳這些類型時多半是錯誤頁或防盜連頁面，不當成圖片存檔
+_NON_IMAGE_CONTENT_TYPES = ('text/', 'application/json', 'application/xhtml')
+
+
 def download_image(img_url: str, save_path: Path, referer: str = "") -> bool:
-    """下載單張圖片"""
+    """下載單張圖片（非圖片或超過 MAX_IMAGE_BYTES 的回應不下載）"""
     try:
-        headers = {**HEADERS}
+        headers = {}
         if referer:
             headers['Referer'] = referer
 
-        resp = requests.get(img_url, headers=headers, timeout=15, stream=True)
-        resp.raise_for_status()
-
-        with open(save_path, 'wb') as f:
-            for chunk in resp.iter_content(8192):
-                f.write(chunk)
+        # stream=True 時 get 只讀完回應標頭，檢查不通過就關閉連線、不下載本體
+        resp = _SESSION.get(img_url, headers=headers, timeout=15, stream=True)
+        try:
+            resp.raise_for_status()
+            content_type = resp.headers.get('Content-Type', '')
+            if content_type.startswith(_NON_IMAGE_CONTENT_TYPES):
+                raise ValueError(f"不是圖片（{content_type}）")
+            length = resp.headers.get('Content-Length', '')
+            if length.isdigit() and int(length) > MAX_IMAGE_BYTES:
+                raise ValueError(f"圖片過大（{int(length)} bytes）")
+            # 直接從 socket 每次 64KB 串流寫檔；沒有 Content-Length（chunked）或
+            # 解壓後超過上限的回應也在寫到 MAX_IMAGE_BYTES 時中止
+            resp.raw.decode_content = True  # 仍處理 gzip 等 Content-Encoding
+            remaining = MAX_IMAGE_BYTES
+            with open(save_path, 'wb') as f:
+                while chunk := resp.raw.read(IMAGE_CHUNK_SIZE):
+                    remaining -= len(chunk)
+                    if remaining < 0:
+                        raise ValueError(f"圖片過大（超過 {MAX_IMAGE_BYTES} bytes）")
+                    f.write(chunk)
+        finally:
+            resp.close()
         return True
 
     except Exception as e:
         logger.warning(f"圖片下載失敗：{img_url} — {e}")
+        Path(save_path).unlink(missing_ok=True)  # 不留下半個檔案
         return False
 
 
+# 圖片下載共用的執行緒池與各圖床的並行上限（跨文章共用，避免每篇文章重建執行緒）
+_IMAGE_EXECUTOR: ThreadPoolExecutor | None = None
+_IMAGE_HOST_SLOTS: dict[str, threading.Semaphore] = {}
+_IMAGE_LOCK = threading.Lock()
+
+
+def _image_executor() -> ThreadPoolExecutor:
+    """取得（必要時建立）圖片下載執行緒池"""
+    global _IMAGE_EXECUTOR
+    with _IMAGE_LOCK:
+        if _IMAGE_EXECUTOR is None:
+            _IMAGE_EXECUTOR = ThreadPoolExecutor(
+                max_workers=IMAGE_DOWNLOAD_WORKERS, thread_name_prefix="climb-img")
+        return _IMAGE_EXECUTOR
+
+
+def _image_host_slot(host: str) -> threading.Semaphore:
+    """取得指定圖床的並行下載名額"""
+    with _IMAGE_LOCK:
+        slot = _IMAGE_HOST_SLOTS.get(host)
+        if slot is None:
+            slot = _IMAGE_HOST_SLOTS[host] = threading.Semaphore(IMAGE_HOST_CONCURRENCY)
+        return slot
+
+
 def save_article(article: dict, output_dir: str = DEFAULT_OUTPUT_DIR) -> Path:
     """
     儲存文章為 Markdown，下載圖片到本地。
@@ -699,52 +1392,64 @@ def save_article(article: dict, output_dir: str = DEFAULT_OUTPUT_DIR) -> Path:
     """
     title = article["title"]
     # 清理標題中的特殊字元
-    safe_title = re.sub(r'[\\/:*?"<>|]', '_', title)[:60]
+    safe_title = title[:60].translate(_TITLE_UNSAFE)
     date_str = datetime.now().strftime("%Y-%m-%d")
     folder_name = f"{date_str}_{safe_title}"
 
-    # 防止標題碰撞：資料夾已存在時加上短 hash
-    article_dir = Path(output_dir) / folder_name
-    if article_dir.exists():
+    # 防止標題碰撞：直接建立資料夾，已存在（FileExistsError）時改用加上短 hash 的名稱。
+    # 比先 exists() 再 mkdir 少一次 stat，並行儲存同名文章時也不會搶到同一個資料夾
+    output_path = Path(output_dir)
+    article_dir = output_path / folder_name
+    try:
+        article_dir.mkdir(parents=True)
+    except FileExistsError:
         url_hash = hashlib.md5(article.get("url", "").encode()).hexdigest()[:6]
         folder_name = f"{folder_name}_{url_hash}"
-        article_dir = Path(output_dir) / folder_name
+        article_dir = output_path / folder_name
+        article_dir.mkdir(exist_ok=True)
     images_dir = article_dir / "images"
-    article_dir.mkdir(parents=True, exist_ok=True)
     images_dir.mkdir(exist_ok=True)
 
     content = article["content"]
 
-    # 提取並下載圖片
-    img_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-    img_matches = re.findall(img_pattern, content)
-
-    # 也找純 URL 圖片
-    url_pattern = r'(https?://[^\s<>"\']+\.(?:jpg|jpeg|png|gif|webp)(?:\?[^\s<>"\']*)?)'
-    url_matches = re.findall(url_pattern, content)
-
-    all_images = []
-    for alt, url in img_matches:
-        all_images.append(url)
-    for url in url_matches:
-        if url not in all_images:
-            all_images.append(url)
+    # 提取並下載圖片（Markdown 圖片與純 URL 圖片，依出現順序去重）
+    all_images = list(dict.fromkeys(
+        m.group('md') or m.group('url') for m in _RE_ALL_IMGS.finditer(content)
+    ))
 
     # 決定 Referer
     referer = article.get("url", "")
-    parsed = urlparse(referer)
+    parsed = urlsplit(referer)
     referer_base = f"{parsed.scheme}://{parsed.netloc}/"
 
-    # 下載圖片並替換路徑
-    for i, img_url in enumerate(all_images, 1):
-        ext = _guess_extension(img_url)
-        local_name = f"img_{i:02d}{ext}"
-        local_path = images_dir / local_name
+    # 並行下載圖片（共用執行緒池；同一圖床另有上限，避免觸發限流）
+    jobs = [(i, img_url, f"img_{i:02d}{_guess_extension(img_url)}")
+            for i, img_url in enumerate(all_images, 1)]
+
+    def _download(job):
+        i, img_url, local_name = job
+        with _image_host_slot(urlsplit(img_url).netloc):
+            return download_image(img_url, images_dir / local_name, referer=referer_base)
+
+    if len(jobs) > 1:
+        downloaded = list(_image_executor().map(_download, jobs))
+    else:
+        downloaded = [_download(job) for job in jobs]  # 0~1 張不必排入執行緒池
 
-        if download_image(img_url, local_path, referer=referer_base):
-            # 替換內容中的圖片路徑
-            content = content.replace(img_url, f"images/{local_name}")
+    # 替換內容中的圖片路徑（一次 re.sub 掃描全文，長 URL 優先比對）
+    mapping = {}
+    for (i, img_url, local_name), ok in zip(jobs, downloaded):
+        if ok:
+            mapping[img_url] = f"images/{local_name}"
             logger.info(f"  📷 圖片 {i}: {local_name}")
+    if len(mapping) == 1:
+        # 只有一張圖時直接 str.replace，不必為這篇文章編譯 pattern
+        (img_url, local_path), = mapping.items()
+        content = content.replace(img_url, local_path)
+    elif mapping:
+        pattern = re.compile('|'.join(
+            re.escape(u) for u in sorted(mapping, key=len, reverse=True)))
+        content = pattern.sub(lambda m: mapping[m.group(0)], content)
 
     # 組裝最終 Markdown（YAML 安全轉義標題）
     yaml_title = _yaml_safe_title(title)
@@ -765,68 +1470,170 @@ date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
     # 同時儲存原始 JSON（方便後續批次處理）
     meta_path = article_dir / "metadata.json"
-    meta_path.write_text(json.dumps({
+    meta_path.write_bytes(_dumps_json({
         "title": title,
         "url": article.get("url"),
         "platform": article.get("platform"),
         "source": article.get("source"),
         "fetched_at": datetime.now().isoformat(),
         "image_count": len(all_images),
-    }, ensure_ascii=False, indent=2), encoding='utf-8')
+    }))
 
     logger.info(f"💾 已儲存：{md_path}")
     return article_dir
 
 
+# 路徑結尾的圖片副檔名（由 IMAGE_EXTENSIONS 產生，一次 search 取代逐一 endswith）
+_IMAGE_EXT_RE = re.compile(
+    r'(' + '|'.join(re.escape(ext) for ext in sorted(IMAGE_EXTENSIONS)) + r')$',
+    re.IGNORECASE,
+)
+
+
 def _guess_extension(url: str) -> str:
-    """從 URL 猜測圖片副檔名"""
-    parsed = urlparse(url)
-    path = parsed.path.lower()
-    for ext in IMAGE_EXTENSIONS:
-        if path.endswith(ext):
-            return ext
-    return '.jpg'  # 預設
+    """從 URL 猜測圖片副檔名（只看 path，不含 query / fragment）"""
+    m = _IMAGE_EXT_RE.search(urlsplit(url).path)
+    return m.group(1).lower() if m else '.jpg'  # 預設 .jpg
 
 
 # ============================================================
 # 第六步：批次處理
 # ============================================================
 
-def batch_fetch_urls(urls: list, output_dir: str = DEFAULT_OUTPUT_DIR) -> dict:
-    """
-    處理 URL 列表的批次擷取。
-    供 batch_fetch()、fetch_ptt_board() 等共用。
+def _fetch_and_save(url: str, output_dir: str, store: DedupStore) -> tuple[str, dict]:
+    """批次中處理單一 URL，回傳 (結果類別, 紀錄)"""
+    article = fetch_article(url)
+    if article:
+        save_path = save_article(article, output_dir)
+        store.add(url)
+        return "success", {"url": url, "path": str(save_path)}
+    return "failed", {"url": url}
+
+
+DNS_PREFETCH_WORKERS = 16  # 預先解析 DNS 的執行緒數上限
+# 跨批次共用的 DNS 預先解析執行緒池（排程模式每輪批次不必重建執行緒）
+_DNS_EXECUTOR: ThreadPoolExecutor | None = None
+_DNS_LOCK = threading.Lock()
+
+
+def _dns_executor() -> ThreadPoolExecutor:
+    """取得（必要時建立）DNS 預先解析執行緒池"""
+    global _DNS_EXECUTOR
+    with _DNS_LOCK:
+        if _DNS_EXECUTOR is None:
+            _DNS_EXECUTOR = ThreadPoolExecutor(
+                max_workers=DNS_PREFETCH_WORKERS, thread_name_prefix="climb-dns")
+        return _DNS_EXECUTOR
+
+
+def _resolve_host(host: str):
+    """解析主機名稱（只為了預熱系統 DNS 快取，失敗也無妨）"""
+    try:
+        socket.getaddrinfo(host, 443, proto=socket.IPPROTO_TCP)
+    except OSError:
+        pass
+
+
+def _prefetch_dns(hosts) -> list[Future]:
+    """在背景並行解析主機名稱，讓排隊中的網站輪到時不必再等 DNS
+
+    不等待結果（解析失敗也無妨，正式請求時會再查一次），回傳 futures 供測試等待。
     """
-    logger.info(f"共 {len(urls)} 個 URL 待擷取")
+    hosts = [h for h in hosts if h]
+    if not hosts:
+        return []
+    executor = _dns_executor()
+    return [executor.submit(_resolve_host, host) for host in hosts]
 
-    results = {"success": [], "failed": [], "skipped": []}
 
-    for i, url in enumerate(urls, 1):
-        logger.info(f"\n--- [{i}/{len(urls)}] ---")
+def _fetch_host_bucket(items: list, output_dir: str, total: int,
+                       store: DedupStore, on_result=None, cancel_event=None) -> list:
+    """依序處理同一網站的 URL（禮貌延遲由 fetch_article 依網站控制）
 
-        # 去重檢查
-        if is_already_fetched(url, output_dir):
-            logger.info(f"已下載過，跳過：{url}")
-            results["skipped"].append({"url": url, "reason": "已下載過"})
-            continue
+    Args:
+        items: [(序號, url), ...]
+    Returns:
+        [(序號, 結果類別, 紀錄), ...]；cancel_event 被設定後剩餘的 URL 不處理
+    """
+    outcomes = []
+    for i, url in items:
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        logger.info(f"\n--- [{i}/{total}] ---")
+        try:
+            kind, record = _fetch_and_save(url, output_dir, store)
+        except Exception as e:
+            logger.error(f"擷取失敗 {url}: {e}")
+            kind, record = "failed", {"url": url, "error": str(e)}
+        outcomes.append((i, kind, record))
+        if on_result:
+            on_result(kind, record)
+    return outcomes
+
+
+def batch_fetch_urls(urls: list, output_dir: str = DEFAULT_OUTPUT_DIR,
+                     on_result=None, cancel_event=None) -> dict:
+    """
+    處理 URL 列表的批次擷取。
+    供 batch_fetch()、fetch_ptt_board()、GUI 批次頁籤等共用。
 
-        platform = identify_platform(url)
-        if platform["strategy"] == "skip":
-            logger.warning(f"跳過 {platform['name']} 平台：{url}")
-            results["skipped"].append({"url": url, "reason": f"{platform['name']} 需要登入"})
-            continue
+    不同網站的 URL 以執行緒並行處理（最多 BATCH_CONCURRENCY 個網站），
+    同一網站內依序擷取並保持禮貌延遲。
 
-        article = fetch_article(url)
-        if article:
-            save_path = save_article(article, output_dir)
-            mark_as_fetched(url, output_dir)
-            results["success"].append({"url": url, "path": str(save_path)})
-        else:
-            results["failed"].append({"url": url})
+    Args:
+        on_result: 每個 URL 有結果時呼叫 on_result(結果類別, 紀錄)（可能從工作執行緒呼叫）
+        cancel_event: threading.Event，設定後各網站處理完目前的 URL 即停止
+    """
+    total = len(urls)
+    logger.info(f"共 {total} 個 URL 待擷取")
 
-        # 禮貌延遲，避免被封
-        if i < len(urls):
-            time.sleep(POLITENESS_DELAY)
+    results = {"success": [], "failed": [], "skipped": []}
+    outcomes = {}  # 序號 → (結果類別, 紀錄)
+
+    def skip(i, record):
+        outcomes[i] = ("skipped", record)
+        if on_result:
+            on_result("skipped", record)
+
+    with DedupStore(output_dir) as store:
+        # 先過濾已下載 / 重複 / 不支援的 URL，其餘依網站分組
+        buckets = defaultdict(list)
+        queued = set()
+        for i, url in enumerate(urls, 1):
+            key = _normalize_url(url)  # 與去重記錄相同的比對形式
+            if key in queued or key in store:
+                logger.info(f"已下載過，跳過：{url}")
+                skip(i, {"url": url, "reason": "已下載過"})
+                continue
+
+            platform = identify_platform(url)
+            if platform["strategy"] == "skip":
+                logger.warning(f"跳過 {platform['name']} 平台：{url}")
+                skip(i, {"url": url, "reason": f"{platform['name']} 需要登入"})
+                continue
+
+            queued.add(key)
+            buckets[platform["domain"]].append((i, url))
+
+        if buckets:
+            workers = max(1, min(BATCH_CONCURRENCY, len(buckets)))
+            if len(buckets) > workers:
+                # 前 workers 個網站會立刻開始；其餘排隊的網站先在背景解析 DNS
+                _prefetch_dns(urlsplit(items[0][1]).hostname
+                              for items in list(buckets.values())[workers:])
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix="climb-batch") as executor:
+                futures = [executor.submit(_fetch_host_bucket, items, output_dir, total, store,
+                                           on_result, cancel_event)
+                           for items in buckets.values()]
+                for future in futures:
+                    for i, kind, record in future.result():
+                        outcomes[i] = (kind, record)
+
+    # 依輸入順序彙整結果
+    for i in sorted(outcomes):
+        kind, record = outcomes[i]
+        results[kind].append(record)
 
     # 輸出統計
     logger.info(f"\n{'='*50}")
@@ -838,7 +1645,7 @@ def batch_fetch_urls(urls: list, output_dir: str = DEFAULT_OUTPUT_DIR) -> dict:
     # 儲存報告
     report_path = Path(output_dir) / f"batch_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     report_path.parent.mkdir(parents=True, exist_ok=True)
-    report_path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+    report_path.write_bytes(_dumps_json(results))
     logger.info(f"   報告：{report_path}")
 
     return results
@@ -847,22 +1654,106 @@ def batch_fetch_urls(urls: list, output_dir: str = DEFAULT_OUTPUT_DIR) -> dict:
 def batch_fetch(url_file: str, output_dir: str = DEFAULT_OUTPUT_DIR) -> dict:
     """
     從檔案讀取 URL 列表，批次擷取。
-    URL 檔案格式：每行一個 URL，# 開頭為註解
+    URL 檔案格式：每行一個 URL，# 開頭為註解；
+    正規化後的 URL（_normalize_url）只當去重鍵，寫法不同的同一 URL 只保留第一次出現；
+    擷取與存檔仍使用原始寫法（#! 等 hash 路由頁面需要完整的 fragment）
     """
-    urls = []
+    urls: dict[str, str] = {}
     with open(url_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
+        for line in map(str.strip, f):
             if line and not line.startswith('#'):
-                urls.append(line)
+                urls.setdefault(_normalize_url(line), line)
 
-    return batch_fetch_urls(urls, output_dir)
+    return batch_fetch_urls(list(urls.values()), output_dir)
 
 
 # ============================================================
 # 第七步：PTT 看板列表頁爬取
 # ============================================================
 
+_CONDITIONAL_CACHE: OrderedDict[str, tuple[str | None, str | None, str]] = OrderedDict()
+_CONDITIONAL_CACHE_MAX = 256  # 最多記住幾個 URL 的 (ETag, Last-Modified, 內文)
+_CONDITIONAL_LOCK = threading.Lock()
+
+
+def _conditional_get_text(url: str, headers: dict | None = None, **kwargs) -> str:
+    """以條件式請求取得頁面內文
+
+    同一 URL 再次請求時帶上次的 ETag / Last-Modified，
+    伺服器回 304 Not Modified 就沿用記憶體中的內文，不必重新下載。
+    排程模式（--schedule）重複掃描看板時，舊的列表頁幾乎都不會變動。
+    """
+    with _CONDITIONAL_LOCK:
+        cached = _CONDITIONAL_CACHE.get(url)
+    headers = dict(headers or {})
+    if cached:
+        etag, modified, _ = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+
+    resp = _SESSION.get(url, headers=headers or None, **kwargs)
+    if cached and resp.status_code == 304:
+        with _CONDITIONAL_LOCK:
+            _CONDITIONAL_CACHE.move_to_end(url)
+        return cached[2]
+    resp.raise_for_status()
+
+    text = resp.text
+    etag = resp.headers.get('ETag')
+    modified = resp.headers.get('Last-Modified')
+    with _CONDITIONAL_LOCK:
+        if etag or modified:
+            _CONDITIONAL_CACHE[url] = (etag, modified, text)
+            _CONDITIONAL_CACHE.move_to_end(url)
+            while len(_CONDITIONAL_CACHE) > _CONDITIONAL_CACHE_MAX:
+                _CONDITIONAL_CACHE.popitem(last=False)
+        else:
+            _CONDITIONAL_CACHE.pop(url, None)
+    return text
+
+
+# 以 class 單字比對（等同 CSS 的 div.r-ent），不會誤中 r-ent-xxx 之類的 class
+_XPATH_PTT_TITLE_LINKS = ("//div[contains(concat(' ', normalize-space(@class), ' '), ' r-ent ')]"
+                          "//div[contains(concat(' ', normalize-space(@class), ' '), ' title ')]/a")
+_XPATH_PTT_PAGING_LINKS = ("//div[contains(concat(' ', normalize-space(@class), ' '),"
+                           " ' btn-group-paging ')]/a")
+
+# 預先編譯 XPath，每頁只需套用，不必重新解析運算式
+if lxml_etree is not None:
+    _PTT_TITLE_LINKS = lxml_etree.XPath(_XPATH_PTT_TITLE_LINKS)
+    _PTT_PAGING_LINKS = lxml_etree.XPath(_XPATH_PTT_PAGING_LINKS)
+
+
+def parse_ptt_board_page(html: str) -> tuple[list[tuple[str, str]], str | None]:
+    """解析 PTT 看板列表頁，回傳 ([(文章 href, 標題), ...], 上一頁 href 或 None)
+
+    有 lxml 時直接以 XPath 取值，不建 BeautifulSoup 樹；否則退回 BS4 + SoupStrainer。
+    被刪除的文章沒有 <a>，不會出現在結果中。
+    """
+    if not html.strip():
+        return [], None
+
+    if lxml_html is not None:
+        tree = lxml_html.fromstring(html)
+        entries = [(a.get('href'), a.text_content().strip())
+                   for a in _PTT_TITLE_LINKS(tree) if a.get('href')]
+        prev_href = next((a.get('href') for a in _PTT_PAGING_LINKS(tree)
+                          if '上頁' in a.text_content() and a.get('href')), None)
+        return entries, prev_href
+
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_PTT_BOARD_STRAINER)
+    entries = []
+    for entry in soup.select('div.r-ent'):
+        link = entry.select_one('div.title a')
+        if link and link.get('href'):
+            entries.append((link['href'], link.get_text(strip=True)))
+    prev_href = next((a['href'] for a in soup.select('div.btn-group-paging a')
+                      if '上頁' in a.get_text() and a.get('href')), None)
+    return entries, prev_href
+
+
 def fetch_ptt_board(board: str, pages: int = 1, output_dir: str = DEFAULT_OUTPUT_DIR) -> list:
     """
     從 PTT 看板列表頁提取文章 URL，支援翻頁。
@@ -876,43 +1767,34 @@ def fetch_ptt_board(board: str, pages: int = 1, output_dir: str = DEFAULT_OUTPUT
     """
     base_url = f"https://www.ptt.cc/bbs/{board}/index.html"
     cookies = {'over18': '1'}
-    collected_urls = []
+    collected_urls: dict[str, None] = {}  # 有序集合：同一篇文章出現在相鄰兩頁時只收一次
     current_url = base_url
+    fetched = DedupStore(output_dir)
 
     for page_num in range(pages):
         logger.info(f"[PTT] 正在讀取看板 {board} 第 {page_num + 1}/{pages} 頁...")
         try:
-            resp = requests.get(current_url, headers=HEADERS, cookies=cookies,
-                                timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
+            html = _conditional_get_text(current_url, cookies=cookies,
+                                         timeout=REQUEST_TIMEOUT)
         except requests.exceptions.RequestException as e:
             logger.warning(f"[PTT] 看板頁面讀取失敗：{e}")
             break
 
-        soup = BeautifulSoup(resp.text, 'html.parser')
+        entries, prev_href = parse_ptt_board_page(html)
 
         # 提取文章連結
-        for entry in soup.select('div.r-ent'):
-            link = entry.select_one('div.title a')
-            if link and link.get('href'):
-                full_url = urljoin('https://www.ptt.cc', link['href'])
-                if not is_already_fetched(full_url, output_dir):
-                    collected_urls.append(full_url)
-
-        # 找上一頁連結
-        prev_link = None
-        for btn in soup.select('div.btn-group-paging a.btn.wide'):
-            if '上頁' in btn.text:
-                prev_link = urljoin('https://www.ptt.cc', btn['href'])
-                break
+        for href, _ in entries:
+            full_url = urljoin('https://www.ptt.cc', href)
+            if full_url not in fetched:
+                collected_urls[full_url] = None
 
-        if not prev_link or page_num >= pages - 1:
+        if not prev_href or page_num >= pages - 1:
             break
-        current_url = prev_link
+        current_url = urljoin('https://www.ptt.cc', prev_href)
         time.sleep(1)  # 禮貌延遲
 
     logger.info(f"[PTT] 從 {board} 看板取得 {len(collected_urls)} 篇新文章 URL")
-    return collected_urls
+    return list(collected_urls)
 
 
 # ============================================================
@@ -962,7 +1844,9 @@ def run_scheduled(args):
 
 def main():
     global _CONFIG, DEFAULT_OUTPUT_DIR, REQUEST_TIMEOUT, MAX_RETRIES
-    global RETRY_BASE_DELAY, POLITENESS_DELAY, JINA_BASE_URL
+    global RETRY_BASE_DELAY, RETRY_MAX_DELAY, RETRY_MAX_TOTAL
+    global POLITENESS_DELAY, POLITENESS_BURST, BATCH_CONCURRENCY, JINA_BASE_URL
+    multiprocessing.freeze_support()  # Markdown 行程池的子行程需要（打包後才有作用）
 
     parser = argparse.ArgumentParser(
         description="🐾 獸醫文章自動化擷取工具",
@@ -986,6 +1870,9 @@ def main():
 
   # 排程模式（每 60 分鐘自動執行）
   python scraper.py --ptt-board cat --pages 2 --schedule 60
+
+  # 批次擷取時同時處理 8 個網站
+  python scraper.py --batch urls.txt --concurrency 8
         """
     )
     parser.add_argument("url", nargs="?", help="要擷取的網頁 URL")
@@ -1001,6 +1888,8 @@ def main():
                         help="PTT 看板頁數（預設：1）")
     parser.add_argument("--schedule", type=int, metavar="MINUTES",
                         help="排程模式：每隔 N 分鐘自動執行")
+    parser.add_argument("--concurrency", type=int, metavar="N",
+                        help="批次模式同時擷取的網站數（預設：設定檔 batch_concurrency）")
 
     args = parser.parse_args()
 
@@ -1011,11 +1900,20 @@ def main():
         REQUEST_TIMEOUT = _CONFIG["request_timeout"]
         MAX_RETRIES = _CONFIG["max_retries"]
         RETRY_BASE_DELAY = _CONFIG["retry_base_delay"]
+        RETRY_MAX_DELAY = _CONFIG["retry_max_delay"]
+        RETRY_MAX_TOTAL = _CONFIG["retry_max_total"]
         POLITENESS_DELAY = _CONFIG["politeness_delay"]
+        POLITENESS_BURST = _CONFIG["politeness_burst"]
+        BATCH_CONCURRENCY = _CONFIG["batch_concurrency"]
         JINA_BASE_URL = _CONFIG["jina_base_url"]
         if args.output == os.path.expanduser("~/vet-articles"):
             args.output = DEFAULT_OUTPUT_DIR
 
+    if args.concurrency is not None:
+        if args.concurrency < 1:
+            parser.error("--concurrency 至少為 1")
+        BATCH_CONCURRENCY = args.concurrency
+
     # 初始化日誌（console + file）
     _setup_logging(log_dir=args.output, level=_CONFIG.get("log_level", "INFO"))
 
@@ -1052,7 +1950,7 @@ def main():
     if args.url:
         if is_already_fetched(args.url, args.output):
             logger.info(f"此 URL 已下載過：{args.url}")
-            logger.info("如要重新下載，請刪除輸出目錄中的 .fetched_urls.json 對應記錄")
+            logger.info("如要重新下載，請刪除輸出目錄中 .fetched_urls.json 與 .fetched_urls.log 的對應記錄")
             return
         article = fetch_article(args.url)
         if article:
@@ -94,6 +94,29 @@ Article body here."""
         fm, body = ai_processor.parse_frontmatter(content)
         assert fm["tags"] == ["CKD", "貓", "老年"]
 
+    def test_unterminated_frontmatter(self):
+        content = "---\ntitle: x\nno closing fence"
+        assert ai_processor.parse_frontmatter(content) == ({}, content)
+
+    def test_non_fence_dashes_skipped(self):
+        """"----" 或 "--- x" 不是結尾分隔線"""
+        content = "---\ntitle: x\n---- \n--- note\n---\nBody"
+        assert ai_processor._split_frontmatter(content) == ("title: x\n---- \n--- note", "Body")
+
+    def test_crlf_line_endings(self):
+        fm, body = ai_processor.parse_frontmatter("---\r\ntitle: x\r\n---\r\n\r\nBody")
+        assert fm == {"title": "x"}
+        assert body == "Body"
+
+    def test_pure_python_loader_gives_same_result(self, monkeypatch):
+        """沒有 libyaml 時退回 SafeLoader/SafeDumper，結果相同"""
+        import yaml
+        content = '---\ntitle: "文章: 標題"\ntags:\n  - CKD\n  - 貓\ndate: 2024-01-01\n---\nBody'
+        fast = ai_processor.update_frontmatter(content, {"summary": "摘要"})
+        monkeypatch.setattr(ai_processor, "_YAML_LOADER", yaml.SafeLoader)
+        monkeypatch.setattr(ai_processor, "_YAML_DUMPER", yaml.SafeDumper)
+        assert ai_processor.update_frontmatter(content, {"summary": "摘要"}) == fast
+
 
 # ============================================================
 # Frontmatter 更新
@@ -155,6 +178,13 @@ class TestUpdateFrontmatter:
         fm, _ = ai_processor.parse_frontmatter(updated)
         assert fm["tags"] == []
 
+    def test_empty_updates_return_content_unchanged(self):
+        """沒有要更新的欄位時原樣回傳，不重新序列化"""
+        content = "---\ntitle: 'Test'\ndate: 2024-01-01\n---\nBody"
+        with patch.object(ai_processor, "parse_frontmatter") as parse:
+            assert ai_processor.update_frontmatter(content, {}) is content
+        parse.assert_not_called()
+
 
 # ============================================================
 # 文章掃描
@@ -225,6 +255,58 @@ class TestScanArticles:
         articles = ai_processor.scan_articles(str(tmp_path))
         assert articles == []
 
+    def test_platform_falls_back_to_metadata(self, tmp_path):
+        """frontmatter 沒有平台時由 metadata.json 補上"""
+        article_dir = tmp_path / "no_platform"
+        article_dir.mkdir()
+        (article_dir / "content.md").write_text("---\ntitle: T\n---\nBody", encoding="utf-8")
+        (article_dir / "metadata.json").write_text(json.dumps({"platform": "Medium"}), encoding="utf-8")
+        articles = ai_processor.scan_articles(str(tmp_path))
+        assert articles[0]["platform"] == "Medium"
+
+    def test_directory_without_content_skipped(self, tmp_path):
+        (tmp_path / "images_only").mkdir()
+        self._create_article(str(tmp_path), "real")
+        articles = ai_processor.scan_articles(str(tmp_path))
+        assert [a["title"] for a in articles] == ["real"]
+
+    def test_unchanged_articles_use_index(self, tmp_path):
+        """content.md 未變動時第二次掃描不再解析 frontmatter"""
+        self._create_article(str(tmp_path), "a", category="內科", summary="S")
+        self._create_article(str(tmp_path), "b")
+
+        first = ai_processor.scan_articles(str(tmp_path))
+        assert (tmp_path / ai_processor.AI_INDEX_FILE).exists()
+
+        with patch.object(ai_processor, "parse_frontmatter",
+                          wraps=ai_processor.parse_frontmatter) as parse:
+            second = ai_processor.scan_articles(str(tmp_path))
+        assert parse.call_count == 0
+        assert second == first
+
+    def test_changed_article_is_reparsed(self, tmp_path):
+        """content.md 變動後重新解析"""
+        article_dir = self._create_article(str(tmp_path), "a")
+        assert not ai_processor.scan_articles(str(tmp_path))[0]["has_ai_data"]
+
+        content_path = os.path.join(article_dir, "content.md")
+        with open(content_path, "w", encoding="utf-8") as f:
+            f.write("---\ntitle: a\ncategory: 外科\nsummary: S\n---\nBody")
+        st = os.stat(content_path)
+        os.utime(content_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert ai_processor.scan_articles(str(tmp_path))[0]["has_ai_data"]
+
+    def test_corrupt_index_ignored(self, tmp_path):
+        """索引損壞時照常掃描並重建"""
+        self._create_article(str(tmp_path), "a")
+        (tmp_path / ai_processor.AI_INDEX_FILE).write_text("{broken", encoding="utf-8")
+
+        articles = ai_processor.scan_articles(str(tmp_path))
+        assert [a["title"] for a in articles] == ["a"]
+        index = json.loads((tmp_path / ai_processor.AI_INDEX_FILE).read_text(encoding="utf-8"))
+        assert "a" in index
+
     def test_article_char_count(self, tmp_path):
         """文章字元數計算"""
         self._create_article(str(tmp_path), "test")
@@ -278,6 +360,25 @@ class TestEstimateCost:
         assert cost["total_chars"] == ai_processor.MAX_ARTICLE_CHARS
 
 
+# ============================================================
+# Prompt 建構
+# ============================================================
+
+class TestBuildUserPrompt:
+    def test_with_title(self):
+        prompt = ai_processor._build_user_prompt("內文", title="標題")
+        assert prompt == "文章標題：標題\n\n以下是文章內容：\n\n內文"
+
+    def test_without_title(self):
+        assert ai_processor._build_user_prompt("內文") == "以下是文章內容：\n\n內文"
+
+    def test_truncates_long_article(self):
+        text = "x" * (ai_processor.MAX_ARTICLE_CHARS + 100)
+        prompt = ai_processor._build_user_prompt(text)
+        assert prompt.endswith("x\n\n[... 文章已截斷 ...]")
+        assert prompt.count("x") == ai_processor.MAX_ARTICLE_CHARS
+
+
 # ============================================================
 # 單篇文章處理
 # ============================================================
@@ -547,6 +648,89 @@ class TestProcessSingleArticle:
 
         assert mock_client.messages.create.call_count == ai_processor.MAX_API_RETRIES
 
+    def test_group_call_returns_results_in_order(self):
+        """合併呼叫回傳與輸入順序相同的結果列表"""
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text=json.dumps([
+            {"category": "內科", "tags": ["A"], "summary": "一"},
+            {"category": "外科", "tags": "B, C", "summary": "二"},
+        ]))]
+        mock_client = MagicMock()
+        mock_client.messages.create.return_value = mock_response
+
+        with patch.object(ai_processor, "HAS_ANTHROPIC", True):
+            results = ai_processor.process_article_group(
+                ["文章一", "文章二"], "fake-key", max_tokens=1000,
+                titles=["T1", "T2"], client=mock_client,
+            )
+
+        assert [r["category"] for r in results] == ["內科", "外科"]
+        assert results[1]["tags"] == ["B", "C"]
+        kwargs = mock_client.messages.create.call_args.kwargs
+        assert kwargs["max_tokens"] == 2000
+        prompt = kwargs["messages"][0]["content"]
+        assert "2 篇文章" in prompt and prompt.index("文章一") < prompt.index("文章二")
+
+    def test_group_call_rejects_wrong_length(self):
+        """回傳的陣列篇數不符時拋出 RuntimeError"""
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text=json.dumps([
+            {"category": "內科", "tags": [], "summary": "一"},
+        ]))]
+        mock_client = MagicMock()
+        mock_client.messages.create.return_value = mock_response
+
+        with patch.object(ai_processor, "HAS_ANTHROPIC", True):
+            with pytest.raises(RuntimeError, match="2 個元素"):
+                ai_processor.process_article_group(
+                    ["文章一", "文章二"], "fake-key", client=mock_client,
+                )
+
+    def test_retryable_error_classification(self):
+        """連線錯誤、429、5xx 可重試；401、400、其他 4xx 不重試"""
+        import anthropic as real_anthropic
+
+        def status_error(cls, code):
+            resp = MagicMock()
+            resp.status_code = code
+            resp.headers = {}
+            return cls(message="err", response=resp, body=None)
+
+        retryable = ai_processor._is_retryable_api_error
+        assert retryable(real_anthropic.APIConnectionError(request=MagicMock()))
+        assert retryable(status_error(real_anthropic.RateLimitError, 429))
+        assert retryable(status_error(real_anthropic.APIStatusError, 503))
+        assert not retryable(status_error(real_anthropic.AuthenticationError, 401))
+        assert not retryable(status_error(real_anthropic.BadRequestError, 400))
+        assert not retryable(status_error(real_anthropic.APIStatusError, 404))
+
+    def test_retry_stops_at_deadline(self):
+        """超過重試截止時間後不再重試"""
+        import anthropic as real_anthropic
+
+        mock_client = MagicMock()
+        conn_error = real_anthropic.APIConnectionError(request=MagicMock())
+        mock_client.messages.create.side_effect = conn_error
+
+        with patch.object(ai_processor, "HAS_ANTHROPIC", True), \
+             patch.object(ai_processor, "API_MAX_RETRY_WAIT", 0):
+            with patch("ai_processor.anthropic") as mock_anthropic:
+                mock_anthropic.APIConnectionError = real_anthropic.APIConnectionError
+                mock_anthropic.APITimeoutError = real_anthropic.APITimeoutError
+                mock_anthropic.RateLimitError = real_anthropic.RateLimitError
+                mock_anthropic.InternalServerError = real_anthropic.InternalServerError
+                mock_anthropic.AuthenticationError = real_anthropic.AuthenticationError
+                mock_anthropic.BadRequestError = real_anthropic.BadRequestError
+                mock_anthropic.APIStatusError = real_anthropic.APIStatusError
+                mock_anthropic.APIError = real_anthropic.APIError
+                mock_anthropic.Anthropic.return_value = mock_client
+                with patch("ai_processor.time.sleep") as sleep:
+                    with pytest.raises(RuntimeError, match="重試 1 次後仍然失敗"):
+                        ai_processor.process_single_article("text", "fake-key")
+
+        assert mock_client.messages.create.call_count == 1
+        sleep.assert_not_called()
+
 
 # ============================================================
 # 批次處理
@@ -616,8 +800,41 @@ class TestProcessArticleBatch:
                 cancel_event=cancel_event,
             )
 
-        # 立即取消，不應該處理任何文章
+        # 立即取消，不應該處理任何文章；未開始的文章以 cancelled 列出
         assert result["success"] == 0
+        assert result["cancelled"] == 5
+        assert [r["status"] for r in result["results"]] == ["cancelled"] * 5
+
+    def test_cancel_midway_reports_unstarted(self, tmp_path):
+        """處理中途取消：已完成的保留，未開始的以 cancelled 回報，總數與輸入相同"""
+        articles = [
+            self._create_article_dir(str(tmp_path), f"article{i}")
+            for i in range(4)
+        ]
+        cancel_event = threading.Event()
+        mock_result = {
+            "category": "內科", "subcategory": "",
+            "tags": [], "summary": "Test",
+            "key_points": [], "clinical_relevance": "",
+        }
+
+        def _process(*args, **kwargs):
+            cancel_event.set()  # 第一篇完成後取消
+            return mock_result
+
+        reported = []
+        with patch.object(ai_processor, "process_single_article", side_effect=_process):
+            result = ai_processor.process_article_batch(
+                articles, "fake-key", api_delay=0, concurrency=1,
+                cancel_event=cancel_event, on_result=reported.append,
+            )
+
+        assert result["success"] == 1
+        assert result["cancelled"] == 3
+        assert result["success"] + result["failed"] + result["cancelled"] == len(articles)
+        assert [r["status"] for r in result["results"]] == ["success"] + ["cancelled"] * 3
+        assert [r["path"] for r in result["results"]] == [a["path"] for a in articles]
+        assert sorted(r["status"] for r in reported) == ["cancelled"] * 3 + ["success"]
 
     def test_updates_frontmatter(self, tmp_path):
         """處理後 frontmatter 已更新"""
@@ -677,6 +894,35 @@ class TestProcessArticleBatch:
         assert "ai_processed_at" in meta
         assert "ai_model" in meta
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_metadata_json_format_with_and_without_orjson(
+        self, tmp_path, monkeypatch, use_orjson,
+    ):
+        """有無 orjson 寫出的 metadata.json 格式相同"""
+        if use_orjson and ai_processor.orjson is None:
+            pytest.skip("orjson 未安裝")
+        if not use_orjson:
+            monkeypatch.setattr(ai_processor, "orjson", None)
+        articles = [self._create_article_dir(str(tmp_path), "文章")]
+        mock_result = {
+            "category": "內科", "subcategory": "",
+            "tags": ["貓"], "summary": "摘要",
+            "key_points": [], "clinical_relevance": "",
+        }
+
+        with patch.object(ai_processor, "process_single_article",
+                          return_value=mock_result):
+            ai_processor.process_article_batch(
+                articles, "fake-key", api_delay=0,
+            )
+
+        meta_path = os.path.join(articles[0]["path"], "metadata.json")
+        with open(meta_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        meta = json.loads(text)
+        assert text == json.dumps(meta, ensure_ascii=False, indent=2) + "\n"
+        assert meta["tags"] == ["貓"]
+
     def test_handles_api_failure(self, tmp_path):
         """API 失敗時記錄錯誤並繼續"""
         articles = [
@@ -686,7 +932,8 @@ class TestProcessArticleBatch:
 
         call_count = 0
 
-        def mock_process(text, key, model=None, max_tokens=None, title=""):
+        def mock_process(text, key, model=None, max_tokens=None, title="",
+                         client=None):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -734,3 +981,168 @@ class TestProcessArticleBatch:
         # 應該有 2 次處理 + 1 次完成通知
         assert len(progress_calls) == 3
         assert progress_calls[-1][2] == "AI 處理完成"
+
+    def test_articles_processed_concurrently(self, tmp_path):
+        """concurrency > 1 時多篇文章的 API 呼叫同時進行，結果仍依輸入順序"""
+        articles = [
+            self._create_article_dir(str(tmp_path), f"article{i}")
+            for i in range(3)
+        ]
+        # 三個呼叫必須同時在途才能通過 barrier，序列處理會逾時
+        barrier = threading.Barrier(3, timeout=5)
+
+        def mock_process(text, key, model=None, max_tokens=None, title="",
+                         client=None):
+            barrier.wait()
+            return {
+                "category": "其他", "subcategory": "",
+                "tags": [], "summary": "OK",
+                "key_points": [], "clinical_relevance": "",
+            }
+
+        with patch.object(ai_processor, "process_single_article",
+                          side_effect=mock_process):
+            result = ai_processor.process_article_batch(
+                articles, "fake-key", api_delay=0, concurrency=3,
+            )
+
+        assert result["success"] == 3
+        assert [r["title"] for r in result["results"]] == [
+            "article0", "article1", "article2",
+        ]
+
+    def test_groups_short_articles(self, tmp_path):
+        """group_size > 1 時短文章合併成一次呼叫"""
+        articles = [
+            self._create_article_dir(str(tmp_path), f"article{i}")
+            for i in range(3)
+        ]
+        group_results = [{
+            "category": f"類別{i}", "subcategory": "",
+            "tags": [], "summary": "S",
+            "key_points": [], "clinical_relevance": "",
+        } for i in range(3)]
+
+        with patch.object(ai_processor, "process_article_group",
+                          return_value=group_results) as group_call, \
+             patch.object(ai_processor, "process_single_article") as single_call:
+            result = ai_processor.process_article_batch(
+                articles, "fake-key", api_delay=0, group_size=3,
+            )
+
+        assert result["success"] == 3
+        assert group_call.call_count == 1
+        single_call.assert_not_called()
+        assert [r["category"] for r in result["results"]] == ["類別0", "類別1", "類別2"]
+
+    def test_group_failure_falls_back_to_single(self, tmp_path):
+        """合併呼叫失敗時逐篇處理"""
+        articles = [
+            self._create_article_dir(str(tmp_path), f"article{i}")
+            for i in range(2)
+        ]
+        mock_result = {
+            "category": "其他", "subcategory": "",
+            "tags": [], "summary": "Test",
+            "key_points": [], "clinical_relevance": "",
+        }
+
+        with patch.object(ai_processor, "process_article_group",
+                          side_effect=RuntimeError("陣列長度不符")), \
+             patch.object(ai_processor, "process_single_article",
+                          return_value=mock_result) as single_call:
+            result = ai_processor.process_article_batch(
+                articles, "fake-key", api_delay=0, group_size=2,
+            )
+
+        assert result["success"] == 2
+        assert single_call.call_count == 2
+
+    def test_group_fallback_waits_before_every_article(self, tmp_path):
+        """合併呼叫失敗後，逐篇處理的第一篇也要等 api_delay"""
+        articles = [
+            self._create_article_dir(str(tmp_path), f"article{i}")
+            for i in range(2)
+        ]
+        clock = [0.0]
+        call_times = []
+
+        def single(*args, **kwargs):
+            call_times.append(clock[0])
+            return {"category": "其他", "subcategory": "", "tags": [], "summary": "Test",
+                    "key_points": [], "clinical_relevance": ""}
+
+        def group(*args, **kwargs):
+            call_times.append(clock[0])
+            raise RuntimeError("429")
+
+        with patch.object(ai_processor, "process_article_group", side_effect=group), \
+             patch.object(ai_processor, "process_single_article", side_effect=single), \
+             patch("ai_processor.time.monotonic", side_effect=lambda: clock[0]), \
+             patch("ai_processor.time.sleep",
+                   side_effect=lambda d: clock.__setitem__(0, clock[0] + d)):
+            ai_processor.process_article_batch(
+                articles, "fake-key", api_delay=2, group_size=2,
+            )
+
+        assert call_times == [0.0, 2.0, 4.0]
+
+    def test_pack_groups(self):
+        """依篇數與字數上限貪婪分組，過長的文章單獨一組"""
+        budget = ai_processor.GROUP_CHAR_BUDGET
+        articles = [
+            {"char_count": 100}, {"char_count": 100}, {"char_count": 100},
+            {"char_count": budget + 1},
+            {"char_count": budget - 50}, {"char_count": 100},
+        ]
+        assert ai_processor._pack_groups(articles, 2) == [[0, 1], [2], [3], [4], [5]]
+        assert ai_processor._pack_groups(articles, 1) == [[i] for i in range(6)]
+
+    def test_shares_one_client(self, tmp_path):
+        """整批只建立一個 anthropic client，並在結束時關閉"""
+        articles = [
+            self._create_article_dir(str(tmp_path), f"article{i}")
+            for i in range(3)
+        ]
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text=json.dumps({
+            "category": "其他", "subcategory": "",
+            "tags": [], "summary": "OK",
+            "key_points": [], "clinical_relevance": "",
+        }))]
+        mock_client = MagicMock()
+        mock_client.messages.create.return_value = mock_response
+
+        with patch.object(ai_processor, "HAS_ANTHROPIC", True):
+            with patch("ai_processor.anthropic") as mock_anthropic:
+                mock_anthropic.Anthropic.return_value = mock_client
+                result = ai_processor.process_article_batch(
+                    articles, "fake-key", api_delay=0,
+                )
+
+        assert result["success"] == 3
+        assert mock_anthropic.Anthropic.call_count == 1
+        assert mock_client.messages.create.call_count == 3
+        mock_client.close.assert_called_once()
+
+    def test_on_result_called_per_article(self, tmp_path):
+        """on_result 每完成一篇呼叫一次，並帶有平台資訊"""
+        articles = [
+            self._create_article_dir(str(tmp_path), "article1"),
+            self._create_article_dir(str(tmp_path), "article2"),
+        ]
+        mock_result = {
+            "category": "其他", "subcategory": "",
+            "tags": [], "summary": "Test",
+            "key_points": [], "clinical_relevance": "",
+        }
+        records = []
+
+        with patch.object(ai_processor, "process_single_article",
+                          return_value=mock_result):
+            ai_processor.process_article_batch(
+                articles, "fake-key", api_delay=0, on_result=records.append,
+            )
+
+        assert sorted(r["title"] for r in records) == ["article1", "article2"]
+        assert all(r["platform"] == "Test" for r in records)
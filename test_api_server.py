@@ -0,0 +1,61 @@
+"""
+api_server.py 單元測試
+=======================
+以真實的本機 HTTP 連線測試 POST /save 的請求驗證。
+"""
+
+import http.client
+import json
+import threading
+from http.server import HTTPServer
+
+import pytest
+
+from gui.workers.api_server import _CORSRequestHandler
+
+
+@pytest.fixture
+def server(tmp_path):
+    """在隨機 port 啟動 handler，回傳 port"""
+    _CORSRequestHandler._output_dir = str(tmp_path)
+    _CORSRequestHandler._log_queue = None
+    httpd = HTTPServer(("127.0.0.1", 0), _CORSRequestHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _post_save(port, content_length, body=b""):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.putrequest("POST", "/save")
+        conn.putheader("Content-Type", "application/json")
+        conn.putheader("Content-Length", content_length)
+        conn.endheaders(body)
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+# ============================================================
+# Content-Length 驗證
+# ============================================================
+
+class TestSaveContentLength:
+    def test_non_integer_rejected(self, server):
+        status, data = _post_save(server, "abc")
+        assert status == 400
+        assert data["message"] == "Invalid Content-Length"
+
+    def test_negative_rejected(self, server):
+        status, data = _post_save(server, "-5")
+        assert status == 400
+        assert data["message"] == "Invalid Content-Length"
+
+    def test_zero_is_empty_body(self, server):
+        status, data = _post_save(server, "0")
+        assert status == 400
+        assert data["message"] == "Empty request body"
@@ -4,10 +4,13 @@ scraper.py 單元測試
 使用 mock 避免真實網路請求，測試所有核心邏輯。
 """
 
+import concurrent.futures
+import io
 import json
 import os
 import sys
 import subprocess
+import time
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -75,6 +78,40 @@ class TestIdentifyPlatform:
         r = scraper.identify_platform("https://www.xiaohongshu.com/explore/abc")
         assert r["strategy"] == "playwright"
 
+    def test_blog_label_prefix(self):
+        r = scraper.identify_platform("https://blog.example.com/post/1")
+        assert r["name"] == "部落格"
+
+    def test_port_ignored_for_matching(self):
+        r = scraper.identify_platform("https://www.ptt.cc:443/bbs/dog/index.html")
+        assert r["name"] == "PTT"
+        assert r["domain"] == "www.ptt.cc:443"
+
+    def test_lookalike_domain_not_matched(self):
+        """關鍵字只比對網域後綴，不會誤判相似網域"""
+        r = scraper.identify_platform("https://notfacebook.com/page")
+        assert r["name"] == "其他"
+
+    def test_same_host_matched_once(self):
+        scraper._identify_by_domain.cache_clear()
+        scraper.identify_platform("https://www.ptt.cc/bbs/dog/M.1.html")
+        r = scraper.identify_platform("https://www.ptt.cc/bbs/cat/M.2.html")
+        assert r["name"] == "PTT"
+        assert scraper._identify_by_domain.cache_info().hits == 1
+
+    def test_host_variants_matched_once(self):
+        """大小寫、連接埠不同的同一主機只比對一次規則表"""
+        scraper._identify_by_domain.cache_clear()
+        urls = ["https://Medium.com/a", "https://medium.com:443/b", "http://MEDIUM.COM/c"]
+        with patch("scraper._match_platform_rule", wraps=scraper._match_platform_rule) as match:
+            names = {scraper.identify_platform(u)["name"] for u in urls}
+        assert names == {"Medium"}
+        assert match.call_count == 1
+
+    def test_returned_dict_is_independent(self):
+        scraper.identify_platform("https://medium.com/a")["name"] = "x"
+        assert scraper.identify_platform("https://medium.com/b")["name"] == "Medium"
+
 
 # ============================================================
 # robots.txt 檢查
@@ -103,6 +140,106 @@ class TestRobotsTxt:
         with patch("scraper._get_robots_parser", side_effect=Exception("parse error")):
             assert scraper.is_allowed_by_robots("https://example.com/page") is True
 
+    def test_host_case_shares_cache_key(self):
+        """主機名稱大小寫不同仍使用同一個 robots.txt 快取項目"""
+        with patch("scraper._get_robots_parser", return_value=None) as get_parser:
+            scraper.is_allowed_by_robots("https://Example.COM/a")
+            scraper.is_allowed_by_robots("https://example.com/b")
+        assert {c.args[0] for c in get_parser.call_args_list} == {"https://example.com"}
+
+
+class TestRobotsDiskCache:
+    ROBOTS = "User-agent: *\nDisallow: /admin\n"
+
+    @pytest.fixture(autouse=True)
+    def _isolate(self, tmp_path, monkeypatch):
+        import paths
+        monkeypatch.setattr(paths, "get_app_dir", lambda: tmp_path)
+        scraper._ROBOTS_MEMO.clear()
+        yield
+        scraper._ROBOTS_MEMO.clear()
+
+    def _resp(self, status=200, body=ROBOTS):
+        resp = MagicMock()
+        resp.status_code = status
+        resp.content = body.encode()
+        return resp
+
+    def test_fetch_writes_disk_cache(self):
+        with patch("scraper._SESSION.get", return_value=self._resp()) as mock_get:
+            parser = scraper._get_robots_parser("https://example.com")
+        assert mock_get.call_count == 1
+        assert parser.can_fetch("*", "https://example.com/admin") is False
+        assert scraper._robots_cache_path("https://example.com").exists()
+
+    def test_cache_not_written_to_output_dir(self, tmp_path, monkeypatch):
+        out = tmp_path / "articles"
+        monkeypatch.setattr(scraper, "DEFAULT_OUTPUT_DIR", str(out))
+        with patch("scraper._SESSION.get", return_value=self._resp()):
+            scraper._get_robots_parser("https://example.com")
+        assert scraper._robots_cache_path("https://example.com").parent == tmp_path / scraper.ROBOTS_CACHE_DIR
+        assert not out.exists()
+
+    def test_fresh_disk_cache_skips_fetch(self):
+        with patch("scraper._SESSION.get", return_value=self._resp()):
+            scraper._get_robots_parser("https://example.com")
+        scraper._ROBOTS_MEMO.clear()  # 模擬下次執行
+        with patch("scraper._SESSION.get") as mock_get:
+            parser = scraper._get_robots_parser("https://example.com")
+        mock_get.assert_not_called()
+        assert parser.can_fetch("*", "https://example.com/admin") is False
+
+    def test_expired_disk_cache_refetches(self):
+        path = scraper._robots_cache_path("https://example.com")
+        path.parent.mkdir(parents=True)
+        path.write_text("", encoding="utf-8")
+        old = time.time() - scraper.ROBOTS_CACHE_TTL - 10
+        os.utime(path, (old, old))
+        with patch("scraper._SESSION.get", return_value=self._resp()) as mock_get:
+            parser = scraper._get_robots_parser("https://example.com")
+        assert mock_get.call_count == 1
+        assert parser.can_fetch("*", "https://example.com/admin") is False
+
+    def test_missing_robots_allows_all(self):
+        with patch("scraper._SESSION.get", return_value=self._resp(status=404, body="")):
+            parser = scraper._get_robots_parser("https://example.com")
+        assert parser.can_fetch("*", "https://example.com/admin") is True
+
+    def test_network_error_not_cached(self):
+        import requests as req
+        with patch("scraper._SESSION.get", side_effect=req.exceptions.ConnectionError("x")):
+            assert scraper._get_robots_parser("https://example.com") is None
+        assert not scraper._robots_cache_path("https://example.com").exists()
+
+    def test_memo_reused_until_expiry(self, monkeypatch):
+        with patch("scraper._SESSION.get", return_value=self._resp()) as mock_get:
+            first = scraper._get_robots_parser("https://example.com")
+            assert scraper._get_robots_parser("https://example.com") is first
+        assert mock_get.call_count == 1
+        # 行程內快取到期後重新讀取（磁碟快取仍有效，不必連網）
+        monkeypatch.setattr(scraper, "ROBOTS_CACHE_TTL", -1)
+        scraper._ROBOTS_MEMO.clear()
+        with patch("scraper._SESSION.get", return_value=self._resp()):
+            scraper._get_robots_parser("https://example.com")
+        with patch("scraper._SESSION.get", return_value=self._resp()) as mock_get:
+            assert scraper._get_robots_parser("https://example.com") is not first
+        assert mock_get.call_count == 1
+
+    def test_failure_retried_after_short_delay(self, monkeypatch):
+        import requests as req
+        with patch("scraper._SESSION.get", side_effect=req.exceptions.ConnectionError("x")):
+            assert scraper._get_robots_parser("https://example.com") is None
+        with patch("scraper._SESSION.get") as mock_get:
+            assert scraper._get_robots_parser("https://example.com") is None
+        mock_get.assert_not_called()
+        monkeypatch.setattr(scraper, "ROBOTS_RETRY_AFTER", -1)
+        scraper._ROBOTS_MEMO.clear()
+        with patch("scraper._SESSION.get", side_effect=req.exceptions.ConnectionError("x")):
+            scraper._get_robots_parser("https://example.com")
+        with patch("scraper._SESSION.get", return_value=self._resp()) as mock_get:
+            assert scraper._get_robots_parser("https://example.com") is not None
+        assert mock_get.call_count == 1
+
 
 # ============================================================
 # 重試機制
@@ -132,12 +269,40 @@ class TestRetryFetch:
     def test_exponential_backoff_delays(self):
         func = MagicMock(return_value=None)
         with patch("time.sleep") as mock_sleep:
-            scraper.retry_fetch(func, "https://example.com", max_retries=3)
+            scraper.retry_fetch(func, "https://example.com", max_retries=3, jitter=False)
         # 預期延遲: 2*2^0=2, 2*2^1=4 (第三次失敗後不再 sleep)
         assert mock_sleep.call_count == 2
         mock_sleep.assert_any_call(2)
         mock_sleep.assert_any_call(4)
 
+    def test_jittered_delays_within_backoff(self):
+        """full jitter：每次等待介於 0 與對應的指數退避值之間"""
+        func = MagicMock(return_value=None)
+        with patch("time.sleep") as mock_sleep, \
+             patch("scraper.random.uniform", side_effect=lambda a, b: b / 2) as uniform:
+            scraper.retry_fetch(func, "https://example.com", max_retries=3)
+        assert [c.args for c in uniform.call_args_list] == [(0, 2), (0, 4)]
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2]
+
+    def test_delay_capped_by_max_delay(self, monkeypatch):
+        monkeypatch.setattr(scraper, "RETRY_MAX_DELAY", 3)
+        func = MagicMock(return_value=None)
+        with patch("time.sleep") as mock_sleep:
+            scraper.retry_fetch(func, "https://example.com", max_retries=4, jitter=False)
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [2, 3, 3]
+
+    def test_gives_up_when_next_wait_exceeds_budget(self):
+        """max_total=5：等 2 秒後還剩約 3 秒，下一次要等 4 秒就放棄"""
+        func = MagicMock(return_value=None)
+        clock = [100.0]
+        with patch("time.monotonic", side_effect=lambda: clock[0]), \
+             patch("time.sleep", side_effect=lambda d: clock.__setitem__(0, clock[0] + d)) as mock_sleep:
+            result = scraper.retry_fetch(func, "https://example.com", max_retries=4,
+                                         jitter=False, max_total=5)
+        assert result is None
+        assert func.call_count == 2
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [2]
+
 
 # ============================================================
 # 去重機制
@@ -163,12 +328,54 @@ class TestDedup:
         for u in urls:
             assert scraper.is_already_fetched(u, str(tmp_path)) is True
 
-    def test_dedup_file_persists(self, tmp_path):
+    def test_mark_appends_to_journal(self, tmp_path):
+        """mark_as_fetched 只追加 journal，不重寫 JSON"""
+        scraper.mark_as_fetched("https://a.com/1", str(tmp_path))
+        scraper.mark_as_fetched("https://a.com/2", str(tmp_path))
+        scraper.mark_as_fetched("https://a.com/1", str(tmp_path))
+        journal = tmp_path / scraper.DEDUP_JOURNAL
+        assert journal.read_text(encoding="utf-8").splitlines() == [
+            "https://a.com/1", "https://a.com/2"]
+        assert not (tmp_path / scraper.DEDUP_FILE).exists()
+
+    def test_bulk_mark_appends_once(self, tmp_path):
+        scraper.mark_as_fetched("https://a.com/1", str(tmp_path))
+        added = scraper.mark_as_fetched_bulk(
+            ["https://a.com/1", "https://a.com/2", "https://a.com/2", "https://a.com/3"],
+            str(tmp_path))
+        assert added == 2
+        journal = tmp_path / scraper.DEDUP_JOURNAL
+        assert journal.read_text(encoding="utf-8").splitlines() == [
+            "https://a.com/1", "https://a.com/2", "https://a.com/3"]
+
+    def test_journal_survives_cache_reset(self, tmp_path):
         scraper.mark_as_fetched("https://test.com", str(tmp_path))
-        dedup_file = tmp_path / scraper.DEDUP_FILE
-        assert dedup_file.exists()
-        data = json.loads(dedup_file.read_text(encoding="utf-8"))
-        assert "https://test.com" in data
+        scraper._DEDUP_CACHE.clear()
+        assert scraper.is_already_fetched("https://test.com", str(tmp_path)) is True
+
+    def test_journal_compacted_into_json(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(scraper, "DEDUP_JOURNAL_MAX_BYTES", 20)
+        scraper._save_dedup_record(str(tmp_path), {"https://a.com/0"})
+        scraper.mark_as_fetched("https://a.com/1", str(tmp_path))
+        scraper.mark_as_fetched("https://a.com/2", str(tmp_path))
+        assert not (tmp_path / scraper.DEDUP_JOURNAL).exists()
+        data = json.loads((tmp_path / scraper.DEDUP_FILE).read_text(encoding="utf-8"))
+        assert data == ["https://a.com/0", "https://a.com/1", "https://a.com/2"]
+
+    def test_url_forms_share_one_key(self, tmp_path):
+        """主機大小寫、預設埠號、#fragment 不同的同一 URL 視為已下載"""
+        scraper.mark_as_fetched("https://Example.com:443/a#top", str(tmp_path))
+        assert scraper.is_already_fetched("https://example.com/a", str(tmp_path)) is True
+        assert (tmp_path / scraper.DEDUP_JOURNAL).read_text(encoding="utf-8") == "https://example.com/a\n"
+
+    def test_legacy_raw_records_still_match(self, tmp_path):
+        """舊版以原始形式存下的 URL，讀取時正規化後仍可比對"""
+        (tmp_path / scraper.DEDUP_FILE).write_text(
+            json.dumps(["HTTPS://Example.com/a#frag", "https://b.com"]), encoding="utf-8")
+        assert scraper.is_already_fetched("https://example.com/a", str(tmp_path)) is True
+        assert scraper.is_already_fetched("https://b.com/", str(tmp_path)) is True
+        with scraper.DedupStore(str(tmp_path)) as store:
+            assert "https://example.com/a#other" in store
 
     def test_corrupted_dedup_file(self, tmp_path):
         """損壞的 dedup 檔案不應 crash"""
@@ -176,6 +383,93 @@ class TestDedup:
         dedup_file.write_text("NOT JSON", encoding="utf-8")
         assert scraper.is_already_fetched("https://test.com", str(tmp_path)) is False
 
+    def test_unchanged_file_not_reparsed(self, tmp_path):
+        scraper.mark_as_fetched("https://a.com/1", str(tmp_path))
+        with patch("scraper.json.loads") as mock_loads, \
+             patch.object(scraper, "orjson", None):
+            assert scraper.is_already_fetched("https://a.com/1", str(tmp_path)) is True
+        mock_loads.assert_not_called()
+
+    def test_external_change_invalidates_cache(self, tmp_path):
+        scraper._save_dedup_record(str(tmp_path), {"https://a.com/1"})
+        dedup_file = tmp_path / scraper.DEDUP_FILE
+        dedup_file.write_text(json.dumps(["https://b.com/2"]), encoding="utf-8")
+        assert scraper.is_already_fetched("https://b.com/2", str(tmp_path)) is True
+        assert scraper.is_already_fetched("https://a.com/1", str(tmp_path)) is False
+
+    def test_loaded_set_is_a_copy(self, tmp_path):
+        scraper.mark_as_fetched("https://a.com/1", str(tmp_path))
+        scraper._load_dedup_record(str(tmp_path)).add("https://b.com/2")
+        assert scraper.is_already_fetched("https://b.com/2", str(tmp_path)) is False
+
+    def test_save_is_atomic(self, tmp_path):
+        """寫入失敗時保留原本的記錄，也不留下暫存檔"""
+        scraper._save_dedup_record(str(tmp_path), {"https://a.com/1"})
+        with patch("scraper.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                scraper._save_dedup_record(str(tmp_path), {"https://b.com/2"})
+        data = json.loads((tmp_path / scraper.DEDUP_FILE).read_text(encoding="utf-8"))
+        assert data == ["https://a.com/1"]
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_round_trip_with_and_without_orjson(self, tmp_path, monkeypatch, use_orjson):
+        if use_orjson and scraper.orjson is None:
+            pytest.skip("orjson 未安裝")
+        if not use_orjson:
+            monkeypatch.setattr(scraper, "orjson", None)
+        urls = {"https://b.com/文章", "https://a.com/1"}
+        scraper._save_dedup_record(str(tmp_path), urls)
+        data = json.loads((tmp_path / scraper.DEDUP_FILE).read_text(encoding="utf-8"))
+        assert data == sorted(urls)
+        assert scraper._load_dedup_record(str(tmp_path)) == urls
+
+    def test_dumps_json_matches_stdlib_format(self):
+        if scraper.orjson is None:
+            pytest.skip("orjson 未安裝")
+        obj = {"success": [{"url": "https://a.com/文章", "path": "/tmp/x"}], "failed": []}
+        assert scraper._dumps_json(obj) == json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+class TestDedupStore:
+    def test_loads_existing_record(self, tmp_path):
+        scraper.mark_as_fetched("https://a.com/1", str(tmp_path))
+        store = scraper.DedupStore(str(tmp_path))
+        assert "https://a.com/1" in store
+        assert "https://b.com/2" not in store
+
+    def test_add_deferred_until_flush(self, tmp_path):
+        store = scraper.DedupStore(str(tmp_path), checkpoint_every=100)
+        store.add("https://a.com/1")
+        assert scraper.is_already_fetched("https://a.com/1", str(tmp_path)) is False
+        store.flush()
+        assert scraper.is_already_fetched("https://a.com/1", str(tmp_path)) is True
+
+    def test_checkpoint_writes_periodically(self, tmp_path):
+        store = scraper.DedupStore(str(tmp_path), checkpoint_every=2)
+        store.add("https://a.com/1")
+        store.add("https://a.com/2")
+        assert scraper.is_already_fetched("https://a.com/2", str(tmp_path)) is True
+        # checkpoint 只追加 journal，不重寫 JSON
+        assert (tmp_path / scraper.DEDUP_JOURNAL).exists()
+        assert not (tmp_path / scraper.DEDUP_FILE).exists()
+
+    def test_context_manager_flushes(self, tmp_path):
+        with scraper.DedupStore(str(tmp_path), checkpoint_every=1) as store:
+            store.add("https://a.com/1")
+        data = json.loads((tmp_path / scraper.DEDUP_FILE).read_text(encoding="utf-8"))
+        assert data == ["https://a.com/1"]
+        assert not (tmp_path / scraper.DEDUP_JOURNAL).exists()
+
+    def test_flush_merges_concurrent_writes(self, tmp_path):
+        """flush 不應覆蓋其他地方在期間寫入的記錄"""
+        store = scraper.DedupStore(str(tmp_path))
+        scraper.mark_as_fetched("https://other.com/1", str(tmp_path))
+        store.add("https://a.com/1")
+        store.flush()
+        assert scraper.is_already_fetched("https://other.com/1", str(tmp_path)) is True
+        assert scraper.is_already_fetched("https://a.com/1", str(tmp_path)) is True
+
 
 # ============================================================
 # YAML 安全轉義
@@ -204,12 +498,18 @@ class TestYamlSafe:
 # ============================================================
 
 class TestFetchWithJina:
+    @pytest.fixture(autouse=True)
+    def _reset_jina_bucket(self):
+        scraper._JINA_BUCKET = None
+        yield
+        scraper._JINA_BUCKET = None
+
     def test_success(self):
         mock_resp = MagicMock()
         mock_resp.text = "Title: Test Article\n\n# Test\n\nSome content here that is long enough to pass validation. " * 5
         mock_resp.raise_for_status = MagicMock()
 
-        with patch("requests.get", return_value=mock_resp):
+        with patch("scraper._SESSION.get", return_value=mock_resp):
             result = scraper.fetch_with_jina("https://example.com/article")
         assert result is not None
         assert result["title"] == "Test Article"
@@ -220,13 +520,13 @@ class TestFetchWithJina:
         mock_resp.text = "short"
         mock_resp.raise_for_status = MagicMock()
 
-        with patch("requests.get", return_value=mock_resp):
+        with patch("scraper._SESSION.get", return_value=mock_resp):
             result = scraper.fetch_with_jina("https://example.com/article")
         assert result is None
 
     def test_network_error(self):
         import requests as req
-        with patch("requests.get", side_effect=req.exceptions.ConnectionError("timeout")):
+        with patch("scraper._SESSION.get", side_effect=req.exceptions.ConnectionError("timeout")):
             result = scraper.fetch_with_jina("https://example.com/article")
         assert result is None
 
@@ -235,12 +535,27 @@ class TestFetchWithJina:
         mock_resp.text = "Title: Test\n\n" + "content " * 50
         mock_resp.raise_for_status = MagicMock()
 
-        with patch("requests.get", return_value=mock_resp) as mock_get, \
+        with patch("scraper._SESSION.get", return_value=mock_resp) as mock_get, \
              patch.object(scraper, "JINA_API_KEY", "test-key-123"):
             scraper.fetch_with_jina("https://example.com")
             call_headers = mock_get.call_args[1].get("headers") or mock_get.call_args[0][1] if len(mock_get.call_args[0]) > 1 else mock_get.call_args[1]["headers"]
             assert call_headers.get("Authorization") == "Bearer test-key-123"
 
+    def test_shared_rate_limit_across_sites(self, monkeypatch):
+        """不同網站的 Jina 請求共用同一個權杖桶，超過 JINA_BURST 後開始等待"""
+        monkeypatch.setattr(scraper, "JINA_API_KEY", "")
+        with patch("scraper._SESSION.get", side_effect=scraper.requests.exceptions.ConnectionError()), \
+             patch("time.sleep") as mock_sleep:
+            for i in range(scraper.JINA_BURST + 1):
+                scraper.fetch_with_jina(f"https://site{i}.example.com/a")
+        assert mock_sleep.call_count == 1
+        assert mock_sleep.call_args.args[0] == pytest.approx(60 / scraper.JINA_RATE_PER_MIN, rel=0.1)
+
+    def test_api_key_raises_rate(self, monkeypatch):
+        monkeypatch.setattr(scraper, "JINA_API_KEY", "k")
+        scraper._wait_for_jina()
+        assert scraper._JINA_BUCKET.rate == scraper.JINA_RATE_PER_MIN_WITH_KEY / 60
+
 
 # ============================================================
 # Jina 標題提取
@@ -260,47 +575,90 @@ class TestExtractTitleFromJina:
         content = "Title: From Title\n# From H1\ncontent"
         assert scraper._extract_title_from_jina(content) == "From Title"
 
+    def test_only_first_five_lines_checked(self):
+        content = "a\nb\nc\nd\n# Fifth\n# Sixth\n" + "x\n" * 1000
+        assert scraper._extract_title_from_jina(content) == "Fifth"
+        assert scraper._extract_title_from_jina("a\nb\nc\nd\ne\n# Sixth") == "未命名文章"
+
+    def test_body_never_split(self):
+        """只切開前 5 行：整篇內容不應被 split / splitlines"""
+        class NoSplit(str):
+            def split(self, *args, **kwargs):
+                raise AssertionError("split over whole content")
+
+            def splitlines(self, *args, **kwargs):
+                raise AssertionError("splitlines over whole content")
+
+        content = NoSplit("Title: T\n" + "x\n" * 10000)
+        assert scraper._extract_title_from_jina(content) == "T"
+
 
 # ============================================================
 # BeautifulSoup 策略
 # ============================================================
 
 class TestFetchWithBs4:
-    def _make_response(self, html, encoding="utf-8"):
+    def _make_response(self, html, encoding="utf-8", content_type="text/html"):
         mock_resp = MagicMock()
         mock_resp.text = html
-        mock_resp.apparent_encoding = encoding
+        mock_resp.content = html.encode("utf-8")
+        mock_resp.encoding = encoding
+        mock_resp.headers = {"Content-Type": content_type}
         mock_resp.raise_for_status = MagicMock()
         return mock_resp
 
     def test_success_with_article_tag(self):
         html = "<html><head><title>Test</title></head><body><article><p>This is a long enough article content for testing purposes and validation.</p></article></body></html>"
-        with patch("requests.get", return_value=self._make_response(html)):
+        with patch("scraper._SESSION.get", return_value=self._make_response(html)):
             result = scraper.fetch_with_bs4("https://example.com/page")
         assert result is not None
         assert result["source"] == "bs4"
 
     def test_content_too_short(self):
         html = "<html><body><article><p>Hi</p></article></body></html>"
-        with patch("requests.get", return_value=self._make_response(html)):
+        with patch("scraper._SESSION.get", return_value=self._make_response(html)):
             result = scraper.fetch_with_bs4("https://example.com/page")
         assert result is None
 
     def test_encoding_none_fallback(self):
         html = "<html><head><title>Test</title></head><body><article><p>Content that is definitely long enough for testing.</p></article></body></html>"
-        with patch("requests.get", return_value=self._make_response(html, encoding=None)):
+        with patch("scraper._SESSION.get", return_value=self._make_response(html, encoding=None)):
             result = scraper.fetch_with_bs4("https://example.com/page")
         assert result is not None
 
+    def test_header_encoding_used(self):
+        resp = self._make_response('<meta charset="big5">', encoding="cp950")
+        assert scraper._detect_encoding(resp) == "cp950"
+
+    def test_meta_charset_when_header_missing(self):
+        resp = self._make_response('<html><head><meta charset="big5"></head>', encoding=None)
+        assert scraper._detect_encoding(resp) == "big5"
+
+    def test_meta_http_equiv_overrides_default_latin1(self):
+        """header 未給 charset 時 requests 預設 ISO-8859-1，應改看 meta"""
+        html = '<meta http-equiv="Content-Type" content="text/html; charset=Shift_JIS">'
+        resp = self._make_response(html, encoding="ISO-8859-1")
+        assert scraper._detect_encoding(resp) == "Shift_JIS"
+
+    def test_explicit_latin1_header_kept(self):
+        """header 明確寫 charset=ISO-8859-1 時照用，不改看 meta"""
+        resp = self._make_response('<meta charset="utf-8">', encoding="ISO-8859-1",
+                                   content_type="text/html; Charset=ISO-8859-1")
+        assert scraper._detect_encoding(resp) == "ISO-8859-1"
+
+    def test_utf8_when_nothing_declared(self):
+        resp = self._make_response("<html><body>x</body></html>", encoding=None)
+        assert scraper._detect_encoding(resp) == "utf-8"
+
     def test_network_error(self):
         import requests as req
-        with patch("requests.get", side_effect=req.exceptions.ConnectionError("connection refused")):
+        with patch("scraper._SESSION.get", side_effect=req.exceptions.ConnectionError("connection refused")):
             result = scraper.fetch_with_bs4("https://example.com/page")
         assert result is None
 
     def test_extracts_h1_title(self):
         html = "<html><head><title>Page Title</title></head><body><h1>H1 Title</h1><article><p>This article content is definitely long enough to pass the fifty character minimum validation threshold for the BeautifulSoup extraction strategy.</p></article></body></html>"
-        with patch("requests.get", return_value=self._make_response(html)):
+        with patch("scraper._SESSION.get", return_value=self._make_response(html)):
             result = scraper.fetch_with_bs4("https://example.com/page")
         assert result is not None
         assert result["title"] == "H1 Title"
@@ -311,6 +669,12 @@ class TestFetchWithBs4:
 # ============================================================
 
 class TestFetchArticle:
+    @pytest.fixture(autouse=True)
+    def _reset_host_timer(self):
+        scraper._HOST_BUCKETS.clear()
+        yield
+        scraper._HOST_BUCKETS.clear()
+
     def test_skip_platform(self):
         result = scraper.fetch_article("https://www.facebook.com/post/123")
         assert result is None
@@ -342,6 +706,94 @@ class TestFetchArticle:
             result = scraper.fetch_article("https://example.com/page")
         assert result is None
 
+    @pytest.mark.parametrize("budget, expected", [(120, 120), (0, None)])
+    def test_retry_budget_from_config(self, monkeypatch, budget, expected):
+        monkeypatch.setattr(scraper, "RETRY_MAX_TOTAL", budget)
+        with patch("scraper.is_allowed_by_robots", return_value=True), \
+             patch("scraper.retry_fetch", return_value=None) as mock_retry:
+            scraper.fetch_article("https://example.com/page")
+        assert all(c.kwargs["max_total"] == expected for c in mock_retry.call_args_list)
+
+    @pytest.mark.parametrize("url, expected", [
+        ("https://example.com/page", ["jina", "bs4", "playwright"]),
+        ("https://www.ptt.cc/bbs/Test/M.1.A.html", ["bs4", "jina", "playwright"]),
+        ("https://mp.weixin.qq.com/s/abc", ["playwright", "bs4"]),
+    ])
+    def test_strategy_order_by_platform(self, url, expected):
+        tried = []
+        fetchers = {name: MagicMock(side_effect=lambda u, n=name: tried.append(n))
+                    for name in ("jina", "bs4", "playwright")}
+        with patch("scraper.is_allowed_by_robots", return_value=True), \
+             patch("scraper.fetch_with_jina", fetchers["jina"]), \
+             patch("scraper.fetch_with_bs4", fetchers["bs4"]), \
+             patch("scraper.fetch_with_playwright", fetchers["playwright"]), \
+             patch("scraper.retry_fetch", side_effect=lambda func, u, **kw: func(u)):
+            assert scraper.fetch_article(url) is None
+        assert tried == expected
+
+
+class TestWaitForHost:
+    @pytest.fixture(autouse=True)
+    def _reset_host_timer(self):
+        scraper._HOST_BUCKETS.clear()
+        yield
+        scraper._HOST_BUCKETS.clear()
+
+    def test_first_fetch_does_not_wait(self):
+        with patch("time.sleep") as mock_sleep:
+            scraper._wait_for_host("https://a.example.com/1")
+        mock_sleep.assert_not_called()
+
+    def test_same_host_waits(self):
+        with patch("time.sleep") as mock_sleep:
+            scraper._wait_for_host("https://a.example.com/1")
+            scraper._wait_for_host("https://a.example.com/2")
+        assert mock_sleep.call_count == 1
+        assert 0 < mock_sleep.call_args.args[0] <= scraper.POLITENESS_DELAY
+
+    def test_different_hosts_do_not_wait(self):
+        with patch("time.sleep") as mock_sleep:
+            scraper._wait_for_host("https://a.example.com/1")
+            scraper._wait_for_host("https://b.example.com/1")
+        mock_sleep.assert_not_called()
+
+    def test_mixed_case_hosts_share_bucket(self):
+        with patch("time.sleep") as mock_sleep:
+            scraper._wait_for_host("https://A.Example.COM/1")
+            scraper._wait_for_host("https://a.example.com/2")
+        assert mock_sleep.call_count == 1
+        assert list(scraper._HOST_BUCKETS) == ["a.example.com"]
+
+    def test_port_and_userinfo_share_bucket(self):
+        with patch("time.sleep") as mock_sleep:
+            scraper._wait_for_host("https://a.example.com/1")
+            scraper._wait_for_host("https://user@a.example.com:443/2")
+        assert mock_sleep.call_count == 1
+
+    def test_burst_allows_consecutive_fetches(self, monkeypatch):
+        monkeypatch.setattr(scraper, "POLITENESS_BURST", 3)
+        with patch("time.sleep") as mock_sleep:
+            for i in range(3):
+                scraper._wait_for_host(f"https://a.example.com/{i}")
+            mock_sleep.assert_not_called()
+            scraper._wait_for_host("https://a.example.com/3")
+        assert mock_sleep.call_count == 1
+
+    def test_zero_delay_disables_limit(self, monkeypatch):
+        monkeypatch.setattr(scraper, "POLITENESS_DELAY", 0)
+        with patch("time.sleep") as mock_sleep:
+            scraper._wait_for_host("https://a.example.com/1")
+            scraper._wait_for_host("https://a.example.com/2")
+        mock_sleep.assert_not_called()
+
+
+class TestTokenBucket:
+    def test_reservations_accumulate(self):
+        bucket = scraper.TokenBucket(rate=1.0, capacity=1)
+        assert bucket.consume() == 0
+        assert bucket.consume() == pytest.approx(1.0, abs=0.05)
+        assert bucket.consume() == pytest.approx(2.0, abs=0.05)
+
 
 # ============================================================
 # 圖片下載
@@ -350,20 +802,66 @@ class TestFetchArticle:
 class TestDownloadImage:
     def test_success(self, tmp_path):
         mock_resp = MagicMock()
-        mock_resp.iter_content.return_value = [b"fake image data"]
+        mock_resp.raw = io.BytesIO(b"fake image data")
+        mock_resp.headers = {"Content-Type": "image/jpeg", "Content-Length": "15"}
         mock_resp.raise_for_status = MagicMock()
 
         save_path = tmp_path / "img.jpg"
-        with patch("requests.get", return_value=mock_resp):
+        with patch("scraper._SESSION.get", return_value=mock_resp):
             assert scraper.download_image("https://example.com/img.jpg", save_path) is True
         assert save_path.exists()
         assert save_path.read_bytes() == b"fake image data"
 
     def test_failure(self, tmp_path):
         save_path = tmp_path / "img.jpg"
-        with patch("requests.get", side_effect=Exception("404")):
+        with patch("scraper._SESSION.get", side_effect=Exception("404")):
+            assert scraper.download_image("https://example.com/img.jpg", save_path) is False
+        assert not save_path.exists()
+
+    def test_interrupted_download_removes_partial_file(self, tmp_path):
+        class BrokenStream(io.BytesIO):
+            def read(self, *args):
+                if self.tell():
+                    raise ConnectionError("reset")
+                return super().read(4)
+
+        mock_resp = MagicMock()
+        mock_resp.raw = BrokenStream(b"partial image data")
+        mock_resp.headers = {}
+        save_path = tmp_path / "img.jpg"
+        with patch("scraper._SESSION.get", return_value=mock_resp):
             assert scraper.download_image("https://example.com/img.jpg", save_path) is False
         assert not save_path.exists()
+        mock_resp.close.assert_called_once()
+
+    def test_oversized_stream_without_length_aborted(self, tmp_path, monkeypatch):
+        """沒有 Content-Length 時，寫入超過 MAX_IMAGE_BYTES 就中止並刪除檔案"""
+        monkeypatch.setattr(scraper, "MAX_IMAGE_BYTES", 10)
+        monkeypatch.setattr(scraper, "IMAGE_CHUNK_SIZE", 4)
+        mock_resp = MagicMock()
+        mock_resp.raw = io.BytesIO(b"x" * 11)
+        mock_resp.headers = {"Content-Type": "image/png"}
+        save_path = tmp_path / "img.png"
+        with patch("scraper._SESSION.get", return_value=mock_resp):
+            assert scraper.download_image("https://example.com/img.png", save_path) is False
+        assert not save_path.exists()
+        mock_resp.close.assert_called_once()
+
+    @pytest.mark.parametrize("headers", [
+        {"Content-Type": "text/html; charset=utf-8"},
+        {"Content-Type": "image/png", "Content-Length": str(100 * 1024 * 1024)},
+    ])
+    def test_rejected_before_reading_body(self, tmp_path, headers):
+        """錯誤頁或過大的圖片只看標頭就放棄，不讀取本體"""
+        mock_resp = MagicMock()
+        mock_resp.raw = MagicMock()
+        mock_resp.headers = headers
+        save_path = tmp_path / "img.jpg"
+        with patch("scraper._SESSION.get", return_value=mock_resp):
+            assert scraper.download_image("https://example.com/img.jpg", save_path) is False
+        mock_resp.raw.read.assert_not_called()
+        mock_resp.close.assert_called_once()
+        assert not save_path.exists()
 
 
 # ============================================================
@@ -412,6 +910,46 @@ class TestSaveArticle:
         assert p1.exists()
         assert p2.exists()
 
+    def test_concurrent_same_title_get_distinct_dirs(self, tmp_path):
+        from concurrent.futures import ThreadPoolExecutor
+        articles = [self._make_article(url=f"https://a.com/{i}") for i in range(6)]
+        with ThreadPoolExecutor(max_workers=6) as ex:
+            paths = list(ex.map(lambda a: scraper.save_article(a, str(tmp_path)), articles))
+        assert len(set(paths)) == 6
+
+    def test_collects_markdown_and_bare_image_urls(self, tmp_path):
+        article = self._make_article()
+        article["content"] = (
+            "![a](https://cdn.com/a.png)\n"
+            "see https://img.com/b.jpg?w=1 here\n"
+            "![again](https://cdn.com/a.png)"
+        )
+        with patch("scraper.download_image", return_value=True) as mock_dl:
+            result = scraper.save_article(article, str(tmp_path))
+        assert sorted(c.args[0] for c in mock_dl.call_args_list) == [
+            "https://cdn.com/a.png", "https://img.com/b.jpg?w=1"]
+        content = (result / "content.md").read_text(encoding="utf-8")
+        assert "images/img_01.png" in content
+        assert "images/img_02.jpg" in content
+
+    def test_rewrite_prefers_longest_url(self, tmp_path):
+        article = self._make_article()
+        article["content"] = "https://cdn.com/a.png https://cdn.com/a.png?w=2"
+        with patch("scraper.download_image", return_value=True):
+            result = scraper.save_article(article, str(tmp_path))
+        content = (result / "content.md").read_text(encoding="utf-8")
+        assert content.endswith("images/img_01.png images/img_02.png")
+
+    def test_failed_image_keeps_remote_url(self, tmp_path):
+        article = self._make_article()
+        article["content"] = "![a](https://cdn.com/a.png) ![b](https://cdn.com/b.png)"
+        with patch("scraper.download_image",
+                   side_effect=lambda u, *a, **k: u.endswith("a.png")):
+            result = scraper.save_article(article, str(tmp_path))
+        content = (result / "content.md").read_text(encoding="utf-8")
+        assert "images/img_01.png" in content
+        assert "https://cdn.com/b.png" in content
+
 
 # ============================================================
 # _guess_extension
@@ -433,6 +971,12 @@ class TestGuessExtension:
     def test_unknown_defaults_jpg(self):
         assert scraper._guess_extension("https://img.com/photo") == ".jpg"
 
+    def test_uppercase_and_fragment(self):
+        assert scraper._guess_extension("https://img.com/PHOTO.JPEG#top") == ".jpeg"
+
+    def test_extension_only_in_query_ignored(self):
+        assert scraper._guess_extension("https://img.com/view?f=a.png") == ".jpg"
+
 
 # ============================================================
 # batch_fetch
@@ -477,6 +1021,49 @@ class TestBatchFetch:
             results = scraper.batch_fetch(str(url_file), str(tmp_path))
         assert len(results["success"]) == 1
 
+    def test_batch_duplicate_lines_read_once(self, tmp_path):
+        url_file = tmp_path / "urls.txt"
+        url_file.write_text("https://example.com/1\n  https://example.com/1  \nhttps://example.com/2\n",
+                            encoding="utf-8")
+        with patch("scraper.batch_fetch_urls", return_value={}) as mock_batch:
+            scraper.batch_fetch(str(url_file), str(tmp_path))
+        assert mock_batch.call_args.args[0] == ["https://example.com/1", "https://example.com/2"]
+
+    def test_batch_dedup_by_normalized_url_keeps_original(self, tmp_path):
+        url_file = tmp_path / "urls.txt"
+        url_file.write_text("HTTPS://Example.COM:443/a?x=1#top\nhttps://example.com/a?x=1\n",
+                            encoding="utf-8")
+        with patch("scraper.batch_fetch_urls", return_value={}) as mock_batch:
+            scraper.batch_fetch(str(url_file), str(tmp_path))
+        assert mock_batch.call_args.args[0] == ["HTTPS://Example.COM:443/a?x=1#top"]
+
+    def test_batch_hash_route_fetched_with_fragment(self, tmp_path):
+        url_file = tmp_path / "urls.txt"
+        url_file.write_text("https://example.com/#!/post/1\n", encoding="utf-8")
+        mock_article = {"title": "T", "content": "C", "source": "jina",
+                        "url": "https://example.com/#!/post/1", "platform": "其他"}
+        with patch("scraper.fetch_article", return_value=mock_article) as mock_fetch, \
+             patch("scraper.save_article", return_value=tmp_path / "out"), \
+             patch("time.sleep"):
+            scraper.batch_fetch(str(url_file), str(tmp_path))
+        assert mock_fetch.call_args.args[0] == "https://example.com/#!/post/1"
+
+
+class TestNormalizeUrl:
+    @pytest.mark.parametrize("url, expected", [
+        ("https://example.com/a", "https://example.com/a"),
+        ("HTTP://WWW.Example.com", "http://www.example.com/"),
+        ("http://example.com:80/a", "http://example.com/a"),
+        ("https://example.com:8443/a", "https://example.com:8443/a"),
+        ("https://example.com/a?b=2&a=1#frag", "https://example.com/a?b=2&a=1"),
+        ("https://User@Example.com/Path", "https://User@example.com/Path"),
+        ("https://[::1]:443/", "https://[::1]/"),
+        ("not a url", "not a url"),
+        ("https://example.com:bad/", "https://example.com:bad/"),
+    ])
+    def test_normalize(self, url, expected):
+        assert scraper._normalize_url(url) == expected
+
 
 # ============================================================
 # load_config
@@ -507,6 +1094,34 @@ class TestLoadConfig:
         config = scraper.load_config(str(cfg_file))
         assert config["request_timeout"] == 30
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_invalid_utf8_uses_defaults(self, tmp_path, monkeypatch, use_orjson):
+        if use_orjson and scraper.orjson is None:
+            pytest.skip("orjson 未安裝")
+        if not use_orjson:
+            monkeypatch.setattr(scraper, "orjson", None)
+        cfg_file = tmp_path / "config.json"
+        cfg_file.write_bytes(b'{"request_timeout": "\xff"}')
+        assert scraper.load_config(str(cfg_file))["request_timeout"] == 30
+
+    def test_unchanged_file_is_not_reparsed(self, tmp_path):
+        cfg_file = tmp_path / "config.json"
+        cfg_file.write_text(json.dumps({"max_retries": 5}), encoding="utf-8")
+        first = scraper.load_config(str(cfg_file))
+        first["max_retries"] = 99  # 回傳值可修改，不影響快取
+        with patch("scraper._loads_json", side_effect=AssertionError("不應重新解析")):
+            assert scraper.load_config(str(cfg_file))["max_retries"] == 5
+
+    def test_modified_file_is_reloaded(self, tmp_path):
+        cfg_file = tmp_path / "config.json"
+        cfg_file.write_text(json.dumps({"max_retries": 5}), encoding="utf-8")
+        assert scraper.load_config(str(cfg_file))["max_retries"] == 5
+        cfg_file.write_text(json.dumps({"max_retries": 10, "request_timeout": 45}),
+                            encoding="utf-8")
+        config = scraper.load_config(str(cfg_file))
+        assert config["max_retries"] == 10
+        assert config["request_timeout"] == 45
+
     def test_output_dir_expansion(self, tmp_path):
         cfg_file = tmp_path / "config.json"
         cfg_file.write_text(json.dumps({
@@ -534,6 +1149,19 @@ class TestSetupLogging:
 
         # 清理 handlers 避免影響其他測試
         scraper.logger.handlers.clear()
+        scraper._stop_log_listener()
+
+    def test_file_written_by_background_listener(self, tmp_path):
+        scraper.logger.handlers.clear()
+        scraper._setup_logging(log_dir=str(tmp_path))
+        assert not any(isinstance(h, scraper.logging.FileHandler)
+                       for h in scraper.logger.handlers)
+        scraper.logger.debug("queued %s", "message")
+        scraper._stop_log_listener()  # 停止時會先寫完 queue 中的紀錄
+        scraper.logger.handlers.clear()
+
+        log_file, = (tmp_path / "logs").glob("scraper_*.log")
+        assert "queued message" in log_file.read_text(encoding="utf-8")
 
     def test_no_file_handler_without_dir(self):
         scraper.logger.handlers.clear()
@@ -550,6 +1178,7 @@ class TestSetupLogging:
         scraper._setup_logging(log_dir=str(tmp_path))
         assert len(scraper.logger.handlers) == count_before
         scraper.logger.handlers.clear()
+        scraper._stop_log_listener()
 
 
 # ============================================================
@@ -591,12 +1220,108 @@ class TestParseHtmlToArticle:
         result = scraper._parse_html_to_article(html, "https://example.com")
         assert result is None
 
+    def test_title_tag_when_no_h1(self):
+        html = '<html><head><title>Only Title</title></head><body><article><p>This is a long enough article content for testing purposes and validation checks.</p></article></body></html>'
+        result = scraper._parse_html_to_article(html, "https://example.com")
+        assert result["title"] == "Only Title"
+
+    def test_empty_h1_falls_back_to_title(self):
+        html = '<html><head><title>Page Title</title></head><body><h1> </h1><article><p>This is a long enough article content for testing purposes and validation checks.</p></article></body></html>'
+        result = scraper._parse_html_to_article(html, "https://example.com")
+        assert result["title"] == "Page Title"
+
+    PTT_HTML = (
+        '<html><head><title>PTT</title></head><body>'
+        '<div id="topbar">topbar noise</div>'
+        '<div id="main-content">'
+        '<div class="article-metaline"><span class="article-meta-tag">作者</span>'
+        '<span class="article-meta-value">tester</span></div>'
+        '<div class="article-metaline"><span class="article-meta-tag">標題</span>'
+        '<span class="article-meta-value">[問題] 貓咪不吃飯</span></div>'
+        '我家的貓咪最近都不太吃飯，請問該怎麼辦才好呢？已經觀察三天了。\n'
+        'https://i.imgur.com/abc.jpg\n'
+        '--\n簽名檔'
+        '<div class="push">推文內容</div>'
+        '</div></body></html>'
+    )
+
+    def test_ptt_article(self):
+        result = scraper._parse_html_to_article(self.PTT_HTML, "https://www.ptt.cc/bbs/cat/M.1.A.2.html")
+        assert result["title"] == "[問題] 貓咪不吃飯"
+        assert result["meta"]["作者"] == "tester"
+        assert "請問該怎麼辦" in result["content"]
+        assert "簽名檔" not in result["content"]
+        assert "推文內容" not in result["content"]
+        assert "topbar noise" not in result["content"]
+        assert result["images"] == ["https://i.imgur.com/abc.jpg"]
+
+    def test_ptt_fallback_uses_unmodified_dom(self):
+        """PTT 專用解析失敗時，通用解析看到的是完整未修改的 DOM"""
+        html = ('<html><head><title>PTT</title></head><body>'
+                '<div id="main-content"><div class="push">short</div></div>'
+                '<article><p>Fallback article body that is comfortably longer than fifty characters.</p></article>'
+                '</body></html>')
+        result = scraper._parse_html_to_article(html, "https://www.ptt.cc/bbs/cat/M.1.A.2.html")
+        assert result is not None
+        assert "Fallback article body" in result["content"]
+
+    def test_content_div_by_class_keyword(self):
+        html = ('<html><body><div class="sidebar"><p>Sidebar noise</p></div>'
+                '<div class="Post-Body"><p>Main body text that is long enough for the validation threshold.</p></div>'
+                '</body></html>')
+        result = scraper._parse_html_to_article(html, "https://example.com")
+        assert result is not None
+        assert "Main body text" in result["content"]
+        assert "Sidebar noise" not in result["content"]
+
+    def test_large_page_converted_in_process_pool(self, monkeypatch):
+        monkeypatch.setattr(scraper, "MARKDOWN_PROCESS_THRESHOLD", 10)
+        with patch("scraper._markdown_executor") as mock_pool:
+            mock_pool.return_value.submit.return_value.result.return_value = "converted " * 10
+            result = scraper._parse_html_to_article(
+                "<html><body><article><p>x</p></article></body></html>", "https://example.com")
+        mock_pool.return_value.submit.assert_called_once()
+        assert result["content"].startswith("converted")
+
+    def test_process_pool_size_capped(self, monkeypatch):
+        monkeypatch.setattr(scraper, "_MARKDOWN_EXECUTOR", None)
+        monkeypatch.setattr(scraper.os, "cpu_count", lambda: 64)
+        with patch("scraper.ProcessPoolExecutor") as mock_pool, patch("atexit.register"):
+            scraper._markdown_executor()
+        assert mock_pool.call_args.kwargs["max_workers"] == scraper.MARKDOWN_PROCESS_WORKERS
+
+    def test_broken_process_pool_falls_back_inline(self, monkeypatch):
+        from concurrent.futures.process import BrokenProcessPool
+        monkeypatch.setattr(scraper, "MARKDOWN_PROCESS_THRESHOLD", 10)
+        with patch("scraper._markdown_executor", side_effect=BrokenProcessPool("gone")):
+            assert scraper._convert_markdown("<h1>Title</h1>") == "# Title"
+
 
 # ============================================================
 # Playwright 策略
 # ============================================================
 
 class TestFetchWithPlaywright:
+    @pytest.fixture(autouse=True)
+    def _reset_browser(self):
+        scraper._shutdown_playwright()
+        yield
+        scraper._shutdown_playwright()
+
+    def _mock_sync_playwright(self, html):
+        """sync_playwright().start() → playwright 物件"""
+        mock_page = MagicMock()
+        mock_page.content.return_value = html
+        mock_context = MagicMock()
+        mock_context.new_page.return_value = mock_page
+        mock_browser = MagicMock()
+        mock_browser.new_context.return_value = mock_context
+        mock_pw = MagicMock()
+        mock_pw.chromium.launch.return_value = mock_browser
+        mock_sync = MagicMock()
+        mock_sync.return_value.start.return_value = mock_pw
+        return mock_sync, mock_pw, mock_browser, mock_context
+
     def test_import_error_graceful(self):
         """未安裝 playwright 時優雅降級"""
         with patch.dict("sys.modules", {"playwright": None, "playwright.sync_api": None}):
@@ -608,48 +1333,23 @@ class TestFetchWithPlaywright:
 
     def test_success_with_mock(self):
         html = '<html><head><title>PW Test</title></head><body><article><p>Playwright rendered content that is long enough for the validation threshold.</p></article></body></html>'
+        mock_sync, _, _, mock_context = self._mock_sync_playwright(html)
 
-        mock_page = MagicMock()
-        mock_page.content.return_value = html
-        mock_context = MagicMock()
-        mock_context.new_page.return_value = mock_page
-        mock_browser = MagicMock()
-        mock_browser.new_context.return_value = mock_context
-        mock_playwright = MagicMock()
-        mock_playwright.chromium.launch.return_value = mock_browser
-
-        mock_cm = MagicMock()
-        mock_cm.__enter__ = MagicMock(return_value=mock_playwright)
-        mock_cm.__exit__ = MagicMock(return_value=False)
-
-        mock_sync_pw = MagicMock(return_value=mock_cm)
-
-        with patch.dict("sys.modules", {"playwright": MagicMock(), "playwright.sync_api": MagicMock(sync_playwright=mock_sync_pw)}):
-            with patch("scraper._parse_html_to_article") as mock_parse:
-                mock_parse.return_value = {"title": "PW Test", "content": "ok", "source": "playwright", "url": "https://example.com"}
-                # We need to mock the import inside the function
-                import types
-                mock_module = types.ModuleType("playwright.sync_api")
-                mock_module.sync_playwright = mock_sync_pw
-                with patch.dict("sys.modules", {"playwright.sync_api": mock_module}):
-                    result = scraper.fetch_with_playwright("https://example.com")
+        import types
+        mock_module = types.ModuleType("playwright.sync_api")
+        mock_module.sync_playwright = mock_sync
+        with patch.dict("sys.modules", {"playwright.sync_api": mock_module}), \
+             patch("scraper._parse_html_to_article") as mock_parse:
+            mock_parse.return_value = {"title": "PW Test", "content": "ok", "source": "playwright", "url": "https://example.com"}
+            result = scraper.fetch_with_playwright("https://example.com")
         assert result is not None
+        assert mock_parse.call_args.args[0] == html
+        mock_context.close.assert_called_once()
 
     def test_ptt_gets_over18_cookie(self):
         """PTT 網址應自動添加 over18 cookie"""
-        mock_page = MagicMock()
-        mock_page.content.return_value = '<html><body><article><p>PTT content here</p></article></body></html>'
-        mock_context = MagicMock()
-        mock_context.new_page.return_value = mock_page
-        mock_browser = MagicMock()
-        mock_browser.new_context.return_value = mock_context
-        mock_pw = MagicMock()
-        mock_pw.chromium.launch.return_value = mock_browser
-
-        mock_cm = MagicMock()
-        mock_cm.__enter__ = MagicMock(return_value=mock_pw)
-        mock_cm.__exit__ = MagicMock(return_value=False)
-        mock_sync = MagicMock(return_value=mock_cm)
+        html = '<html><body><article><p>PTT content here</p></article></body></html>'
+        mock_sync, _, _, mock_context = self._mock_sync_playwright(html)
 
         import types
         mock_module = types.ModuleType("playwright.sync_api")
@@ -658,6 +1358,23 @@ class TestFetchWithPlaywright:
             scraper.fetch_with_playwright("https://www.ptt.cc/bbs/cat/M.123.html")
         mock_context.add_cookies.assert_called_once()
 
+    def test_browser_reused_across_urls(self):
+        """多個 URL 共用同一個瀏覽器，只啟動一次"""
+        mock_sync, mock_pw, mock_browser, _ = self._mock_sync_playwright("<html></html>")
+
+        import types
+        mock_module = types.ModuleType("playwright.sync_api")
+        mock_module.sync_playwright = mock_sync
+        with patch.dict("sys.modules", {"playwright.sync_api": mock_module}):
+            scraper.fetch_with_playwright("https://example.com/1")
+            scraper.fetch_with_playwright("https://example.com/2")
+        assert mock_pw.chromium.launch.call_count == 1
+        assert mock_browser.new_context.call_count == 2
+
+        scraper._shutdown_playwright()
+        mock_browser.close.assert_called_once()
+        mock_pw.stop.assert_called_once()
+
 
 # ============================================================
 # Playwright 安裝管理
@@ -768,29 +1485,62 @@ class TestFetchPttBoard:
     </body></html>
     """
 
-    def _mock_response(self, html):
+    @pytest.fixture(autouse=True)
+    def _reset_conditional_cache(self):
+        scraper._CONDITIONAL_CACHE.clear()
+        yield
+        scraper._CONDITIONAL_CACHE.clear()
+
+    def _mock_response(self, html, status_code=200, headers=None):
         resp = MagicMock()
         resp.text = html
+        resp.status_code = status_code
+        resp.headers = headers or {}
         resp.raise_for_status = MagicMock()
         return resp
 
+    def test_unchanged_page_reuses_cached_body(self, tmp_path):
+        """第二次掃描帶 ETag，伺服器回 304 時沿用上次內容"""
+        first = self._mock_response(self.PTT_BOARD_HTML, headers={"ETag": '"v1"'})
+        not_modified = self._mock_response("", status_code=304)
+        with patch("scraper._SESSION.get", side_effect=[first, not_modified]) as mock_get, \
+             patch("time.sleep"):
+            scraper.fetch_ptt_board("cat", pages=1, output_dir=str(tmp_path))
+            urls = scraper.fetch_ptt_board("cat", pages=1, output_dir=str(tmp_path))
+        assert len(urls) == 2
+        assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
     def test_extracts_article_urls(self, tmp_path):
-        with patch("requests.get", return_value=self._mock_response(self.PTT_BOARD_HTML)), \
+        with patch("scraper._SESSION.get", return_value=self._mock_response(self.PTT_BOARD_HTML)), \
              patch("time.sleep"):
             urls = scraper.fetch_ptt_board("cat", pages=1, output_dir=str(tmp_path))
         assert len(urls) == 2
         assert "https://www.ptt.cc/bbs/cat/M.111.A.222.html" in urls
 
     def test_skips_deleted_posts(self, tmp_path):
-        with patch("requests.get", return_value=self._mock_response(self.PTT_BOARD_HTML)), \
+        with patch("scraper._SESSION.get", return_value=self._mock_response(self.PTT_BOARD_HTML)), \
              patch("time.sleep"):
             urls = scraper.fetch_ptt_board("cat", pages=1, output_dir=str(tmp_path))
         # 刪除的文章沒有 <a> 標籤，不應被提取
         assert len(urls) == 2
 
+    @pytest.mark.parametrize("use_lxml", [True, False])
+    def test_parse_board_page(self, monkeypatch, use_lxml):
+        if use_lxml and scraper.lxml_html is None:
+            pytest.skip("lxml 未安裝")
+        if not use_lxml:
+            monkeypatch.setattr(scraper, "lxml_html", None)
+        entries, prev_href = scraper.parse_ptt_board_page(self.PTT_BOARD_HTML)
+        assert entries == [("/bbs/cat/M.111.A.222.html", "Article 1"),
+                           ("/bbs/cat/M.333.A.444.html", "Article 2")]
+        assert prev_href == "/bbs/cat/index99.html"
+
+    def test_parse_empty_page(self):
+        assert scraper.parse_ptt_board_page("") == ([], None)
+
     def test_dedup_filtering(self, tmp_path):
         scraper.mark_as_fetched("https://www.ptt.cc/bbs/cat/M.111.A.222.html", str(tmp_path))
-        with patch("requests.get", return_value=self._mock_response(self.PTT_BOARD_HTML)), \
+        with patch("scraper._SESSION.get", return_value=self._mock_response(self.PTT_BOARD_HTML)), \
              patch("time.sleep"):
             urls = scraper.fetch_ptt_board("cat", pages=1, output_dir=str(tmp_path))
         assert len(urls) == 1
@@ -802,16 +1552,25 @@ class TestFetchPttBoard:
         <div class="r-ent"><div class="title"><a href="/bbs/cat/M.555.A.666.html">Article 3</a></div></div>
         </body></html>
         """
-        with patch("requests.get", side_effect=[
+        with patch("scraper._SESSION.get", side_effect=[
             self._mock_response(self.PTT_BOARD_HTML),
             self._mock_response(page2_html),
         ]), patch("time.sleep"):
             urls = scraper.fetch_ptt_board("cat", pages=2, output_dir=str(tmp_path))
         assert len(urls) == 3
 
+    def test_duplicates_across_pages_collected_once(self, tmp_path):
+        with patch("scraper._SESSION.get", side_effect=[
+            self._mock_response(self.PTT_BOARD_HTML),
+            self._mock_response(self.PTT_BOARD_HTML),
+        ]), patch("time.sleep"):
+            urls = scraper.fetch_ptt_board("cat", pages=2, output_dir=str(tmp_path))
+        assert urls == ["https://www.ptt.cc/bbs/cat/M.111.A.222.html",
+                        "https://www.ptt.cc/bbs/cat/M.333.A.444.html"]
+
     def test_network_error(self, tmp_path):
         import requests as req
-        with patch("requests.get", side_effect=req.exceptions.ConnectionError("timeout")):
+        with patch("scraper._SESSION.get", side_effect=req.exceptions.ConnectionError("timeout")):
             urls = scraper.fetch_ptt_board("cat", pages=1, output_dir=str(tmp_path))
         assert urls == []
 
@@ -821,6 +1580,34 @@ class TestFetchPttBoard:
 # ============================================================
 
 class TestBatchFetchUrls:
+    def test_prefetches_dns_for_queued_hosts(self, tmp_path, monkeypatch):
+        """網站數超過並行上限時，排隊中的網站先解析 DNS"""
+        monkeypatch.setattr(scraper, "BATCH_CONCURRENCY", 1)
+        urls = ["https://a.example.com/1", "https://b.example.com/1", "https://c.example.com/1"]
+        with patch("scraper._prefetch_dns") as mock_prefetch, \
+             patch("scraper.fetch_article", return_value=None), \
+             patch("time.sleep"):
+            scraper.batch_fetch_urls(urls, str(tmp_path))
+        assert list(mock_prefetch.call_args.args[0]) == ["b.example.com", "c.example.com"]
+
+    def test_prefetch_dns_ignores_failures(self):
+        with patch("socket.getaddrinfo", side_effect=OSError("no such host")) as mock_gai:
+            futures = scraper._prefetch_dns(["a.invalid", None, "b.invalid"])
+            concurrent.futures.wait(futures)
+        assert mock_gai.call_count == 2
+
+    def test_prefetch_dns_reuses_executor(self, monkeypatch):
+        """多次批次共用同一個執行緒池，不會每批重建"""
+        monkeypatch.setattr(scraper, "_DNS_EXECUTOR", None)
+        with patch("socket.getaddrinfo"), \
+             patch("scraper.ThreadPoolExecutor",
+                   wraps=concurrent.futures.ThreadPoolExecutor) as mock_pool:
+            first = scraper._prefetch_dns(["a.example.com"])
+            second = scraper._prefetch_dns(["b.example.com"])
+            concurrent.futures.wait(first + second)
+        assert mock_pool.call_count == 1
+        assert scraper._prefetch_dns([None]) == []
+
     def test_processes_url_list(self, tmp_path):
         urls = ["https://example.com/1", "https://example.com/2"]
         mock_article = {"title": "T", "content": "C", "source": "bs4", "url": "", "platform": "其他"}
@@ -840,6 +1627,28 @@ class TestBatchFetchUrls:
         results = scraper.batch_fetch_urls([], str(tmp_path))
         assert len(results["success"]) == 0
 
+    def test_results_keep_input_order_across_hosts(self, tmp_path):
+        """不同網站並行處理，結果仍依輸入順序"""
+        urls = ["https://a.example.com/1", "https://b.example.com/1", "https://a.example.com/2"]
+        mock_article = {"title": "T", "content": "C", "source": "bs4", "url": "", "platform": "其他"}
+        with patch("scraper.fetch_article", return_value=mock_article), \
+             patch("scraper.save_article", return_value=tmp_path / "out"), \
+             patch("time.sleep"):
+            results = scraper.batch_fetch_urls(urls, str(tmp_path))
+        assert len(results["success"]) == 3
+        assert [r["url"] for r in results["success"]] == urls
+
+    def test_duplicate_urls_fetched_once(self, tmp_path):
+        urls = ["https://example.com/1", "https://example.com/1"]
+        mock_article = {"title": "T", "content": "C", "source": "bs4", "url": "", "platform": "其他"}
+        with patch("scraper.fetch_article", return_value=mock_article) as mock_fetch, \
+             patch("scraper.save_article", return_value=tmp_path / "out"), \
+             patch("time.sleep"):
+            results = scraper.batch_fetch_urls(urls, str(tmp_path))
+        assert mock_fetch.call_count == 1
+        assert len(results["success"]) == 1
+        assert len(results["skipped"]) == 1
+
     def test_saves_report(self, tmp_path):
         with patch("scraper.fetch_article", return_value=None), \
              patch("time.sleep"):
@@ -847,6 +1656,31 @@ class TestBatchFetchUrls:
         reports = list(tmp_path.glob("batch_report_*.json"))
         assert len(reports) == 1
 
+    def test_on_result_called_per_url(self, tmp_path):
+        scraper.mark_as_fetched("https://example.com/1", str(tmp_path))
+        urls = ["https://example.com/1", "https://www.facebook.com/p/1", "https://example.com/2"]
+        calls = []
+        with patch("scraper.fetch_article", return_value=None), \
+             patch("time.sleep"):
+            scraper.batch_fetch_urls(urls, str(tmp_path),
+                                     on_result=lambda kind, rec: calls.append((kind, rec["url"])))
+        assert calls == [("skipped", urls[0]), ("skipped", urls[1]), ("failed", urls[2])]
+
+    def test_cancel_event_stops_remaining_urls(self, tmp_path):
+        import threading
+        cancel = threading.Event()
+
+        def fetch(url):
+            cancel.set()  # 第一篇擷取中被取消
+            return None
+
+        urls = ["https://example.com/1", "https://example.com/2"]
+        with patch("scraper.fetch_article", side_effect=fetch) as mock_fetch, \
+             patch("time.sleep"):
+            results = scraper.batch_fetch_urls(urls, str(tmp_path), cancel_event=cancel)
+        assert mock_fetch.call_count == 1
+        assert [r["url"] for r in results["failed"]] == ["https://example.com/1"]
+
 
 # ============================================================
 # run_scheduled
@@ -866,3 +1700,24 @@ class TestRunScheduled:
              patch("builtins.__import__", side_effect=ImportError("No module named 'schedule'")), \
              pytest.raises(SystemExit):
             scraper.run_scheduled(args)
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+class TestMainCli:
+    def test_concurrency_flag_overrides_config(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(scraper, "BATCH_CONCURRENCY", 4)
+        monkeypatch.setattr(sys, "argv", ["scraper.py", "--batch", "urls.txt",
+                                          "--output", str(tmp_path), "--concurrency", "8"])
+        with patch("scraper._setup_logging"), \
+             patch("scraper.batch_fetch") as mock_batch:
+            scraper.main()
+        mock_batch.assert_called_once_with("urls.txt", str(tmp_path))
+        assert scraper.BATCH_CONCURRENCY == 8
+
+    def test_concurrency_must_be_positive(self, monkeypatch):
+        monkeypatch.setattr(sys, "argv", ["scraper.py", "--batch", "urls.txt", "--concurrency", "0"])
+        with pytest.raises(SystemExit):
+            scraper.main()
@@ -4,13 +4,17 @@ task_runner.py 單元測試
 測試背景任務執行器的核心功能和異常處理。
 """
 
+import collections
 import queue
 import threading
 import time
 import logging
 import pytest
 
-from gui.workers.task_runner import TaskRunner, TASK_ERROR_SENTINEL
+from gui.workers.task_runner import (
+    TaskRunner, FastQueue, ProgressEmitter, ProgressBatcher, iter_progress,
+    TASK_ERROR_SENTINEL, PROGRESS_BATCH_KEY,
+)
 
 
 # ============================================================
@@ -66,10 +70,50 @@ class TestTaskRunnerBasic:
         assert runner.is_running("running_test")
 
         barrier.set()
-        time.sleep(0.3)  # 等任務結束
+        assert runner.wait("running_test", timeout=5)
         assert not runner.is_running("running_test")
         runner.shutdown()
 
+    def test_resubmit_keeps_new_task_state(self):
+        """同 task_id 重新提交：舊任務被取消，結束時不影響新任務的狀態"""
+        runner = TaskRunner(max_workers=2)
+        release = threading.Event()
+        events = []
+
+        def worker(cancel_event=None, progress_queue=None, result_queue=None):
+            events.append(cancel_event)
+            if len(events) == 1:
+                cancel_event.wait(timeout=5)
+            else:
+                release.wait(timeout=5)
+
+        first = runner.submit("same", worker)
+        time.sleep(0.1)
+        runner.submit("same", worker)
+        first.result(timeout=5)
+        time.sleep(0.1)
+
+        assert events[0].is_set()
+        assert runner.is_running("same")
+        assert runner.cancel("same") is True
+        release.set()
+        runner.shutdown()
+
+    def test_wait_times_out_while_running(self):
+        """任務未結束時 wait 逾時回傳 False，結束後回傳 True"""
+        runner = TaskRunner(max_workers=1)
+        release = threading.Event()
+
+        def worker(cancel_event=None, progress_queue=None, result_queue=None):
+            release.wait(timeout=5)
+
+        runner.submit("wait_test", worker)
+        assert runner.wait("wait_test", timeout=0.05) is False
+        release.set()
+        assert runner.wait("wait_test", timeout=5) is True
+        assert runner.wait("unknown_task", timeout=0) is True
+        runner.shutdown()
+
 
 # ============================================================
 # 異常處理
@@ -108,8 +152,8 @@ class TestTaskRunnerExceptionHandling:
             except RuntimeError:
                 pass
 
-        # 稍等 cleanup callback 執行
-        time.sleep(0.3)
+        # 等 cleanup callback 執行
+        assert runner.wait("log_test", timeout=5)
 
         assert any("Something broke" in record.message for record in caplog.records)
         runner.shutdown()
@@ -129,11 +173,29 @@ class TestTaskRunnerExceptionHandling:
         except RuntimeError:
             pass
 
-        time.sleep(0.3)  # 等 cleanup callback
+        assert runner.wait("cleanup_test", timeout=5)  # 等 cleanup callback
         assert not runner.is_running("cleanup_test")
-        with runner._lock:
-            assert "cleanup_test" not in runner._active_futures
-            assert "cleanup_test" not in runner._cancel_events
+        shard = runner._shard("cleanup_test")
+        with shard.lock:
+            assert "cleanup_test" not in shard.futures
+            assert "cleanup_test" not in shard.events
+        runner.shutdown()
+
+    def test_exception_logged_to_deque(self):
+        """result_queue 為 collections.deque 時，sentinel 以 append 送出"""
+        runner = TaskRunner(max_workers=1)
+        result_q = collections.deque()
+
+        def failing_worker(cancel_event=None, progress_queue=None, result_queue=None):
+            raise ValueError("deque boom")
+
+        future = runner.submit("deque_test", failing_worker, result_queue=result_q)
+        try:
+            future.result(timeout=5)
+        except ValueError:
+            pass
+
+        assert result_q.popleft() == (TASK_ERROR_SENTINEL, "deque boom")
         runner.shutdown()
 
     def test_exception_without_result_queue(self):
@@ -151,7 +213,7 @@ class TestTaskRunnerExceptionHandling:
         except RuntimeError:
             pass
 
-        time.sleep(0.3)
+        assert runner.wait("no_queue_test", timeout=5)
         assert not runner.is_running("no_queue_test")
         runner.shutdown()
 
@@ -159,3 +221,112 @@ class TestTaskRunnerExceptionHandling:
         """確認 TASK_ERROR_SENTINEL 是可用的字串常數"""
         assert isinstance(TASK_ERROR_SENTINEL, str)
         assert len(TASK_ERROR_SENTINEL) > 0
+
+
+# ============================================================
+# ProgressEmitter
+# ============================================================
+
+class TestProgressEmitter:
+    def test_suppresses_unchanged_updates(self):
+        """百分比與訊息都沒變時不送出"""
+        q = queue.Queue()
+        emitter = ProgressEmitter(q)
+        emitter.put(1, 1000, "擷取中")
+        emitter.put(2, 1000, "擷取中")   # 仍為 0%
+        emitter.put(10, 1000, "擷取中")  # 1%
+        assert q.qsize() == 2
+
+    def test_message_change_is_emitted(self):
+        """訊息改變時即使百分比相同也送出"""
+        q = queue.Queue()
+        emitter = ProgressEmitter(q)
+        emitter.put(3, 3, "完成")
+        emitter.put(3, 3, "擷取失敗")
+        assert q.get_nowait() == (3, 3, "完成")
+        assert q.get_nowait() == (3, 3, "擷取失敗")
+
+    def test_deque_target(self):
+        """也可包裝 collections.deque"""
+        d = collections.deque()
+        ProgressEmitter(d).put(1, 2, "x")
+        assert list(d) == [(1, 2, "x")]
+
+    def test_none_queue(self):
+        """沒有 queue 時靜默略過"""
+        ProgressEmitter(None).put(1, 2, "x")
+
+
+class TestProgressBatcher:
+    def test_batches_by_count(self):
+        """累積 max_items 筆才送出一次"""
+        q = queue.Queue()
+        batcher = ProgressBatcher(q, max_items=5, max_delay=60)
+        for i in range(1, 11):
+            batcher.put(i, 10, f"#{i}")
+        assert q.qsize() == 2
+        key, updates = q.get_nowait()
+        assert key == PROGRESS_BATCH_KEY
+        assert updates == [(i, 10, f"#{i}") for i in range(1, 6)]
+
+    def test_flush_sends_remainder(self):
+        q = queue.Queue()
+        batcher = ProgressBatcher(q, max_items=5, max_delay=60)
+        batcher.put(1, 2, "a")
+        assert q.empty()
+        batcher.flush()
+        assert iter_progress(q.get_nowait()) == [(1, 2, "a")]
+        batcher.flush()  # 沒有待送資料時不送出
+        assert q.empty()
+
+    def test_flushes_after_delay(self):
+        q = queue.Queue()
+        batcher = ProgressBatcher(q, max_items=100, max_delay=0.0)
+        time.sleep(0.01)
+        batcher.put(1, 2, "a")
+        assert q.qsize() == 1
+
+    def test_iter_progress_plain_tuple(self):
+        """未批次的單筆進度也能展開"""
+        assert iter_progress((1, 2, "x")) == [(1, 2, "x")]
+
+
+class TestFastQueue:
+    def test_fifo_and_empty(self):
+        q = FastQueue()
+        q.put(1)
+        q.put(2)
+        assert q.qsize() == 2
+        assert q.get_nowait() == 1
+        assert q.get_nowait() == 2
+        assert q.empty()
+        with pytest.raises(queue.Empty):
+            q.get_nowait()
+
+    def test_wait_wakes_on_put(self):
+        q = FastQueue()
+        assert q.wait(timeout=0.01) is False
+        threading.Timer(0.05, q.put, args=("x",)).start()
+        assert q.wait(timeout=5) is True
+        assert q.get_nowait() == "x"
+
+    def test_works_with_progress_batcher(self):
+        q = FastQueue()
+        batcher = ProgressBatcher(q, max_items=2, max_delay=60)
+        batcher.put(1, 2, "a")
+        batcher.put(2, 2, "b")
+        assert iter_progress(q.get_nowait()) == [(1, 2, "a"), (2, 2, "b")]
+
+    def test_task_runner_error_sentinel(self):
+        """TaskRunner 錯誤 sentinel 也能送進 FastQueue"""
+        runner = TaskRunner(max_workers=1)
+        q = FastQueue()
+
+        def failing_worker(cancel_event=None, progress_queue=None, result_queue=None):
+            raise RuntimeError("boom")
+
+        future = runner.submit("fast", failing_worker, result_queue=q)
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+        assert q.get_nowait() == (TASK_ERROR_SENTINEL, "boom")
+        runner.shutdown()